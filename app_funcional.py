@@ -1,12 +1,27 @@
 #!/usr/bin/env python3
 """TraduLibras - Sistema de reconhecimento LIBRAS"""
 
-from flask import Flask, render_template, Response, jsonify, request, redirect, url_for, flash, send_file
+from inicializacao_libras import TemposInicializacao, Preguicoso, aquecer_em_segundo_plano, descobrir_camera
+from flask import Flask, render_template, Response, jsonify, request, redirect, url_for, flash
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
-import cv2, mediapipe as mp, numpy as np, pickle, os, tempfile, threading, time, glob
-from gtts import gTTS
-from datetime import datetime
+import numpy as np, os, sys, threading, time
+from datetime import datetime, timedelta
 from auth import user_manager, User
+from features_libras import features_de_landmarks, NUM_FEATURES
+from rastreamento_libras import AgendadorRastreamento, ParametrosMaos
+from eventos_libras import CanalEventos
+from sessoes_libras import GerenciadorSessoes
+from inferencia_libras import AgendadorInferencia
+from gravacao_libras import criar_gravador, abrir_fonte
+from ingestao_libras import ler_json, ler_binario, TIPO_BINARIO
+from modelos_libras import MonitorModelos
+from camera_compartilhada import PerfilStream, obter_camera_compartilhada, status_cameras, definir_modo_pipeline, total_assinantes
+from metricas_libras import RegistroMetricas, Taxa, LIMITES_LENTOS
+from voz_libras import CacheVoz, ReprodutorVoz, criar_backend
+from mao_robotica_libras import FilaMao, ProtocoloMao, InventarioPortas, VERSAO_ACK
+
+# --tempos-inicio mostra quando cada subsistema ficou pronto
+tempos_inicio = TemposInicializacao()
 
 app = Flask(__name__)
 app.secret_key = 'tradulibras_secret_key_2024'
@@ -19,123 +34,228 @@ login_manager.login_view = 'login'
 @login_manager.user_loader
 def load_user(user_id): return user_manager.get_user(user_id)
 
-# MediaPipe
-mp_hands, mp_draw = mp.solutions.hands, mp.solutions.drawing_utils
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.7)
+# Hands em modo de rastreamento: a palma só é detectada de novo quando a confiança do rastreamento cai
+parametros_maos = ParametrosMaos(
+    confianca_deteccao=float(os.environ.get('TRADULIBRAS_MAOS_DETECCAO', '0.7')),
+    confianca_rastreamento=float(os.environ.get('TRADULIBRAS_MAOS_RASTREAMENTO', '0.7')),
+    complexidade=int(os.environ.get('TRADULIBRAS_MAOS_COMPLEXIDADE', '1')))
 
-# Carregar modelo
+# MediaPipe: importado e criado sob demanda (ou no aquecimento em segundo plano)
+def criar_mediapipe():
+    import mediapipe as mp
+    hands = parametros_maos.criar()
+    hands.process(np.zeros((480, 640, 3), dtype=np.uint8))  # o primeiro process() carrega o grafo
+    return mp.solutions.hands, mp.solutions.drawing_utils, hands
+
+mediapipe_maos = Preguicoso('mediapipe', criar_mediapipe, tempos_inicio)
+
+# Carregar modelo: conjunto mais recente de modelos/, recarregado em segundo plano quando o treinador salvar outro
 pasta_modelos = 'modelos/'
-modelos = sorted(glob.glob(os.path.join(pasta_modelos, 'modelo_libras_*.pkl')), key=os.path.getmtime)
-scalers = sorted(glob.glob(os.path.join(pasta_modelos, 'scaler_libras_*.pkl')), key=os.path.getmtime)
-infos = sorted(glob.glob(os.path.join(pasta_modelos, 'modelo_info_libras_*.pkl')), key=os.path.getmtime)
-
-if modelos and scalers and infos:
-    modelo_inclusao_bc, scaler_inclusao_bc, info_inclusao_bc = modelos[-1], scalers[-1], infos[-1]
-    with open(modelo_inclusao_bc, 'rb') as f: model = pickle.load(f)
-    with open(scaler_inclusao_bc, 'rb') as f: scaler = pickle.load(f)
-    with open(info_inclusao_bc, 'rb') as f: model_info = pickle.load(f)
+model, scaler, model_info, preditor = None, None, {'classes': [], 'accuracy': 0}, None
+
+def ativar_modelo(conjunto):
+    """Troca o modelo ativo por um conjunto já validado e aquecido pelo monitor"""
+    global model, scaler, model_info, preditor
+    model, scaler, model_info = conjunto.model, conjunto.scaler, conjunto.info
+    # Floresta + scaler compilados em arrays NumPy; as predições leem só esta referência
+    preditor = conjunto.preditor
     print(f"📊 Classes: {model_info['classes']}")
-else: model, scaler, model_info = None, None, {'classes': [], 'accuracy': 0}
+
+monitor_modelos = MonitorModelos(pasta_modelos, ativar_modelo, intervalo=float(os.environ.get('TRADULIBRAS_MODELOS_INTERVALO', '2')))
+# Primeira carga (e o scikit-learn) fora do import; quem precisar do modelo antes espera por ela
+modelo_inicial = Preguicoso('modelo', monitor_modelos.iniciar, tempos_inicio)
 
 # Variáveis globais
-current_letter = formed_text = ""
-last_prediction_time, hand_detected_time = datetime.now(), None
 prediction_cooldown, min_hand_time, auto_speak_enabled = 2.5, 1.5, True
+gravador = None  # gravação ativa (vídeo cru ou landmarks), ver /gravacao/iniciar
+# Reconhecimento: 'temporizador' (min_hand_time + cooldown) ou 'votacao' (probabilidades estáveis por K frames)
+recognition_mode = os.environ.get('TRADULIBRAS_RECONHECIMENTO', 'temporizador')
+# Letra, texto, temporizadores e votação por sessão; 'camera' é a webcam do servidor
+sessoes = GerenciadorSessoes(limiar=float(os.environ.get('TRADULIBRAS_LIMIAR_CONFIANCA', '0.6')),
+                             frames_estaveis=int(os.environ.get('TRADULIBRAS_FRAMES_ESTAVEIS', '5')))
+sessao_camera = sessoes.obter('camera')
+# Predições de todas as sessões em micro-lotes: um predict_proba por lote
+agendador_inferencia = AgendadorInferencia(lambda: preditor,
+                                           max_lote=int(os.environ.get('TRADULIBRAS_LOTE_MAXIMO', '32')),
+                                           espera_maxima=float(os.environ.get('TRADULIBRAS_LOTE_ESPERA_MS', '2')) / 1000,
+                                           clientes=sessoes.ativas)
+# Modo pipeline: captura, rastreamento, classificação e JPEG em threads separadas
+pipeline_enabled = os.environ.get('TRADULIBRAS_PIPELINE', '0') == '1'
+# Agendador do MediaPipe: 'sempre', 'intervalo' (a cada N frames) ou 'movimento'
+agendador_rastreamento = AgendadorRastreamento(
+    modo=os.environ.get('TRADULIBRAS_RASTREAMENTO', 'sempre'),
+    intervalo=int(os.environ.get('TRADULIBRAS_RASTREAMENTO_INTERVALO', '3')))
+
+# Métricas Prometheus (/metrics): sempre ligadas, custam um bisect + lock por observação
+metricas = RegistroMetricas()
+metrica_captura = metricas.histograma('tradulibras_captura_segundos', 'Leitura de um frame da câmera')
+metrica_maos = metricas.histograma('tradulibras_maos_process_segundos', 'hands.process do MediaPipe por chamada')
+metrica_features = metricas.histograma('tradulibras_features_segundos', 'Extração das features de uma mão')
+metrica_predicao = metricas.histograma('tradulibras_predicao_segundos', 'Predição do modelo para um frame')
+metrica_jpeg = metricas.histograma('tradulibras_jpeg_segundos', 'Codificação JPEG de um frame em um perfil')
+metrica_tts = metricas.histograma('tradulibras_tts_sintese_segundos', 'Síntese de voz (gTTS) de um texto', LIMITES_LENTOS)
+metrica_serial = metricas.histograma('tradulibras_serial_escrita_segundos', 'Escrita de uma letra na serial (write + flush)', LIMITES_LENTOS)
+metrica_serial_ack = metricas.histograma('tradulibras_serial_ack_segundos', 'Do envio de uma letra até o Arduino avisar o fim do movimento', LIMITES_LENTOS)
+metrica_frames = metricas.contador('tradulibras_frames_total', 'Frames processados pelo worker da câmera')
+metrica_letras = metricas.contador('tradulibras_letras_total', 'Letras emitidas')
+taxa_frames, taxa_letras = Taxa(janela=5.0), Taxa(janela=60.0)
+metricas.medidor('tradulibras_fps', 'Frames processados por segundo (últimos 5 s)', taxa_frames.por_segundo)
+metricas.medidor('tradulibras_letras_por_minuto', 'Letras emitidas no último minuto', lambda: taxa_letras.por_segundo() * 60)
+metricas.medidor('tradulibras_video_feed_assinantes', 'Clientes conectados em /video_feed', total_assinantes)
+
+def observar_estagio(nome, segundos):
+    """Recebe os tempos medidos pelo worker da câmera (captura, JPEG e frames publicados)"""
+    if nome == 'captura': metrica_captura.observar(segundos)
+    elif nome == 'codificacao': metrica_jpeg.observar(segundos)
+    elif nome == 'publicacao': metrica_frames.incrementar(); taxa_frames.registrar()
+
+# Voz: cache por hash do texto normalizado (memória + disco); TRADULIBRAS_TTS=gtts|espeak|stub
+voz = CacheVoz(criar_backend(os.environ.get('TRADULIBRAS_TTS', 'gtts')), pasta=os.environ.get('TRADULIBRAS_CACHE_VOZ', 'cache_voz'),
+               ao_sintetizar=metrica_tts.observar)
+# Alto-falante do servidor: uma thread com o dispositivo sempre aberto toca as falas em fila
+metrica_primeiro_som = metricas.histograma('tradulibras_tts_primeiro_som_segundos', 'Do pedido de fala até o início do som', LIMITES_LENTOS)
+reprodutor = ReprodutorVoz(voz.sintetizar, ao_tocar=metrica_primeiro_som.observar)
+metricas.medidor('tradulibras_tts_fila', 'Falas esperando o alto-falante', reprodutor.tamanho_fila)
+
+def processar_maos(imagem_bgr):
+    import cv2  # como o MediaPipe e o scikit-learn: o OpenCV só carrega no primeiro frame (ou no aquecimento)
+    imagem_rgb = cv2.cvtColor(imagem_bgr, cv2.COLOR_BGR2RGB)
+    hands = mediapipe_maos.obter()[2]
+    with metrica_maos.cronometrar(): return hands.process(imagem_rgb)
+
+# Push (SSE) de letra/texto e status serial para a página da câmera
+canal_eventos = CanalEventos()
+
+def publicar_estado(): canal_eventos.publicar('letra', sessao_camera.estado())
 
 def process_landmarks(hand_landmarks):
-    if not hand_landmarks: return None
-    wrist = hand_landmarks.landmark[0]
-    features = [lm.x - wrist.x for lm in hand_landmarks.landmark] + [lm.y - wrist.y for lm in hand_landmarks.landmark]
-    tips = [hand_landmarks.landmark[i] for i in [4,8,12,16,20]]
-    features += [abs(tip.x - wrist.x) + abs(tip.y - wrist.y) for tip in tips]
-    features += [abs(tips[i].x - tips[i+1].x) + abs(tips[i].y - tips[i+1].y) for i in range(4)]
-    return features
+    # Mesma extração (e mesma ordem de features) usada pelo coletor
+    return features_de_landmarks(hand_landmarks)
 
 def detectar_webcam_usb_automatico():
-    for i in range(5):
-        try:
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened() and cap.read()[0]:
-                cap.release()
-                return i
-        except: pass
-    return 0
-
-selected_camera_index = detectar_webcam_usb_automatico()
-
-def generate_frames():
-    global current_letter, formed_text, last_prediction_time, hand_detected_time, selected_camera_index
-    camera = cv2.VideoCapture(selected_camera_index)
-    camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+    # Índices 0-4 testados em paralelo (uma câmera travada não segura as outras); resultado guardado em disco
+    indice = descobrir_camera(max_indices=5, timeout=float(os.environ.get('TRADULIBRAS_CAMERA_TIMEOUT', '3')),
+                              arquivo_cache=os.environ.get('TRADULIBRAS_CAMERA_CACHE', 'camera_cache.json'))
+    print(f"📹 Webcam: {indice}")
+    return indice
+
+# TRADULIBRAS_REPLAY=gravacoes/arquivo.avi usa uma gravação no lugar da webcam
+camera_selecionada = Preguicoso('camera', lambda: os.environ.get('TRADULIBRAS_REPLAY') or detectar_webcam_usb_automatico(),
+                                tempos_inicio)
+
+def rastrear_mao(pacote):
+    """Estágio de rastreamento: espelha o frame, roda o MediaPipe e desenha os landmarks"""
+    import cv2
+    gravacao = gravador
+    if gravacao: gravacao.registrar_frame(pacote['t_captura'], pacote['frame'])
+    frame = cv2.flip(pacote['frame'], 1)
+    # Nos frames não agendados reaproveita os últimos landmarks (desenho e classificação)
+    results = agendador_rastreamento.rastrear(frame, processar_maos)
+    points = None
     
-    while True:
-        success, frame = camera.read()
-        if not success: break
-        
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = hands.process(rgb_frame)
-        points, current_time = None, datetime.now()
-        
-        if results.multi_hand_landmarks:
-            if hand_detected_time is None: hand_detected_time = current_time
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                points = process_landmarks(hand_landmarks)
+    if results.multi_hand_landmarks:
+        mp_hands, mp_draw, _ = mediapipe_maos.obter()
+        for hand_landmarks in results.multi_hand_landmarks:
+            mp_draw.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            with metrica_features.cronometrar(): points = process_landmarks(hand_landmarks)
+    if gravacao: gravacao.registrar_landmarks(pacote['t_captura'], hand_landmarks if points is not None else None)
+    
+    pacote.update(frame=frame, points=points, mao_detectada=bool(results.multi_hand_landmarks),
+                  reaproveitado=agendador_rastreamento.ultimo_reaproveitado)
+    return pacote
+
+def aplicar_letra(sessao, predicted_letter):
+    """Acrescenta a letra reconhecida ao texto da sessão (ESPACO e '.' têm tratamento especial)"""
+    sessao.historico.append((datetime.now(), predicted_letter))
+    metrica_letras.incrementar(); taxa_letras.registrar()
+    if predicted_letter == 'ESPACO':
+        sessao.letra_atual, sessao.texto = '[ESPAÇO]', sessao.texto + ' '
+    elif predicted_letter == '.':
+        sessao.letra_atual = '[PONTO]'
+        texto_para_falar = sessao.texto.strip()
+        sessao.texto = ""
+        # Só a sessão da câmera fala pelo alto-falante do servidor
+        if texto_para_falar and auto_speak_enabled and sessao is sessao_camera:
+            reprodutor.falar(texto_para_falar)
+    else:
+        sessao.letra_atual, sessao.texto = predicted_letter, sessao.texto + predicted_letter
+
+def classificar_sessao(sessao, points, mao_detectada, current_time=None, predicao=None, reaproveitado=False):
+    """Decide quando emitir uma letra na sessão e atualiza o texto; retorna a letra emitida (ou None)
+
+    `predicao` = (probabilidades, classes) já calculadas para o frame, se houver.
+    `reaproveitado` = landmarks repetidos de um frame anterior (agendador do
+    rastreamento): não entram na votação, que conta só observações reais.
+    """
+    current_time, predicted_letter = current_time or datetime.now(), None
+    if preditor is None: modelo_inicial.obter()  # primeiro frame antes do aquecimento terminar
+    with sessao.lock:
+        sessao.ultimo_acesso = time.monotonic()
+        if mao_detectada:
+            if sessao.mao_detectada_em is None: sessao.mao_detectada_em = current_time
             
-            time_since_detection = (current_time - hand_detected_time).total_seconds()
-            if time_since_detection >= min_hand_time:
-                time_since_last = (current_time - last_prediction_time).total_seconds()
-                if time_since_last >= prediction_cooldown and points and len(points) == 51:
+            if recognition_mode == 'votacao':
+                # Classifica todo frame e emite quando a classe fica estável
+                if points is not None and len(points) == NUM_FEATURES and preditor and not reaproveitado:
                     try:
-                        if model and scaler:
-                            points_normalized = scaler.transform([points])
-                            predicted_letter = model.predict(points_normalized)[0]
-                            
-                            if predicted_letter == 'ESPACO':
-                                current_letter, formed_text = '[ESPAÇO]', formed_text + ' '
-                            elif predicted_letter == '.':
-                                current_letter = '[PONTO]'
-                                texto_para_falar = formed_text.strip()
-                                formed_text = ""
-                                if texto_para_falar and auto_speak_enabled:
-                                    threading.Thread(target=falar_texto_automatico, args=(texto_para_falar,), daemon=True).start()
-                            else:
-                                current_letter, formed_text = predicted_letter, formed_text + predicted_letter
-                            
-                            last_prediction_time, hand_detected_time = current_time, None
+                        if predicao is None:
+                            with metrica_predicao.cronometrar(): predicao = agendador_inferencia.prever_proba(points)
+                        proba, classes = predicao
+                        predicted_letter = sessao.votacao.adicionar(proba, classes)
+                        if predicted_letter is not None: aplicar_letra(sessao, predicted_letter)
                     except Exception as e: print(f"❌ Erro: {e}")
-        else: hand_detected_time, current_letter = None, ""
-        
-        ret, buffer = cv2.imencode('.jpg', frame)
-        yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-    
-    camera.release()
-
-def falar_texto_automatico(texto_para_falar):
+            else:
+                time_since_detection = (current_time - sessao.mao_detectada_em).total_seconds()
+                if time_since_detection >= min_hand_time:
+                    time_since_last = (current_time - sessao.ultima_predicao).total_seconds()
+                    if time_since_last >= prediction_cooldown and points is not None and len(points) == NUM_FEATURES:
+                        try:
+                            if preditor:
+                                if predicao is None:
+                                    with metrica_predicao.cronometrar(): predicted_letter = agendador_inferencia.prever(points)
+                                else: predicted_letter = predicao[1][np.argmax(predicao[0])]
+                                aplicar_letra(sessao, predicted_letter)
+                                sessao.ultima_predicao, sessao.mao_detectada_em = current_time, None
+                        except Exception as e: print(f"❌ Erro: {e}")
+        else:
+            sessao.mao_detectada_em, sessao.letra_atual = None, ""
+            sessao.votacao.reiniciar()
+    return predicted_letter
+
+def classificar(pacote):
+    """Estágio de classificação da webcam do servidor (sessão 'camera')"""
+    # 'instante' permite reproduzir gravações mais rápido que o tempo real
+    classificar_sessao(sessao_camera, pacote['points'], pacote['mao_detectada'], pacote.get('instante'),
+                       reaproveitado=pacote.get('reaproveitado', False))
+    publicar_estado()
+    return pacote
+
+ESTAGIOS_RECONHECIMENTO = [('rastreamento', rastrear_mao), ('classificacao', classificar)]
+
+def processar_frame(frame, instante=None):
+    """Corpo do loop de reconhecimento: todos os estágios em sequência sobre um frame"""
+    pacote = {'frame': frame, 't_captura': time.perf_counter(), 'instante': instante}
+    for _, estagio in ESTAGIOS_RECONHECIMENTO: pacote = estagio(pacote)
+    return pacote['frame']
+
+def generate_frames(perfil=None):
+    """Entrega ao cliente os frames do worker compartilhado, codificados no perfil pedido"""
+    perfil = perfil or PerfilStream.de_parametros({})
+    camera = obter_camera_compartilhada(camera_selecionada.obter(), ESTAGIOS_RECONHECIMENTO, pipeline_enabled, abrir_fonte,
+                                        observar_estagio)
+    camera.assinar(perfil)
     try:
-        if not texto_para_falar.strip(): return
-        texto_limpo = texto_para_falar.strip()
-        tts = gTTS(text=texto_limpo, lang='pt-br')
-        temp_file = os.path.join(tempfile.gettempdir(), f'pygame_fala_{int(time.time())}.mp3')
-        tts.save(temp_file)
-        
-        try:
-            import pygame
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-            pygame.mixer.music.load(temp_file)
-            pygame.mixer.music.play()
-            
-            start_time = time.time()
-            while pygame.mixer.music.get_busy():
-                if time.time() - start_time > 30: break
-                time.sleep(0.1)
-            pygame.mixer.quit()
-        except: pass
-        
-        threading.Thread(target=lambda f: [time.sleep(10), os.path.exists(f) and os.remove(f)], args=(temp_file,)).start()
-    except Exception as e: print(f"💥 ERRO: {e}")
+        sequencia, proximo_envio = 0, 0.0
+        while True:
+            # Limite de FPS: espera e depois pega o frame mais recente (os intermediários são pulados)
+            if perfil.fps:
+                espera = proximo_envio - time.monotonic()
+                if espera > 0: time.sleep(espera)
+                proximo_envio = time.monotonic() + 1.0 / perfil.fps
+            sequencia, frame_jpeg = camera.aguardar_jpeg(perfil, sequencia)
+            if frame_jpeg is None: break
+            yield (b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + frame_jpeg + b'\r\n')
+    finally: camera.cancelar(perfil)
 
 # ==================== COMUNICAÇÃO SERIAL (MÃO ROBÓTICA) ====================
 try:
@@ -145,88 +265,137 @@ try:
 except ImportError:
     SERIAL_AVAILABLE = False
 
-def diagnosticar_portas_seriais():
-    if not SERIAL_AVAILABLE: return []
-    try:
-        ports = list(serial.tools.list_ports.comports())
-        portas_detalhadas = []
-        for port in ports:
-            try:
-                teste = serial.Serial(port.device)
-                teste.close()
-                status = "✅ Disponível"
-            except: status = "❌ Indisponível"
-            
-            is_arduino = any(x in port.description.lower() for x in ['arduino', 'ch340', 'usb serial'])
-            port_info = {
-                'device': port.device, 'description': port.description,
-                'hwid': port.hwid, 'is_arduino': is_arduino, 'status': status
-            }
-            portas_detalhadas.append(port_info)
-        return portas_detalhadas
-    except: return []
+# Portas em cache: enumeradas em segundo plano, cada porta nova é aberta para teste uma única vez
+inventario_portas = InventarioPortas(em_uso=lambda: [serial_controller.port] if serial_controller.connected else [],
+                                     ao_mudar=lambda portas: canal_eventos.publicar('portas', portas)) if SERIAL_AVAILABLE else None
+
+def diagnosticar_portas_seriais(): return inventario_portas.listar() if inventario_portas else []
+
+def observar_serial(nome, segundos):
+    if nome == 'escrita': metrica_serial.observar(segundos)
+    elif nome == 'ack': metrica_serial_ack.observar(segundos)
 
 class SerialController:
     def __init__(self):
         self.serial_connection = None
+        self.protocolo = None
         self.port = None
         self.baudrate = 115200
         self.connected = False
+        # Palavra inteira num quadro com checksum (só firmware v2); senão letra a letra
+        self.framed = os.environ.get('TRADULIBRAS_SERIAL_QUADROS') == '1'
+        self.lock = threading.RLock()  # connect/disconnect/queda da leitura, um de cada vez
         
     def list_ports(self): return diagnosticar_portas_seriais()
     
-    def connect(self, port):
+    def connect(self, port, framed=None):
         if not SERIAL_AVAILABLE: return False, "Biblioteca serial não disponível"
+        with self.lock:
+            # Reconectar ou trocar de porta: a conexão anterior (porta e thread de leitura) sai antes
+            if self.serial_connection or self.protocolo: self.disconnect()
+            conexao = protocolo = None
+            sucesso = False
+            try:
+                # Timeout curto: quem espera as respostas é a thread de leitura do protocolo
+                conexao = serial.Serial(port=port, baudrate=self.baudrate, timeout=0.1, write_timeout=1)
+                time.sleep(2)
+                protocolo = ProtocoloMao(conexao, observador=observar_serial,
+                                         ao_desconectar=lambda erro: self._conexao_perdida(conexao, erro))
+                versao = protocolo.identificar()
+                if framed is not None: self.framed = bool(framed)
+                self.serial_connection, self.protocolo = conexao, protocolo
+                self.port = port
+                self.connected = sucesso = True
+                return True, f"Conectado à porta {port} (protocolo v{versao})"
+            except (serial.SerialException, ConnectionError, OSError) as e:
+                return False, f"Erro: {str(e)}"
+            finally:
+                # Qualquer falha (inclusive as não previstas acima): nem thread de leitura nem porta ficam abertas
+                if not sucesso:
+                    if protocolo: protocolo.fechar()
+                    self._fechar_porta(conexao)
+                if inventario_portas: inventario_portas.atualizar()
+    
+    @staticmethod
+    def _fechar_porta(conexao):
         try:
-            self.serial_connection = serial.Serial(port=port, baudrate=self.baudrate, timeout=1, write_timeout=1)
-            time.sleep(2)
-            self.port = port
-            self.connected = True
-            return True, f"Conectado à porta {port}"
-        except serial.SerialException as e:
-            return False, f"Erro: {str(e)}"
+            if conexao is not None and conexao.is_open: conexao.close()
+        except (serial.SerialException, OSError): pass  # porta que já caiu
     
-    def disconnect(self):
-        if self.serial_connection and self.serial_connection.is_open:
-            self.serial_connection.close()
+    def _liberar(self):
+        """Para a thread de leitura, fecha a porta e volta ao estado desconectado (com o lock)"""
+        if self.protocolo: self.protocolo.fechar()
+        self._fechar_porta(self.serial_connection)
+        self.serial_connection = self.protocolo = self.port = None
         self.connected = False
-        self.port = None
+    
+    def _conexao_perdida(self, conexao, erro):
+        """Leitura falhou (cabo solto, placa resetada): libera a porta para reconectar"""
+        with self.lock:
+            if conexao is not self.serial_connection: return  # conexão antiga, já fechada ou substituída
+            self._liberar()
+        fila_mao.cancelar_todos()
+        if inventario_portas: inventario_portas.atualizar()
+        canal_eventos.publicar('serial', self.get_status())
+    
+    def disconnect(self):
+        fila_mao.cancelar_todos()
+        with self.lock: self._liberar()
+        if inventario_portas: inventario_portas.atualizar()
         return True, "Desconectado"
     
-    def send_letter(self, letter):
-        if not self.connected or not self.serial_connection:
+    def send_letter(self, letter, aguardar=True):
+        """Com `aguardar`, só retorna quando o Arduino avisa o fim do movimento"""
+        if not self.connected or not self.protocolo:
             return False, "Não conectado ao Arduino"
         try:
             letter = letter.lower().strip()
             if len(letter) == 1 and (letter.isalpha() or letter == '0'):
-                self.serial_connection.write(letter.encode() + b'\n')
-                self.serial_connection.flush()
+                if aguardar: return self.protocolo.enviar_letra(letter)
+                self.protocolo.enviar_comando(letter)
                 return True, f"Letra '{letter.upper()}' enviada"
             else: return False, "Letra inválida"
         except Exception as e: return False, f"Erro ao enviar: {str(e)}"
     
+    def send_word(self, word, passo, cancelado):
+        """Palavra inteira em quadros; None quando o modo ou o firmware não permitem (a fila segue letra a letra)"""
+        if not (self.framed and self.connected and self.protocolo and self.protocolo.versao >= VERSAO_ACK): return None
+        try: return self.protocolo.enviar_palavra(word, passo, cancelado)
+        except Exception as e: return False, f"Erro ao enviar: {str(e)}"
+    
     def get_status(self):
-        return {'connected': self.connected, 'port': self.port, 'serial_available': SERIAL_AVAILABLE}
+        return {'connected': self.connected, 'port': self.port, 'serial_available': SERIAL_AVAILABLE, 'framed': self.framed,
+                'protocolo': self.protocolo.status() if self.connected and self.protocolo else None}
 
 serial_controller = SerialController()
+# Palavras para a mão: executadas em segundo plano, uma de cada vez (progresso também pelo evento 'mao')
+# O ritmo das letras vem das respostas do Arduino: nenhuma pausa extra entre elas
+fila_mao = FilaMao(serial_controller.send_letter, pausa_letra=0.0, enviar_palavra=serial_controller.send_word,
+                   ao_mudar=lambda status: canal_eventos.publicar('mao', status))
 
 # Rotas Serial
 @app.route('/serial/ports')
 @login_required
-def get_serial_ports(): return jsonify({'ports': serial_controller.list_ports()})
+def get_serial_ports():
+    # Responde do cache; ?refresh=1 só pede uma nova varredura (chega também pelo evento 'portas')
+    if inventario_portas and request.args.get('refresh') == '1': inventario_portas.atualizar()
+    return jsonify({'ports': serial_controller.list_ports(), 'inventario': inventario_portas.status() if inventario_portas else None})
 
 @app.route('/serial/connect', methods=['POST'])
 @login_required
 def serial_connect():
-    port = request.get_json().get('port')
+    dados = request.get_json()
+    port = dados.get('port')
     if not port: return jsonify({'success': False, 'message': 'Porta não especificada'})
-    success, message = serial_controller.connect(port)
+    success, message = serial_controller.connect(port, dados.get('framed'))
+    canal_eventos.publicar('serial', serial_controller.get_status())
     return jsonify({'success': success, 'message': message})
 
 @app.route('/serial/disconnect', methods=['POST'])
 @login_required
 def serial_disconnect():
     success, message = serial_controller.disconnect()
+    canal_eventos.publicar('serial', serial_controller.get_status())
     return jsonify({'success': success, 'message': message})
 
 @app.route('/serial/status')
@@ -238,7 +407,7 @@ def serial_status(): return jsonify(serial_controller.get_status())
 def send_serial_letter():
     letter = request.get_json().get('letter', '')
     if not letter: return jsonify({'success': False, 'message': 'Letra não especificada'})
-    success, message = serial_controller.send_letter(letter)
+    success, message = serial_controller.send_letter(letter, aguardar=False)
     return jsonify({'success': success, 'message': message})
 
 @app.route('/serial/send_word', methods=['POST'])
@@ -247,18 +416,30 @@ def send_serial_word():
     word = request.get_json().get('word', '')
     if not word: return jsonify({'success': False, 'message': 'Palavra não especificada'})
     if not serial_controller.connected: return jsonify({'success': False, 'message': 'Não conectado ao Arduino'})
-    
-    results = []
-    for letter in word.lower():
-        if letter.isalpha() or letter == ' ':
-            if letter == ' ': 
-                time.sleep(1)
-                results.append("Espaço - pausa")
-            else:
-                success, message = serial_controller.send_letter(letter)
-                results.append(f"{letter.upper()}: {message}")
-                time.sleep(0.8)
-    return jsonify({'success': True, 'results': results})
+    try: trabalho = fila_mao.enviar(word)
+    except ValueError as e: return jsonify({'success': False, 'message': str(e)})
+    return jsonify({'success': True, 'job_id': trabalho.id, 'job': trabalho.status(), 'fila': fila_mao.status()['fila']}), 202
+
+@app.route('/serial/jobs')
+@login_required
+def serial_jobs(): return jsonify(fila_mao.status())
+
+@app.route('/serial/jobs/<int:job_id>')
+@login_required
+def serial_job(job_id):
+    trabalho = fila_mao.obter(job_id)
+    if not trabalho: return jsonify({'success': False, 'message': 'Trabalho não encontrado'}), 404
+    return jsonify({'success': True, **trabalho.status()})
+
+@app.route('/serial/jobs/<int:job_id>/cancel', methods=['POST'])
+@login_required
+def cancel_serial_job(job_id):
+    if not fila_mao.cancelar(job_id): return jsonify({'success': False, 'message': 'Trabalho não encontrado ou já finalizado'})
+    return jsonify({'success': True, 'message': f'Trabalho {job_id} cancelado'})
+
+@app.route('/serial/jobs/cancel', methods=['POST'])
+@login_required
+def cancel_serial_jobs(): return jsonify({'success': True, 'cancelados': fila_mao.cancelar_todos()})
 
 # Rotas principais
 @app.route('/')
@@ -282,6 +463,17 @@ def admin_dashboard():
     user_stats = user_manager.get_stats()
     return render_template('admin_dashboard.html', user_stats=user_stats)
 
+@app.route('/admin/modelo', methods=['GET', 'POST'])
+@login_required
+def admin_modelo():
+    # POST {"timestamp": "AAAAMMDD_HHMMSS"} fixa/volta para esse modelo; POST {} volta a seguir o mais recente
+    if not current_user.is_admin(): return jsonify({'success': False, 'message': 'Acesso restrito a administradores!'}), 403
+    if request.method == 'POST':
+        timestamp = (request.get_json() or {}).get('timestamp')
+        success, message = monitor_modelos.fixar(str(timestamp)) if timestamp else monitor_modelos.liberar()
+        return jsonify({'success': success, 'message': message, **monitor_modelos.status()})
+    return jsonify({'success': True, **monitor_modelos.status()})
+
 @app.route('/introducao')
 @login_required
 def introducao():
@@ -300,45 +492,126 @@ def logout(): logout_user(); flash('Desconectado.'); return redirect(url_for('lo
 def camera_tradulibras(): return render_template('camera_tradulibras.html')
 
 @app.route('/video_feed') 
-def video_feed(): return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+def video_feed():
+    # Qualidade por cliente: /video_feed?largura=320&qualidade=60&fps=10
+    perfil = PerfilStream.de_parametros(request.args)
+    return Response(generate_frames(perfil), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 # Rotas de controle
 @app.route('/limpar_ultima_letra', methods=['POST'])
 @login_required
 def limpar_ultima_letra():
-    global formed_text, current_letter
-    if formed_text: formed_text = formed_text[:-1]; current_letter = ""
-    return jsonify({"status": "success" if formed_text else "error", "texto": formed_text})
+    with sessao_camera.lock:
+        if sessao_camera.texto: sessao_camera.texto = sessao_camera.texto[:-1]; sessao_camera.letra_atual = ""
+    publicar_estado()
+    return jsonify({"status": "success" if sessao_camera.texto else "error", "texto": sessao_camera.texto})
 
 @app.route('/letra_atual') 
 @login_required 
-def get_letra_atual(): return jsonify({"letra": current_letter, "texto": formed_text})
+def get_letra_atual(): return jsonify(sessao_camera.estado())
 
 @app.route('/limpar_texto', methods=['POST'])
 @login_required 
-def limpar_texto_completo(): global formed_text, current_letter; formed_text = current_letter = ""; return jsonify({"status": "success"})
+def limpar_texto_completo():
+    # Mesmo lock do estágio de reconhecimento: não apaga no meio de uma letra sendo acrescentada
+    with sessao_camera.lock: sessao_camera.letra_atual = sessao_camera.texto = ""
+    publicar_estado()
+    return jsonify({"status": "success"})
+
+@app.route('/eventos')
+@login_required
+def eventos():
+    # Estado inicial para quem acabou de conectar
+    publicar_estado()
+    canal_eventos.publicar('serial', serial_controller.get_status())
+    return Response(canal_eventos.transmitir(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/falar_texto', methods=['GET', 'POST'])
 @login_required
 def falar_texto():
+    formed_text = sessao_camera.texto
     if formed_text.strip():
         try:
-            tts = gTTS(text=formed_text, lang='pt-br', slow=False)
-            temp_file = os.path.join(tempfile.gettempdir(), f'manual_speech_{int(time.time())}.mp3')
-            tts.save(temp_file)
-            response = send_file(temp_file, mimetype='audio/mpeg', as_attachment=False)
-            threading.Thread(target=lambda f: [time.sleep(30), os.path.exists(f) and os.remove(f)], args=(temp_file,)).start()
-            return response
+            # Direto da memória, sem arquivo temporário; o ETag (a chave) deixa o navegador reaproveitar
+            audio = voz.sintetizar(formed_text, 'pt-br')
+            response = Response(audio.dados, mimetype=audio.mimetype)
+            response.set_etag(audio.chave)
+            response.headers['X-Cache-Voz'] = audio.origem
+            return response.make_conditional(request)
         except Exception as e: return jsonify({"success": False, "error": str(e)})
     return jsonify({"success": False, "error": "Texto vazio"})
 
+@app.route('/voz/fila')
+@login_required
+def fila_voz(): return jsonify({'success': True, **reprodutor.status()})
+
+@app.route('/voz/interromper', methods=['POST'])
+@login_required
+def interromper_voz():
+    reprodutor.interromper()
+    return jsonify({'success': True, **reprodutor.status()})
+
+@app.route('/voz/limpar', methods=['POST'])
+@login_required
+def limpar_voz():
+    reprodutor.limpar()
+    return jsonify({'success': True, **reprodutor.status()})
+
 @app.route('/auto_speak/toggle', methods=['POST'])
 @login_required
 def toggle_auto_speak():
     global auto_speak_enabled
     auto_speak_enabled = request.get_json().get('enabled', auto_speak_enabled)
+    if not auto_speak_enabled: reprodutor.limpar()
     return jsonify({'success': True, 'auto_speak_enabled': auto_speak_enabled})
 
+@app.route('/pipeline/toggle', methods=['POST'])
+@login_required
+def toggle_pipeline():
+    global pipeline_enabled
+    pipeline_enabled = bool(request.get_json().get('enabled', pipeline_enabled))
+    # Vale a partir do próximo início do worker (quando o último cliente sair e outro entrar)
+    definir_modo_pipeline(pipeline_enabled)
+    return jsonify({'success': True, 'pipeline_enabled': pipeline_enabled})
+
+@app.route('/pipeline/status')
+@login_required
+def pipeline_status(): return jsonify({'pipeline_enabled': pipeline_enabled, 'cameras': status_cameras()})
+
+@app.route('/rastreamento/config', methods=['GET', 'POST'])
+@login_required
+def rastreamento_config():
+    if request.method == 'POST':
+        dados = request.get_json() or {}
+        try:
+            agendador_rastreamento.configurar(**{k: dados[k] for k in ('modo', 'intervalo', 'limiar_movimento', 'max_reuso') if k in dados})
+            # Parâmetros do Hands só valem numa instância nova (o próximo frame já usa a recriada)
+            if parametros_maos.configurar(**{k: dados[k] for k in ('confianca_deteccao', 'confianca_rastreamento', 'complexidade') if k in dados}) \
+                    and mediapipe_maos.pronto():
+                mediapipe_maos.recriar()
+        except (ValueError, TypeError) as e: return jsonify({'success': False, 'message': str(e)})
+    return jsonify({'success': True, **agendador_rastreamento.status(), **parametros_maos.status()})
+
+@app.route('/gravacao/iniciar', methods=['POST'])
+@login_required
+def iniciar_gravacao():
+    global gravador
+    tipo = (request.get_json() or {}).get('tipo', 'landmarks')
+    if gravador: return jsonify({'success': False, 'message': 'Gravação já em andamento', **gravador.status()})
+    try: gravador = criar_gravador(tipo)
+    except (ValueError, OSError) as e: return jsonify({'success': False, 'message': str(e)})
+    return jsonify({'success': True, **gravador.status()})
+
+@app.route('/gravacao/parar', methods=['POST'])
+@login_required
+def parar_gravacao():
+    global gravador
+    if not gravador: return jsonify({'success': False, 'message': 'Nenhuma gravação em andamento'})
+    gravacao, gravador = gravador, None
+    gravacao.fechar()
+    return jsonify({'success': True, **gravacao.status()})
+
 @app.route('/status')
 @login_required
 def status():
@@ -346,13 +619,100 @@ def status():
         "modelo_carregado": model is not None,
         "classes": model_info.get('classes', []),
         "acuracia": model_info.get('accuracy', 0),
-        "texto_atual": formed_text,
-        "letra_atual": current_letter
+        "texto_atual": sessao_camera.texto,
+        "letra_atual": sessao_camera.letra_atual,
+        "modelo": monitor_modelos.status(),
+        "inicializacao": tempos_inicio.relatorio(),
+        "voz": {**voz.status(), "reproducao": reprodutor.status()},
+        "reconhecimento": {"modo": recognition_mode, **sessao_camera.votacao.status(),
+                           "sessoes": sessoes.total(), "sessoes_ativas": sessoes.ativas()},
+        "inferencia": agendador_inferencia.status()
     })
 
+@app.route('/reconhecimento/landmarks', methods=['POST'])
+@login_required
+def receber_landmarks():
+    """Frames de um cliente que rastreia a mão no próprio dispositivo (só custa o classificador)"""
+    binario = request.mimetype == TIPO_BINARIO
+    try:
+        dados = {} if binario else (request.get_json(silent=True) or {})
+        frames = ler_binario(request.get_data()) if binario else ler_json(dados)
+        top = min(max(int(dados.get('top') or request.args.get('top') or 3), 1), 10)
+    except (TypeError, ValueError) as e: return jsonify({'success': False, 'message': str(e)}), 400
+    modelo_inicial.obter()
+    if not preditor: return jsonify({'success': False, 'message': 'Modelo não carregado'}), 503
+
+    # Uma sessão por usuário e nome ("sessao" no JSON ou ?sessao=), independente da webcam do servidor
+    nome = str(dados.get('sessao') or request.args.get('sessao') or 'api')
+    sessao = sessoes.obter(f'{current_user.id}:{nome}')
+    indices = np.flatnonzero(frames.presentes)
+    try: predicoes = dict(zip(indices.tolist(), agendador_inferencia.prever_proba_lote(frames.features[indices])))
+    except Exception as e: return jsonify({'success': False, 'message': str(e)}), 500
+
+    # Instantes do cliente (se enviados) ancorados no agora: o último frame é o mais recente
+    agora = datetime.now()
+    ultimo = frames.instantes.max() if frames.instantes is not None else 0.0
+    resultados = []
+    for i in range(len(frames)):
+        predicao = predicoes.get(i)
+        instante = agora - timedelta(seconds=float(ultimo - frames.instantes[i])) if frames.instantes is not None else agora
+        emitida = classificar_sessao(sessao, frames.features[i] if predicao else None, predicao is not None, instante, predicao)
+        if predicao is None:
+            resultados.append({'mao_detectada': False, 'emitida': None})
+            continue
+        proba, classes = predicao
+        ordem = np.argsort(proba)[::-1][:top]
+        resultados.append({
+            'mao_detectada': True,
+            'letra': str(classes[ordem[0]]), 'probabilidade': round(float(proba[ordem[0]]), 4),
+            'top': [[str(classes[j]), round(float(proba[j]), 4)] for j in ordem],
+            'emitida': None if emitida is None else str(emitida)
+        })
+    return jsonify({'success': True, 'sessao': nome, 'resultados': resultados, **sessao.estado()})
+
+@app.route('/metrics')
+def metrics():
+    # Sem login para o Prometheus; com TRADULIBRAS_METRICAS_TOKEN exige "Authorization: Bearer <token>"
+    token = os.environ.get('TRADULIBRAS_METRICAS_TOKEN')
+    if token and request.headers.get('Authorization') != f'Bearer {token}': return Response('Não autorizado\n', status=401)
+    return Response(metricas.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/reconhecimento/config', methods=['POST'])
+@login_required
+def reconhecimento_config():
+    global recognition_mode
+    dados = request.get_json() or {}
+    modo = dados.get('modo', recognition_mode)
+    if modo not in ('temporizador', 'votacao'): return jsonify({'success': False, 'message': 'Modo inválido'})
+    try:
+        sessoes.configurar_votacao(limiar=dados.get('limiar_confianca'), frames_estaveis=dados.get('frames_estaveis'))
+        espera_ms = dados.get('espera_maxima_ms')
+        agendador_inferencia.configurar(max_lote=dados.get('max_lote'), espera_maxima=None if espera_ms is None else float(espera_ms) / 1000)
+    except (TypeError, ValueError) as e: return jsonify({'success': False, 'message': str(e)})
+    recognition_mode = modo
+    sessoes.reiniciar_votacao()
+    return jsonify({'success': True, 'modo': recognition_mode, **sessao_camera.votacao.status(),
+                    'inferencia': agendador_inferencia.status()})
+
+def aguardar_inicializacao():
+    """Bloqueia até modelo, MediaPipe e câmera estarem prontos"""
+    for subsistema in (modelo_inicial, mediapipe_maos, camera_selecionada): subsistema.obter()
+
+def medir_inicializacao():
+    """--tempos-inicio: tempo até o login responder e até cada subsistema ficar pronto"""
+    with app.test_client() as cliente:
+        inicio = time.perf_counter()
+        cliente.get('/login')
+        tempos_inicio.registrar('primeira_resposta_login', time.perf_counter() - inicio)
+    aguardar_inicializacao()
+    tempos_inicio.imprimir()
+
+# Aquecimento em segundo plano: o login já responde enquanto modelo, MediaPipe e câmera carregam
+if os.environ.get('TRADULIBRAS_AQUECIMENTO', '1') == '1': aquecer_em_segundo_plano([modelo_inicial, mediapipe_maos, camera_selecionada])
+tempos_inicio.registrar('app_importado')
+
 if __name__ == '__main__':
     print("🚀 TRADULIBRAS - WEBCAM USB AUTOMÁTICA")
-    print(f"📊 Classes: {model_info.get('classes', [])}")
-    print(f"📹 Webcam: {selected_camera_index}")
+    if '--tempos-inicio' in sys.argv: medir_inicializacao(); sys.exit(0)
     print("💡 Acesso: http://localhost:5000")
     app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
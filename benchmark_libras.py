@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do caminho crítico do reconhecimento LIBRAS
+Mede cada etapa do loop de frames com frames sintéticos e landmarks
+sintéticos ou gravados, grava o resultado em JSON e compara com uma baseline.
+Com --video (uma gravação com a mão), compara o MediaPipe com e sem o ROI do
+modo de rastreamento no mesmo vídeo: tempo, frames com mão e letras iguais
+
+A baseline (benchmark_baseline.json) é local, não versionada: no commit de
+referência e na mesma máquina, rode
+    python benchmark_libras.py --salvar-baseline [--iteracoes N] [--landmarks arquivo.tlm]
+e depois, no commit a comparar, o mesmo comando sem --salvar-baseline. A
+baseline guarda o commit, os parâmetros e o modelo usados; a comparação avisa
+se eles não baterem.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+import numpy as np
+
+ARQUIVO_RESULTADOS = 'resultados_benchmark.json'
+ARQUIVO_BASELINE = 'benchmark_baseline.json'
+
+
+def frame_sintetico(largura=640, altura=480, semente=0):
+    """Frame BGR com gradiente + ruído leve (comprime como uma imagem de câmera, não como ruído puro)"""
+    rng = np.random.default_rng(semente)
+    x = np.linspace(0, 255, largura, dtype=np.float32)
+    y = np.linspace(0, 255, altura, dtype=np.float32)[:, np.newaxis]
+    base = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=2)
+    return np.clip(base + rng.normal(0, 8, base.shape), 0, 255).astype(np.uint8)
+
+
+def mao_sintetica(quantidade=64, semente=0):
+    """Pontos (N, 21, 2) com formato aproximado de mão aberta + ruído"""
+    rng = np.random.default_rng(semente)
+    angulos = np.repeat(np.linspace(-0.9, 0.9, 5), 4)
+    raios = np.tile([0.06, 0.11, 0.15, 0.19], 5)
+    molde = np.vstack([[0.5, 0.75], np.column_stack([0.5 + raios * np.sin(angulos), 0.75 - raios * np.cos(angulos)])])
+    return (molde + rng.normal(0, 0.01, (quantidade, 21, 2))).astype(np.float32)
+
+
+def para_landmarks(pontos):
+    """Converte (21, 2) em NormalizedLandmarkList do MediaPipe"""
+    from mediapipe.framework.formats import landmark_pb2
+    lista = landmark_pb2.NormalizedLandmarkList()
+    for x, y in pontos:
+        lm = lista.landmark.add()
+        lm.x, lm.y = float(x), float(y)
+    return lista
+
+
+def estatisticas(tempos):
+    """Tempos em segundos -> µs: mediana, p90, média e mínimo"""
+    tempos = np.asarray(tempos) * 1e6
+    return {
+        'iteracoes': len(tempos),
+        'mediana_us': round(float(np.median(tempos)), 2),
+        'p90_us': round(float(np.percentile(tempos, 90)), 2),
+        'media_us': round(float(tempos.mean()), 2),
+        'minimo_us': round(float(tempos.min()), 2),
+    }
+
+
+def medir(funcao, entradas, iteracoes, aquecimento=20):
+    """Tempo por chamada (µs): mediana, p90, média e mínimo"""
+    for i in range(aquecimento): funcao(entradas[i % len(entradas)])
+    tempos = np.empty(iteracoes)
+    for i in range(iteracoes):
+        entrada = entradas[i % len(entradas)]
+        inicio = time.perf_counter()
+        funcao(entrada)
+        tempos[i] = time.perf_counter() - inicio
+    return estatisticas(tempos)
+
+
+def ler_video(caminho):
+    """Frames BGR de um vídeo gravado, espelhados como no app"""
+    import cv2
+    captura = cv2.VideoCapture(caminho)
+    frames = []
+    while True:
+        ret, frame = captura.read()
+        if not ret: break
+        frames.append(cv2.flip(frame, 1))
+    captura.release()
+    if not frames: raise ValueError(f"{caminho} não tem frames legíveis")
+    return frames
+
+
+def medir_rastreamento(hands, frames, letra=None):
+    """Passa os frames em ordem pelo hands.process() (o rastreamento depende da sequência)
+
+    Retorna as estatísticas de tempo do process(), os frames com mão e a letra
+    prevista em cada frame (None sem mão ou sem `letra(hand_landmarks)`).
+    """
+    import cv2
+    hands.process(np.zeros((480, 640, 3), dtype=np.uint8))  # o primeiro process() carrega o grafo
+    tempos, letras, com_mao = [], [], 0
+    for frame in frames:
+        imagem_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        inicio = time.perf_counter()
+        results = hands.process(imagem_rgb)
+        tempos.append(time.perf_counter() - inicio)
+        mao = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+        com_mao += mao is not None
+        letras.append(letra(mao) if mao is not None and letra else None)
+    resultado = estatisticas(tempos)
+    resultado['frames_com_mao'] = com_mao
+    return resultado, letras
+
+
+def comparar_roi(frames, parametros, letra=None, apenas=None):
+    """Mesmo vídeo com o ROI do rastreamento desligado (palma detectada em todo frame) e ligado
+
+    'maos_sem_roi' é a referência: as demais etapas informam, entre os frames
+    em que as duas acharam a mão, a fração com a mesma letra prevista ('concordancia_letras').
+    """
+    from rastreamento_libras import ParametrosMaos
+    leve = ParametrosMaos(parametros.confianca_deteccao, parametros.confianca_rastreamento, complexidade=0)
+    etapas = {
+        'maos_sem_roi': lambda: parametros.criar(static_image_mode=True),
+        'maos_com_roi': parametros.criar,
+        'maos_com_roi_leve': leve.criar,
+    }
+    resultados, referencia = {}, None
+    for nome, criar in etapas.items():
+        if apenas and nome not in apenas and nome != 'maos_sem_roi': continue
+        with criar() as hands: resultado, letras = medir_rastreamento(hands, frames, letra)
+        if referencia is None: referencia = letras
+        elif letra:
+            pares = [(a, b) for a, b in zip(letras, referencia) if a is not None and b is not None]
+            resultado['concordancia_letras'] = round(float(np.mean([a == b for a, b in pares])), 3) if pares else None
+        if apenas and nome not in apenas: continue
+        resultados[nome] = resultado
+    return resultados
+
+
+def executar(iteracoes=500, arquivo_landmarks=None, apenas=None, arquivo_video=None):
+    """Roda os benchmarks e retorna {nome: estatísticas}"""
+    import cv2
+    import app_funcional as app
+    from coletor_dados_libras import ColetorLIBRAS
+    from gravacao_libras import ler_landmarks
+
+    # Modelo e MediaPipe carregam em segundo plano no import do app: espera ficarem prontos
+    app.modelo_inicial.obter()
+    mp_hands, mp_draw, _ = app.mediapipe_maos.obter()
+
+    if arquivo_landmarks:
+        registros = ler_landmarks(arquivo_landmarks)
+        pontos = registros['pontos'][registros['presente'] == 1]
+        if len(pontos) == 0: raise ValueError(f"{arquivo_landmarks} não tem frames com mão")
+    else:
+        pontos = mao_sintetica()
+
+    landmarks = [para_landmarks(p) for p in pontos]
+    features = [app.process_landmarks(lm) for lm in landmarks]
+    frame = frame_sintetico()
+    # Sem __init__: evita abrir o MediaPipe e ler o CSV só para medir a extração
+    coletor = ColetorLIBRAS.__new__(ColetorLIBRAS)
+
+    app.auto_speak_enabled = False
+    pacotes = [{'points': f, 'mao_detectada': True} for f in features]
+
+    def classificar_com_predicao(pacote):
+        # Sem isso quase toda chamada cai no cooldown do temporizador e mede só a checagem de tempo:
+        # a sessão volta a 'mão presente há min_hand_time, sem letra recente' antes de cada chamada
+        app.recognition_mode = 'temporizador'
+        app.sessao_camera.reiniciar()
+        app.sessao_camera.mao_detectada_em = datetime.now() - timedelta(seconds=app.min_hand_time)
+        app.classificar(pacote)
+
+    benchmarks = {
+        'process_landmarks': (app.process_landmarks, landmarks),
+        'coletor_processar_landmarks': (coletor.processar_landmarks, landmarks),
+        'imencode_jpeg': (lambda f: cv2.imencode('.jpg', f), [frame]),
+        'draw_landmarks': (lambda lm: mp_draw.draw_landmarks(frame.copy(), lm, mp_hands.HAND_CONNECTIONS), landmarks),
+        'classificar': (classificar_com_predicao, pacotes),
+        'quadro_completo': (lambda f: cv2.imencode('.jpg', app.processar_frame(f)), [frame]),
+    }
+    if app.model is not None and app.scaler is not None:
+        benchmarks['scaler_model_predict'] = (lambda f: app.model.predict(app.scaler.transform(f.reshape(1, -1))), features)
+        benchmarks['preditor_compilado'] = (app.preditor.predict, features)
+    else:
+        print("⚠️ Nenhum modelo em modelos/: benchmarks de predição ignorados")
+
+    resultados = {}
+    for nome, (funcao, entradas) in benchmarks.items():
+        if apenas and nome not in apenas: continue
+        # Etapas com MediaPipe/JPEG do frame inteiro são bem mais lentas: menos iterações
+        n = max(20, iteracoes // 10) if nome == 'quadro_completo' else iteracoes
+        resultados[nome] = medir(funcao, entradas, n)
+        print(f"⏱️  {nome:<28} mediana {resultados[nome]['mediana_us']:>10.1f} µs   p90 {resultados[nome]['p90_us']:>10.1f} µs")
+
+    if arquivo_video:
+        frames = ler_video(arquivo_video)
+        letra = (lambda mao: app.preditor.predict(app.process_landmarks(mao))[0]) if app.preditor is not None else None
+        for nome, resultado in comparar_roi(frames, app.parametros_maos, letra, apenas).items():
+            resultados[nome] = resultado
+            extra = f"   mão {resultado['frames_com_mao']}/{len(frames)}"
+            if resultado.get('concordancia_letras') is not None: extra += f"   letras iguais {resultado['concordancia_letras']:.1%}"
+            print(f"⏱️  {nome:<28} mediana {resultado['mediana_us']:>10.1f} µs   p90 {resultado['p90_us']:>10.1f} µs{extra}")
+    elif not apenas or any(nome.startswith('maos_') for nome in apenas):
+        print("⚠️ Sem --video: comparação com e sem ROI ignorada")
+    return resultados
+
+
+def comparar(resultados, baseline, limiar):
+    """Lista de etapas cuja mediana piorou mais que `limiar` (fração) em relação à baseline"""
+    regressoes = []
+    for nome, atual in resultados.items():
+        referencia = baseline.get('resultados', {}).get(nome)
+        if not referencia: continue
+        razao = atual['mediana_us'] / referencia['mediana_us'] if referencia['mediana_us'] else 1.0
+        if razao > 1 + limiar:
+            regressoes.append({'etapa': nome, 'baseline_us': referencia['mediana_us'],
+                               'atual_us': atual['mediana_us'], 'razao': round(razao, 2)})
+    return regressoes
+
+
+def commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError): return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks do reconhecimento TraduLibras')
+    parser.add_argument('--iteracoes', type=int, default=500)
+    parser.add_argument('--landmarks', help='log de landmarks gravado (.tlm) em vez de mãos sintéticas')
+    parser.add_argument('--video', help='vídeo gravado com a mão (.avi) para comparar o MediaPipe com e sem ROI')
+    parser.add_argument('--apenas', help='etapas separadas por vírgula')
+    parser.add_argument('--saida', default=ARQUIVO_RESULTADOS)
+    parser.add_argument('--baseline', default=ARQUIVO_BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true', help='grava este resultado como nova baseline')
+    parser.add_argument('--limiar', type=float, default=0.25, help='piora tolerada da mediana (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    print("🚀 BENCHMARK TRADULIBRAS")
+    print("=" * 50)
+    resultados = executar(args.iteracoes, args.landmarks, args.apenas.split(',') if args.apenas else None, args.video)
+    import app_funcional as app
+
+    relatorio = {
+        'data': datetime.now().isoformat(),
+        'commit': commit_atual(),
+        'parametros': {'iteracoes': args.iteracoes, 'landmarks': args.landmarks, 'video': args.video,
+                       'modelo': app.monitor_modelos.status()['ativo'], 'maos': app.parametros_maos.status()},
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'resultados': resultados,
+        'regressoes': [],
+    }
+
+    if os.path.exists(args.baseline) and not args.salvar_baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f: baseline = json.load(f)
+        relatorio['baseline'] = args.baseline
+        relatorio['limiar'] = args.limiar
+        relatorio['regressoes'] = comparar(resultados, baseline, args.limiar)
+        if baseline.get('parametros') != relatorio['parametros'] or baseline.get('plataforma') != relatorio['plataforma']:
+            print(f"⚠️ Baseline ({baseline.get('commit')}) gravada com outros parâmetros/máquina: "
+                  f"{baseline.get('parametros')} x {relatorio['parametros']}")
+
+    with open(args.saida, 'w', encoding='utf-8') as f: json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print("=" * 50)
+    print(f"📁 Resultados: {args.saida}")
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f: json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        print(f"📌 Baseline salva em {args.baseline}")
+        return 0
+
+    for regressao in relatorio['regressoes']:
+        print(f"❌ Regressão em {regressao['etapa']}: {regressao['baseline_us']} µs -> {regressao['atual_us']} µs (x{regressao['razao']})")
+    if not relatorio['regressoes'] and 'baseline' in relatorio: print("✅ Sem regressões em relação à baseline")
+    return 1 if relatorio['regressoes'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Captura compartilhada da câmera para o TraduLibras
+Um único worker por câmera captura e reconhece cada frame uma vez e o entrega
+a todos os clientes conectados em /video_feed; cada perfil de qualidade
+(resolução + JPEG) é codificado uma única vez por frame e só se alguém o pedir
+"""
+
+import collections
+import threading
+import time
+
+
+class PerfilStream(collections.namedtuple('PerfilStream', 'largura qualidade fps')):
+    """Qualidade pedida por um cliente: largura máxima (px), qualidade JPEG e FPS máximo"""
+
+    QUALIDADE_PADRAO = 95  # padrão do cv2.imencode
+
+    @classmethod
+    def de_parametros(cls, parametros):
+        """Lê ?largura=&qualidade=&fps= (valores ausentes ou inválidos usam o padrão)"""
+        def ler(nome, minimo, maximo):
+            try: valor = int(parametros.get(nome))
+            except (TypeError, ValueError): return None
+            return min(max(valor, minimo), maximo)
+
+        return cls(largura=ler('largura', 80, 1920),
+                   qualidade=ler('qualidade', 10, 100) or cls.QUALIDADE_PADRAO,
+                   fps=ler('fps', 1, 60))
+
+    def codificar(self, frame):
+        """Reduz (sem ampliar) para a largura pedida e codifica em JPEG"""
+        import cv2  # OpenCV só quando o primeiro frame é codificado, não no import do app
+        altura, largura = frame.shape[:2]
+        if self.largura and self.largura < largura:
+            frame = cv2.resize(frame, (self.largura, round(altura * self.largura / largura)), interpolation=cv2.INTER_AREA)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.qualidade])
+        return buffer.tobytes() if ret else None
+
+
+class FilaDescarte:
+    """Fila limitada que descarta o item mais antigo quando enche"""
+
+    def __init__(self, tamanho=1):
+        self.itens = collections.deque(maxlen=tamanho)
+        self.condicao = threading.Condition()
+        self.descartados = 0
+
+    def colocar(self, item):
+        with self.condicao:
+            if len(self.itens) == self.itens.maxlen: self.descartados += 1
+            self.itens.append(item)
+            self.condicao.notify()
+
+    def retirar(self, timeout=0.5):
+        """Retorna o próximo item ou None se nada chegar dentro do timeout"""
+        with self.condicao:
+            if not self.condicao.wait_for(lambda: self.itens, timeout): return None
+            return self.itens.popleft()
+
+
+class EstatisticasEstagios:
+    """Tempos por estágio (último e média móvel exponencial, em ms)
+
+    `observador(nome, segundos)`, se informado, recebe cada medição (ex.: métricas).
+    """
+
+    def __init__(self, alfa=0.1, observador=None):
+        self.alfa = alfa
+        self.observador = observador
+        self.lock = threading.Lock()
+        self.tempos = {}
+
+    def registrar(self, nome, segundos):
+        if self.observador is not None: self.observador(nome, segundos)
+        ms = segundos * 1000
+        with self.lock:
+            atual = self.tempos.get(nome)
+            if atual is None:
+                self.tempos[nome] = {'ultimo_ms': ms, 'medio_ms': ms, 'amostras': 1}
+            else:
+                atual['ultimo_ms'] = ms
+                atual['medio_ms'] += self.alfa * (ms - atual['medio_ms'])
+                atual['amostras'] += 1
+
+    def resumo(self):
+        with self.lock:
+            return {nome: {k: round(v, 2) if isinstance(v, float) else v for k, v in t.items()}
+                    for nome, t in self.tempos.items()}
+
+
+class CameraCompartilhada:
+    """Worker de captura + reconhecimento compartilhado entre assinantes
+
+    `estagios` é uma lista de (nome, função) aplicada a um pacote dict que
+    contém ao menos 'frame' e 't_captura'. No modo sequencial todos os estágios
+    rodam na thread de captura; no modo pipeline cada estágio (e a publicação)
+    roda na sua própria thread, ligadas por FilaDescarte.
+
+    O frame anotado é publicado cru; a codificação JPEG acontece sob demanda em
+    aguardar_jpeg(), uma vez por perfil e por frame, na thread do cliente que
+    chegar primeiro. Sem clientes nada é codificado.
+    """
+
+    def __init__(self, indice_camera, estagios, largura=640, altura=480, modo_pipeline=False, tamanho_fila=1,
+                 abrir_fonte=None, observador=None):
+        self.indice_camera = indice_camera
+        self.abrir_fonte = abrir_fonte
+        self.estagios = estagios
+        self.largura = largura
+        self.altura = altura
+        self.modo_pipeline = modo_pipeline
+        self.tamanho_fila = tamanho_fila
+        self.estatisticas = EstatisticasEstagios(observador=observador)
+        self.filas = []
+
+        self.condicao = threading.Condition()
+        self.assinantes = 0
+        self.frame = None
+        self.sequencia = 0
+        # perfil -> {'assinantes', 'lock', 'sequencia', 'jpeg', 'codificados', 'pulados'}
+        self.perfis = {}
+        self.thread = None
+        self._thread_anterior = None
+
+    def assinar(self, perfil=None):
+        """Registra um cliente (com seu perfil de qualidade) e inicia o worker se ele estiver parado"""
+        with self.condicao:
+            self.assinantes += 1
+            if perfil is not None:
+                estado = self.perfis.setdefault(perfil, {'assinantes': 0, 'lock': threading.Lock(), 'sequencia': None,
+                                                         'jpeg': None, 'codificados': 0, 'pulados': 0})
+                estado['assinantes'] += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._executar, args=(self._thread_anterior,), daemon=True)
+                self.thread.start()
+
+    def cancelar(self, perfil=None):
+        """Remove um cliente; o worker para quando o último sair"""
+        with self.condicao:
+            self.assinantes = max(0, self.assinantes - 1)
+            estado = self.perfis.get(perfil)
+            if estado is not None:
+                estado['assinantes'] -= 1
+                if estado['assinantes'] <= 0: del self.perfis[perfil]
+            if self.assinantes == 0 and self.thread is not None:
+                self._thread_anterior, self.thread = self.thread, None
+                self.frame = None
+                self.condicao.notify_all()
+
+    def ativo(self):
+        """Indica se o worker está rodando"""
+        return self.thread is not None
+
+    def aguardar_frame(self, ultima_sequencia):
+        """Bloqueia até existir um frame mais novo; retorna (sequencia, None) se o worker parou"""
+        with self.condicao:
+            self.condicao.wait_for(lambda: self.thread is None or
+                                   (self.sequencia != ultima_sequencia and self.frame is not None))
+            if self.thread is None: return self.sequencia, None
+            return self.sequencia, self.frame
+
+    def aguardar_jpeg(self, perfil, ultima_sequencia):
+        """Frame mais novo já codificado no perfil; clientes atrasados pulam direto para o último"""
+        sequencia, frame = self.aguardar_frame(ultima_sequencia)
+        if frame is None: return sequencia, None
+
+        estado = self.perfis.get(perfil)
+        if estado is None: return sequencia, perfil.codificar(frame)
+        with estado['lock']:
+            if estado['sequencia'] != sequencia:
+                inicio = time.perf_counter()
+                estado['jpeg'] = perfil.codificar(frame)
+                self.estatisticas.registrar('codificacao', time.perf_counter() - inicio)
+                if estado['sequencia'] is not None: estado['pulados'] += max(0, sequencia - estado['sequencia'] - 1)
+                estado['sequencia'] = sequencia
+                estado['codificados'] += 1
+            return sequencia, estado['jpeg']
+
+    def status(self):
+        """Modo, assinantes, tempos por estágio e descartes das filas"""
+        return {
+            'camera': self.indice_camera,
+            'ativo': self.ativo(),
+            'modo': 'pipeline' if self.modo_pipeline else 'sequencial',
+            'assinantes': self.assinantes,
+            'tempos': self.estatisticas.resumo(),
+            'descartados': [fila.descartados for fila in self.filas],
+            'perfis': [{**perfil._asdict(), 'assinantes': estado['assinantes'], 'codificados': estado['codificados'],
+                        'frames_pulados': estado['pulados']} for perfil, estado in list(self.perfis.items())]
+        }
+
+    def _publicar(self, pacote):
+        with self.condicao:
+            self.frame = pacote['frame']
+            self.sequencia += 1
+            self.condicao.notify_all()
+        return pacote
+
+    def _aplicar_estagio(self, nome, estagio, pacote):
+        inicio = time.perf_counter()
+        pacote = estagio(pacote)
+        fim = time.perf_counter()
+        self.estatisticas.registrar(nome, fim - inicio)
+        # Latência acumulada desde a captura (ex.: ate_classificacao = vidro até letra)
+        self.estatisticas.registrar(f'ate_{nome}', fim - pacote['t_captura'])
+        return pacote
+
+    def _capturar(self, camera):
+        inicio = time.perf_counter()
+        success, frame = camera.read()
+        if not success: return None
+        self.estatisticas.registrar('captura', time.perf_counter() - inicio)
+        return {'frame': frame, 't_captura': inicio}
+
+    def _executar(self, anterior):
+        # Garante que a execução anterior já liberou o dispositivo
+        if anterior is not None: anterior.join()
+        minha_thread = threading.current_thread()
+
+        import cv2
+        camera = (self.abrir_fonte or cv2.VideoCapture)(self.indice_camera)
+        camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.largura)
+        camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.altura)
+        # O modo só muda entre execuções do worker
+        modo_pipeline = self.modo_pipeline
+        parar = threading.Event()
+        workers = self._iniciar_pipeline(parar) if modo_pipeline else []
+        try:
+            while self.thread is minha_thread:
+                pacote = self._capturar(camera)
+                if pacote is None: break
+
+                if modo_pipeline:
+                    self.filas[0].colocar(pacote)
+                    continue
+                for nome, estagio in self.estagios:
+                    pacote = self._aplicar_estagio(nome, estagio, pacote)
+                self._aplicar_estagio('publicacao', self._publicar, pacote)
+        except Exception as e: print(f"❌ Erro na câmera {self.indice_camera}: {e}")
+        finally:
+            parar.set()
+            for worker in workers: worker.join()
+            camera.release()
+            with self.condicao:
+                if self.thread is minha_thread:
+                    self._thread_anterior, self.thread = minha_thread, None
+                    self.frame = None
+                self.condicao.notify_all()
+
+    def _iniciar_pipeline(self, parar):
+        """Cria uma thread por estágio, ligadas por filas que descartam o frame mais antigo"""
+        self.filas = [FilaDescarte(self.tamanho_fila) for _ in range(len(self.estagios) + 1)]
+        etapas = [(nome, lambda p, n=nome, e=estagio: self._aplicar_estagio(n, e, p))
+                  for nome, estagio in self.estagios]
+        etapas.append(('publicacao', lambda p: self._aplicar_estagio('publicacao', self._publicar, p)))
+
+        workers = []
+        for i, (nome, etapa) in enumerate(etapas):
+            saida = self.filas[i + 1] if i + 1 < len(self.filas) else None
+            worker = threading.Thread(target=self._executar_estagio, args=(etapa, self.filas[i], saida, parar),
+                                      name=f'camera{self.indice_camera}-{nome}', daemon=True)
+            worker.start()
+            workers.append(worker)
+        return workers
+
+    def _executar_estagio(self, etapa, entrada, saida, parar):
+        while not parar.is_set():
+            pacote = entrada.retirar()
+            if pacote is None: continue
+            try:
+                pacote = etapa(pacote)
+                if saida is not None and pacote is not None: saida.colocar(pacote)
+            except Exception as e: print(f"❌ Erro no pipeline da câmera {self.indice_camera}: {e}")
+
+
+# Registro de workers por índice de câmera
+_cameras = {}
+_cameras_lock = threading.Lock()
+
+def obter_camera_compartilhada(indice_camera, estagios, modo_pipeline=False, abrir_fonte=None,
+                               observador=None):
+    """Retorna o worker da câmera (ou arquivo de replay), criando-o na primeira vez"""
+    with _cameras_lock:
+        camera = _cameras.get(indice_camera)
+        if camera is None:
+            camera = _cameras[indice_camera] = CameraCompartilhada(indice_camera, estagios, modo_pipeline=modo_pipeline,
+                                                                   abrir_fonte=abrir_fonte, observador=observador)
+        return camera
+
+def definir_modo_pipeline(ativo):
+    """Altera o modo de todos os workers; vale a partir do próximo início de cada um"""
+    with _cameras_lock:
+        for camera in _cameras.values(): camera.modo_pipeline = ativo
+
+def status_cameras():
+    """Status de todos os workers criados"""
+    with _cameras_lock:
+        return [camera.status() for camera in _cameras.values()]
+
+def total_assinantes():
+    """Total de clientes assistindo a alguma câmera"""
+    with _cameras_lock:
+        return sum(camera.assinantes for camera in _cameras.values())
@@ -1,19 +1,21 @@
 #!/usr/bin/env python3
 """
 Coletor de Dados LIBRAS
-Versão com salvamento contínuo em um único CSV
+Versão com salvamento contínuo em um único CSV, gravado em blocos durante a coleta
 """
 
 import cv2
 import mediapipe as mp
 import numpy as np
-import pandas as pd
 import os
 import time
+import argparse
 from datetime import datetime
+from features_libras import features_de_landmarks
+from dataset_libras import GravadorAmostras, EXTENSAO_DATASET
 
 class ColetorLIBRAS:
-    def __init__(self, pasta_dados='dados_coletados', arquivo_csv='gestos_libras.csv'):
+    def __init__(self, pasta_dados='dados_coletados', arquivo_csv='gestos_libras.csv', bloco=25, intervalo=5.0):
         """Inicializar coletor"""
         self.pasta_dados = pasta_dados
         self.arquivo_csv = arquivo_csv
@@ -31,58 +33,22 @@ class ColetorLIBRAS:
         if not os.path.exists(pasta_dados):
             os.makedirs(pasta_dados)
             
-        self.dados_coletados = []
         self.classe_atual = None
         self.contador_amostras = 0
 
-        # Carregar dados anteriores (se existirem)
-        if os.path.exists(self.caminho_arquivo):
-            try:
-                self.dados_existentes = pd.read_csv(self.caminho_arquivo)
-                print(f"📂 Dados anteriores carregados ({len(self.dados_existentes)} amostras)")
-            except Exception as e:
-                print(f"⚠️ Erro ao carregar dados existentes: {e}")
-                self.dados_existentes = pd.DataFrame()
-        else:
-            self.dados_existentes = pd.DataFrame()
+        # Dados anteriores não são lidos: as amostras novas vão para o final do arquivo
+        # em blocos (recuperando um bloco interrompido) e os totais vêm do índice
+        self.gravador = GravadorAmostras(self.caminho_arquivo, bloco=bloco, intervalo=intervalo)
+        print(f"📂 Dados anteriores: {self.gravador.total} amostras")
 
     def processar_landmarks(self, hand_landmarks):
         """Processar landmarks da mão"""
-        if not hand_landmarks:
+        # Mesma extração usada na inferência (features_libras)
+        features = features_de_landmarks(hand_landmarks)
+        if features is None:
             return None
 
-        wrist = hand_landmarks.landmark[0]
-        features = []
-
-        for landmark in hand_landmarks.landmark:
-            features.extend([
-                landmark.x - wrist.x,
-                landmark.y - wrist.y
-            ])
-
-        # Features extras
-        thumb_tip = hand_landmarks.landmark[4]
-        index_tip = hand_landmarks.landmark[8]
-        middle_tip = hand_landmarks.landmark[12]
-        ring_tip = hand_landmarks.landmark[16]
-        pinky_tip = hand_landmarks.landmark[20]
-
-        features.extend([
-            abs(thumb_tip.x - wrist.x) + abs(thumb_tip.y - wrist.y),
-            abs(index_tip.x - wrist.x) + abs(index_tip.y - wrist.y),
-            abs(middle_tip.x - wrist.x) + abs(middle_tip.y - wrist.y),
-            abs(ring_tip.x - wrist.x) + abs(ring_tip.y - wrist.y),
-            abs(pinky_tip.x - wrist.x) + abs(pinky_tip.y - wrist.y)
-        ])
-
-        features.extend([
-            abs(thumb_tip.x - index_tip.x) + abs(thumb_tip.y - index_tip.y),
-            abs(index_tip.x - middle_tip.x) + abs(index_tip.y - middle_tip.y),
-            abs(middle_tip.x - ring_tip.x) + abs(middle_tip.y - ring_tip.y),
-            abs(ring_tip.x - pinky_tip.x) + abs(ring_tip.y - pinky_tip.y)
-        ])
-
-        return features  # total: 51 features
+        return features.tolist()  # total: 51 features
 
     def mostrar_status(self, frame, classe, contador, indice_atual, total_classes):
         """Mostrar status na tela"""
@@ -124,82 +90,78 @@ class ColetorLIBRAS:
         cooldown_detecacao = 0.5
         ultima_detecacao = time.time()
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame = cv2.flip(frame, 1)
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.hands.process(rgb)
-
-            if results.multi_hand_landmarks:
-                for hand_landmarks in results.multi_hand_landmarks:
-                    self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
-                    if time.time() - ultima_detecacao >= cooldown_detecacao:
-                        pontos = self.processar_landmarks(hand_landmarks)
-                        if pontos:
-                            # Salvar o símbolo real se for tuple
-                            classe_para_salvar = self.classe_atual[1] if isinstance(self.classe_atual, tuple) else self.classe_atual
-                            self.dados_coletados.append([classe_para_salvar] + pontos)
-                            self.contador_amostras += 1
-                            ultima_detecacao = time.time()
-                            print(f"📝 Amostra {self.contador_amostras} coletada ({classe_para_salvar})")
-
-            self.mostrar_status(frame, self.classe_atual, self.contador_amostras, indice_classe, total_classes)
-            cv2.imshow("Coletor LIBRAS", frame)
-
-            tecla = cv2.waitKey(1) & 0xFF
-            if tecla == 27:  # ESC
-                break
-            elif tecla == 32:  # SPACE
-                indice_classe += 1
-                if indice_classe < len(classes):
-                    self.classe_atual = classes[indice_classe]
-                    self.contador_amostras = 0
-                    display_name = self.classe_atual[1] if isinstance(self.classe_atual, tuple) else self.classe_atual
-                    print(f"\n➡️ Mudando para classe: {display_name}")
-                else:
-                    print("\n✅ Todas as classes coletadas!")
+        # Sair por erro ou Ctrl+C também grava o bloco pendente
+        try:
+            while True:
+                ret, frame = cap.read()
+                if not ret:
                     break
 
-        cap.release()
-        cv2.destroyAllWindows()
-        self.salvar_dados()
+                frame = cv2.flip(frame, 1)
+                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                results = self.hands.process(rgb)
+
+                if results.multi_hand_landmarks:
+                    for hand_landmarks in results.multi_hand_landmarks:
+                        self.mp_draw.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+                        if time.time() - ultima_detecacao >= cooldown_detecacao:
+                            pontos = self.processar_landmarks(hand_landmarks)
+                            if pontos:
+                                # Salvar o símbolo real se for tuple
+                                classe_para_salvar = self.classe_atual[1] if isinstance(self.classe_atual, tuple) else self.classe_atual
+                                self.gravador.adicionar(classe_para_salvar, pontos)
+                                self.contador_amostras += 1
+                                ultima_detecacao = time.time()
+                                print(f"📝 Amostra {self.contador_amostras} coletada ({classe_para_salvar})")
+
+                # Grava o bloco pendente mesmo sem novas amostras (mão fora da câmera)
+                self.gravador.periodico()
+
+                self.mostrar_status(frame, self.classe_atual, self.contador_amostras, indice_classe, total_classes)
+                cv2.imshow("Coletor LIBRAS", frame)
+
+                tecla = cv2.waitKey(1) & 0xFF
+                if tecla == 27:  # ESC
+                    break
+                elif tecla == 32:  # SPACE
+                    indice_classe += 1
+                    if indice_classe < len(classes):
+                        self.classe_atual = classes[indice_classe]
+                        self.contador_amostras = 0
+                        display_name = self.classe_atual[1] if isinstance(self.classe_atual, tuple) else self.classe_atual
+                        print(f"\n➡️ Mudando para classe: {display_name}")
+                    else:
+                        print("\n✅ Todas as classes coletadas!")
+                        break
+        finally:
+            cap.release()
+            cv2.destroyAllWindows()
+            self.salvar_dados()
 
     def salvar_dados(self):
-        """Salvar os dados coletados (sem sobrescrever)"""
-        if not self.dados_coletados:
+        """Gravar as amostras pendentes (as anteriores já estão no arquivo)"""
+        print("\n💾 Salvando dados...")
+        self.gravador.fechar()
+        if not self.gravador.sessao:
             print("❌ Nenhum dado coletado nesta sessão.")
             return
 
-        print("\n💾 Salvando dados...")
-
-        # Formatar colunas
-        columns = ['gesture_type'] + [f'feature_{i+1}' for i in range(51)]
-        novos_dados = pd.DataFrame(self.dados_coletados, columns=columns)
-
-        # Se já existirem dados antigos, unir tudo
-        if not self.dados_existentes.empty:
-            df_final = pd.concat([self.dados_existentes, novos_dados], ignore_index=True)
-        else:
-            df_final = novos_dados
-
-        df_final.to_csv(self.caminho_arquivo, index=False)
-        total_amostras = len(df_final)
-        classes_unicas = df_final['gesture_type'].unique()
-
         print("=" * 60)
         print("✅ DADOS SALVOS (modo contínuo)")
         print(f"📁 Arquivo: {self.caminho_arquivo}")
-        print(f"📊 Total acumulado: {total_amostras}")
-        print(f"🎯 Classes presentes: {', '.join(classes_unicas)}")
+        print(f"📝 Amostras desta sessão: {self.gravador.sessao} em {self.gravador.blocos_gravados} blocos")
+        print(f"📊 Total acumulado: {self.gravador.total}")
+        print(f"🎯 Classes presentes: {', '.join(self.gravador.classes())}")
         print("=" * 60)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Coletor de dados LIBRAS')
+    parser.add_argument('--binario', action='store_true', help=f'salva em gestos_libras{EXTENSAO_DATASET} (dataset binário) em vez do CSV')
+    args = parser.parse_args()
+
     print("🚀 Iniciando Coletor LIBRAS (modo contínuo)...")
-    coletor = ColetorLIBRAS()
+    coletor = ColetorLIBRAS(arquivo_csv='gestos_libras' + EXTENSAO_DATASET) if args.binario else ColetorLIBRAS()
     coletor.coletar_dados()
     print("👋 Finalizado!")
 
@@ -2,11 +2,13 @@
 import serial
 import time
 import serial.tools.list_ports
+from mao_robotica_libras import ProtocoloMao
 
 class MaoRobotica:
     def __init__(self):
         self.arduino = None
         self.porta = None
+        self.protocolo = None
         
     def conectar(self):
         """Conecta automaticamente com o Arduino"""
@@ -19,35 +21,32 @@ class MaoRobotica:
         if not self.porta and portas:
             self.porta = portas[0].device
             
+        conectado = False
         try:
-            self.arduino = serial.Serial(self.porta, 115200, timeout=1)
+            self.arduino = serial.Serial(self.porta, 115200, timeout=0.1)
             time.sleep(2)
-            print(f"✅ Conectado em {self.porta}")
+            # Thread de leitura: cada letra termina quando o Arduino avisa, sem tempo fixo
+            self.protocolo = ProtocoloMao(self.arduino)
+            versao = self.protocolo.identificar()
+            print(f"✅ Conectado em {self.porta} (protocolo v{versao})")
+            conectado = True
             return True
-        except:
-            print(f"❌ Erro ao conectar em {self.porta}")
+        except (serial.SerialException, ConnectionError, OSError) as e:
+            print(f"❌ Erro ao conectar em {self.porta}: {e}")
             return False
+        finally:
+            # Qualquer falha: nem a thread de leitura nem a porta ficam abertas
+            if not conectado: self.fechar()
     
     def enviar_letra(self, letra):
         """Envia uma letra para o Arduino"""
-        if self.arduino and self.arduino.is_open:
-            self.arduino.write(letra.encode() + b'\n')
+        if self.arduino and self.arduino.is_open and self.protocolo:
             print(f"📤 Enviado: {letra.upper()}", end=' ')
             
-            # Aguarda resposta
-            time.sleep(0.8)  # Aumentei o tempo para movimento completo
-            resposta = ""
-            while self.arduino.in_waiting > 0:
-                linha = self.arduino.readline().decode('utf-8', errors='ignore').strip()
-                if linha and "EXECUTANDO" in linha:
-                    resposta = linha
-            
-            if resposta:
-                print(f"→ {resposta}")
-            else:
-                print("→ ✓")
-                
-            return True
+            # Aguarda o Arduino avisar que o movimento terminou
+            sucesso, resposta = self.protocolo.enviar_letra(letra)
+            print(f"→ {resposta}" if sucesso else f"→ ❌ {resposta}")
+            return sucesso
         return False
     
     def executar_palavra(self, palavra):
@@ -142,9 +141,12 @@ class MaoRobotica:
     
     def fechar(self):
         """Fecha a conexão"""
+        if self.protocolo:
+            self.protocolo.fechar()
         if self.arduino and self.arduino.is_open:
             self.arduino.close()
             print("🔌 Conexão fechada")
+        self.arduino = self.protocolo = None
 
 # PROGRAMA PRINCIPAL
 def main():
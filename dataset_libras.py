@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+Dataset binário do TraduLibras
+Formato compacto ao lado do gestos_libras.csv: cabeçalho de 4 KB (versão,
+amostras confirmadas, tabela de classes e metadados em JSON) seguido de
+registros de tamanho fixo (código da classe + 51 features float32). O
+arquivo é aberto por memória mapeada e cresce só no final. Também grava as
+amostras do coletor em blocos (CSV com índice e diário, ou .tlds)
+"""
+
+import argparse
+import json
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+import numpy as np
+from features_libras import NUM_FEATURES, COLUNAS_CSV
+
+# Cabeçalho: mágico (8) + amostras confirmadas uint64 (8) + tamanho do JSON uint32 (4) + JSON
+MAGICO_DATASET = b'TLIBDS01'
+VERSAO_DATASET = 1
+TAMANHO_CABECALHO = 4096  # registros começam numa página: o memmap não precisa de deslocamento desalinhado
+ESTRUTURA_CABECALHO = struct.Struct('<8sQI')
+FORMATO_REGISTRO = np.dtype([('classe', '<u4'), ('features', '<f4', (NUM_FEATURES,))])  # 208 bytes
+EXTENSAO_DATASET = '.tlds'
+
+
+class DatasetLIBRAS:
+    """Amostras em um arquivo .tlds; `modo` 'r' (só leitura) ou 'a' (anexa, cria se não existir)
+
+    Só as primeiras `len(dataset)` amostras contam: anexar() grava os registros,
+    sincroniza e só então atualiza a contagem no cabeçalho, então uma gravação
+    interrompida deixa no máximo um final ignorado (descartado na próxima abertura
+    para escrita).
+    """
+
+    def __init__(self, caminho, modo='r', metadados=None):
+        if modo not in ('r', 'a'): raise ValueError("Modo deve ser 'r' ou 'a'")
+        self.caminho = caminho
+        self.modo = modo
+        if modo == 'a' and not os.path.exists(caminho): self._criar(metadados or {})
+        self.arquivo = open(caminho, 'rb' if modo == 'r' else 'r+b')
+        self._ler_cabecalho()
+        self._mapa = None
+        if modo == 'a':
+            # Descarta um final não confirmado (gravação interrompida)
+            self.arquivo.truncate(TAMANHO_CABECALHO + self.amostras * FORMATO_REGISTRO.itemsize)
+
+    def _criar(self, metadados):
+        agora = datetime.now().isoformat()
+        info = {'versao': VERSAO_DATASET, 'num_features': NUM_FEATURES, 'classes': [],
+                'criado_em': agora, 'atualizado_em': agora, 'metadados': metadados}
+        temporario = self.caminho + '.tmp'
+        with open(temporario, 'wb') as f:
+            f.write(_montar_cabecalho(0, info))
+        os.replace(temporario, self.caminho)
+
+    def _ler_cabecalho(self):
+        self.arquivo.seek(0)
+        bruto = self.arquivo.read(TAMANHO_CABECALHO)
+        if len(bruto) < TAMANHO_CABECALHO: raise ValueError(f"{self.caminho}: cabeçalho incompleto")
+        magico, amostras, tamanho = ESTRUTURA_CABECALHO.unpack_from(bruto)
+        if magico != MAGICO_DATASET: raise ValueError(f"{self.caminho}: não é um dataset TraduLibras")
+        info = json.loads(bruto[ESTRUTURA_CABECALHO.size:ESTRUTURA_CABECALHO.size + tamanho].decode('utf-8'))
+        if info.get('versao') != VERSAO_DATASET: raise ValueError(f"Versão {info.get('versao')} não suportada")
+        if info.get('num_features') != NUM_FEATURES:
+            raise ValueError(f"Dataset com {info.get('num_features')} features, o app gera {NUM_FEATURES}")
+        disponiveis = (os.fstat(self.arquivo.fileno()).st_size - TAMANHO_CABECALHO) // FORMATO_REGISTRO.itemsize
+        if amostras > disponiveis: raise ValueError(f"{self.caminho}: cabeçalho indica {amostras} amostras, arquivo tem {disponiveis}")
+        self.amostras, self.info = amostras, info
+        self.classes = list(info['classes'])
+        self.metadados = info.get('metadados', {})
+
+    def __len__(self): return self.amostras
+
+    def __enter__(self): return self
+
+    def __exit__(self, *erro): self.fechar()
+
+    def registros(self):
+        """Registros confirmados como memmap estruturado somente leitura (nada é lido até ser usado)"""
+        if self.amostras == 0: return np.zeros(0, dtype=FORMATO_REGISTRO)
+        if self._mapa is None or len(self._mapa) != self.amostras:
+            self._mapa = np.memmap(self.caminho, dtype=FORMATO_REGISTRO, mode='r', offset=TAMANHO_CABECALHO,
+                                   shape=(self.amostras,))
+        return self._mapa
+
+    def features(self, inicio=0, fim=None):
+        """(N, 51) float32 direto do mapa de memória"""
+        return self.registros()['features'][inicio:fim]
+
+    def codigos(self, inicio=0, fim=None): return self.registros()['classe'][inicio:fim]
+
+    def labels(self, inicio=0, fim=None):
+        """Nomes das classes (objeto, como no pd.read_csv) a partir da tabela de classes"""
+        return np.array(self.classes, dtype=object)[np.asarray(self.codigos(inicio, fim))]
+
+    def contagem_por_classe(self):
+        contagem = np.bincount(np.asarray(self.codigos()), minlength=len(self.classes))
+        return dict(zip(self.classes, contagem.tolist()))
+
+    def anexar(self, labels, features):
+        """Acrescenta amostras (classes novas entram na tabela); retorna o total confirmado"""
+        if self.modo != 'a': raise ValueError("Dataset aberto só para leitura")
+        features = np.asarray(features, dtype=np.float32)
+        labels = np.asarray(labels, dtype=object)
+        if features.ndim != 2 or features.shape[1] != NUM_FEATURES or len(labels) != len(features):
+            raise ValueError(f"Esperado (N, {NUM_FEATURES}) features e N classes")
+        if not np.all(np.isfinite(features)): raise ValueError("Features com valores não finitos")
+        if len(features) == 0: return self.amostras
+
+        indices = {classe: i for i, classe in enumerate(self.classes)}
+        for classe in dict.fromkeys(labels.tolist()):
+            if classe not in indices:
+                indices[classe] = len(self.classes)
+                self.classes.append(classe)
+        registros = np.empty(len(features), dtype=FORMATO_REGISTRO)
+        registros['classe'] = [indices[classe] for classe in labels.tolist()]
+        registros['features'] = features
+
+        self.arquivo.seek(TAMANHO_CABECALHO + self.amostras * FORMATO_REGISTRO.itemsize)
+        self.arquivo.write(registros.tobytes())
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        # Só agora as amostras passam a contar
+        self.amostras += len(registros)
+        self.info.update(classes=self.classes, atualizado_em=datetime.now().isoformat())
+        self.arquivo.seek(0)
+        self.arquivo.write(_montar_cabecalho(self.amostras, self.info))
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        return self.amostras
+
+    def fechar(self):
+        self._mapa = None
+        if not self.arquivo.closed: self.arquivo.close()
+
+
+def _montar_cabecalho(amostras, info):
+    dados = json.dumps(info, ensure_ascii=False).encode('utf-8')
+    if ESTRUTURA_CABECALHO.size + len(dados) > TAMANHO_CABECALHO:
+        raise ValueError("Tabela de classes/metadados não cabe no cabeçalho de 4 KB")
+    cabecalho = ESTRUTURA_CABECALHO.pack(MAGICO_DATASET, amostras, len(dados)) + dados
+    return cabecalho.ljust(TAMANHO_CABECALHO, b'\0')
+
+
+def ler_csv(arquivo_csv, blocos=None):
+    """pd.read_csv validando as colunas; com `blocos`, gera DataFrames de até esse tamanho"""
+    import pandas as pd
+    leitor = pd.read_csv(arquivo_csv, dtype={COLUNAS_CSV[0]: str}, keep_default_na=False, chunksize=blocos)
+    for df in ([leitor] if blocos is None else leitor):
+        if len(df.columns) != NUM_FEATURES + 1:
+            raise ValueError(f"Formato incorreto. Esperado {NUM_FEATURES + 1} colunas, encontrado {len(df.columns)}")
+        yield df
+
+
+def csv_para_dataset(arquivo_csv, arquivo_dataset, blocos=100_000):
+    """Converte (ou acrescenta a) um .tlds a partir do CSV, lendo em blocos; retorna o total"""
+    with DatasetLIBRAS(arquivo_dataset, 'a', metadados={'origem': os.path.basename(arquivo_csv)}) as dataset:
+        for df in ler_csv(arquivo_csv, blocos):
+            dataset.anexar(df.iloc[:, 0].values, df.iloc[:, 1:].values)
+        return len(dataset)
+
+
+def dataset_para_csv(arquivo_dataset, arquivo_csv, blocos=100_000):
+    """Exporta o .tlds no formato do gestos_libras.csv; retorna o total"""
+    import pandas as pd
+    with DatasetLIBRAS(arquivo_dataset) as dataset, open(arquivo_csv, 'w', newline='', encoding='utf-8') as saida:
+        for inicio in range(0, max(len(dataset), 1), blocos):
+            df = pd.DataFrame(np.asarray(dataset.features(inicio, inicio + blocos)), columns=COLUNAS_CSV[1:])
+            df.insert(0, COLUNAS_CSV[0], dataset.labels(inicio, inicio + blocos))
+            df.to_csv(saida, index=False, header=inicio == 0)
+        return len(dataset)
+
+
+# ==================== SALVAMENTO INCREMENTAL ====================
+def _gravar_json_atomico(caminho, dados):
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+def _sincronizar(arquivo):
+    arquivo.flush()
+    os.fsync(arquivo.fileno())
+
+
+def ler_indice(caminho):
+    """Índice ao lado do CSV gravado pelo GravadorAmostras (bytes/amostras confirmados), ou None"""
+    try:
+        with open(caminho + '.indice.json', 'r', encoding='utf-8') as f: indice = json.load(f)
+        indice['bytes'], indice['amostras'], indice['classes']
+        return indice
+    except (OSError, ValueError, KeyError, TypeError): return None
+
+
+def fim_confirmado(caminho):
+    """(bytes, amostras) confirmados de um CSV: pelo índice, se bater com o arquivo; amostras None sem índice"""
+    tamanho = os.path.getsize(caminho)
+    indice = ler_indice(caminho)
+    if indice and indice['bytes'] <= tamanho and not os.path.exists(caminho + '.diario'):
+        return indice['bytes'], indice['amostras']
+    return tamanho, None
+
+
+class GravadorAmostras:
+    """Acrescenta amostras a gestos_libras.csv (ou .tlds) em blocos, sem reler as anteriores
+
+    As amostras ficam pendentes até somarem `bloco` ou passarem `intervalo`
+    segundos desde a última gravação (conferido em adicionar() e periodico()),
+    e sempre em fechar(). No CSV, os totais vêm do índice ao lado
+    (`<arquivo>.indice.json`: bytes e amostras confirmados, contagem por classe)
+    e cada bloco passa antes pelo diário (`<arquivo>.diario`): se o processo cair
+    no meio da escrita, a próxima abertura refaz o bloco a partir do diário. O
+    .tlds já confirma cada bloco pelo próprio cabeçalho.
+    """
+
+    def __init__(self, caminho, bloco=25, intervalo=5.0):
+        self.caminho = caminho
+        self.bloco = bloco
+        self.intervalo = intervalo
+        self.binario = caminho.endswith(EXTENSAO_DATASET)
+        self.arquivo_indice = caminho + '.indice.json'
+        self.arquivo_diario = caminho + '.diario'
+        self.pendentes = []
+        self.sessao = 0
+        self.blocos_gravados = 0
+        self.ultima_gravacao = time.monotonic()
+        if self.binario:
+            with DatasetLIBRAS(caminho, 'a') as dataset:
+                self.indice = {'amostras': len(dataset), 'classes': dataset.contagem_por_classe()}
+        else:
+            self.indice = self._abrir_csv()
+
+    # ---------- CSV: índice e diário ----------
+    def _indice_vazio(self):
+        return {'versao': 1, 'bytes': 0, 'amostras': 0, 'classes': {}, 'blocos': 0, 'atualizado_em': None}
+
+    def _reconstruir_indice(self):
+        """Varre o CSV uma vez (só a coluna da classe, em blocos) para montar o índice"""
+        import pandas as pd
+        indice = self._indice_vazio()
+        tamanho = os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+        if tamanho:
+            print(f"🔎 Montando o índice de {self.caminho}...")
+            for df in pd.read_csv(self.caminho, usecols=[0], dtype=str, keep_default_na=False, chunksize=100_000):
+                for classe, quantidade in df.iloc[:, 0].value_counts(sort=False).items():
+                    indice['classes'][classe] = indice['classes'].get(classe, 0) + int(quantidade)
+                indice['amostras'] += len(df)
+        indice.update(bytes=tamanho, atualizado_em=datetime.now().isoformat())
+        _gravar_json_atomico(self.arquivo_indice, indice)
+        return indice
+
+    def _ler_diario(self):
+        """(cabeçalho, conteúdo) de um diário completo, ou None se estiver truncado/corrompido"""
+        try:
+            with open(self.arquivo_diario, 'rb') as f:
+                cabecalho = json.loads(f.readline().decode('utf-8'))
+                conteudo = f.read()
+            if len(conteudo) != cabecalho['tamanho'] or zlib.crc32(conteudo) != cabecalho['crc']: return None
+            return cabecalho, conteudo
+        except (OSError, ValueError, KeyError): return None
+
+    def _abrir_csv(self):
+        indice = ler_indice(self.caminho)
+        tamanho = os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+
+        if os.path.exists(self.arquivo_diario):
+            diario = self._ler_diario()
+            confere = diario and (indice['bytes'] in (diario[0]['inicio'], diario[0]['indice']['bytes']) if indice
+                                  else tamanho >= diario[0]['inicio'])
+            if confere:
+                # Refaz o bloco: corta o que foi escrito pela metade e grava de novo
+                cabecalho, conteudo = diario
+                with open(self.caminho, 'r+b' if os.path.exists(self.caminho) else 'wb') as f:
+                    f.truncate(cabecalho['inicio'])
+                    f.seek(cabecalho['inicio'])
+                    f.write(conteudo)
+                    _sincronizar(f)
+                indice = cabecalho['indice']
+                _gravar_json_atomico(self.arquivo_indice, indice)
+                print(f"♻️ Bloco interrompido recuperado do diário ({cabecalho['amostras']} amostras)")
+            else:
+                # Diário incompleto: o arquivo principal ainda não tinha sido tocado
+                if indice and tamanho > indice['bytes']:
+                    with open(self.caminho, 'r+b') as f: f.truncate(indice['bytes'])
+                print("⚠️ Diário incompleto descartado (as amostras do último bloco não chegaram ao disco)")
+            os.remove(self.arquivo_diario)
+            tamanho = os.path.getsize(self.caminho) if os.path.exists(self.caminho) else 0
+
+        if indice is None or indice['bytes'] != tamanho:
+            # Sem índice ou CSV alterado por fora: nunca corta dados, só recontar
+            indice = self._reconstruir_indice()
+        return indice
+
+    def _gravar_csv(self, pendentes):
+        import pandas as pd
+        df = pd.DataFrame(pendentes, columns=COLUNAS_CSV)
+        conteudo = df.to_csv(index=False, header=self.indice['bytes'] == 0).encode('utf-8')
+        novo = dict(self.indice, bytes=self.indice['bytes'] + len(conteudo), amostras=self.indice['amostras'] + len(df),
+                    classes=dict(self.indice['classes']), blocos=self.indice.get('blocos', 0) + 1,
+                    atualizado_em=datetime.now().isoformat())
+        for classe, quantidade in df[COLUNAS_CSV[0]].value_counts(sort=False).items():
+            novo['classes'][classe] = novo['classes'].get(classe, 0) + int(quantidade)
+
+        # 1) diário com o bloco inteiro  2) bloco no CSV  3) índice  4) some o diário
+        cabecalho = {'inicio': self.indice['bytes'], 'tamanho': len(conteudo), 'crc': zlib.crc32(conteudo),
+                     'amostras': len(df), 'indice': novo}
+        with open(self.arquivo_diario, 'wb') as f:
+            f.write(json.dumps(cabecalho, ensure_ascii=False).encode('utf-8') + b'\n' + conteudo)
+            _sincronizar(f)
+        with open(self.caminho, 'ab') as f:
+            f.write(conteudo)
+            _sincronizar(f)
+        _gravar_json_atomico(self.arquivo_indice, novo)
+        os.remove(self.arquivo_diario)
+        self.indice = novo
+
+    def _gravar_binario(self, pendentes):
+        with DatasetLIBRAS(self.caminho, 'a') as dataset:
+            dataset.anexar([amostra[0] for amostra in pendentes], [amostra[1:] for amostra in pendentes])
+        classes = dict(self.indice['classes'])
+        for amostra in pendentes: classes[amostra[0]] = classes.get(amostra[0], 0) + 1
+        self.indice = {'amostras': self.indice['amostras'] + len(pendentes), 'classes': classes}
+
+    # ---------- API ----------
+    def adicionar(self, classe, features):
+        self.pendentes.append([classe] + list(features))
+        self.sessao += 1
+        self.periodico()
+
+    def periodico(self):
+        """Grava o bloco pendente se estiver cheio ou velho; barato para chamar a cada frame"""
+        if self.pendentes and (len(self.pendentes) >= self.bloco or time.monotonic() - self.ultima_gravacao >= self.intervalo):
+            self.descarregar()
+
+    def descarregar(self):
+        """Grava já as amostras pendentes; retorna quantas foram gravadas"""
+        self.ultima_gravacao = time.monotonic()
+        if not self.pendentes: return 0
+        pendentes, self.pendentes = self.pendentes, []
+        try:
+            (self._gravar_binario if self.binario else self._gravar_csv)(pendentes)
+        except Exception:
+            self.pendentes = pendentes + self.pendentes  # tenta de novo no próximo bloco
+            raise
+        self.blocos_gravados += 1
+        return len(pendentes)
+
+    def fechar(self): return self.descarregar()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *erro): self.fechar()
+
+    @property
+    def total(self):
+        """Amostras confirmadas no disco + pendentes"""
+        return self.indice['amostras'] + len(self.pendentes)
+
+    def classes(self):
+        """Contagem por classe confirmada no disco"""
+        return {classe: quantidade for classe, quantidade in self.indice['classes'].items() if quantidade}
+
+
+# ==================== BENCHMARK ====================
+def _medir_carga(modo, caminho):
+    """Roda num processo novo: (segundos, pico de memória em MB) para carregar como o treinador carregaria"""
+    inicio = time.perf_counter()
+    if modo == 'csv':
+        df = next(ler_csv(caminho))
+        features, labels = df.iloc[:, 1:].values, df.iloc[:, 0].values
+    else:
+        dataset = DatasetLIBRAS(caminho)
+        features, labels = dataset.features(), dataset.codigos()
+        if modo == 'binario':  # matriz na memória (float32), não só mapeada
+            features, labels = np.array(features), dataset.labels()
+        else: float(features[:1024].sum())  # só o mapa: lê um lote, o resto fica no disco/cache
+    segundos = time.perf_counter() - inicio
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    except ImportError: pico = None
+    return segundos, pico, features.shape
+
+
+def benchmark(amostras, pasta=None, classes=28):
+    """Gera `amostras` sintéticas em CSV e .tlds e compara tamanho, tempo de carga e pico de memória"""
+    pasta = pasta or tempfile.mkdtemp(prefix='dataset_libras_')
+    arquivo_csv = os.path.join(pasta, 'gestos_libras.csv')
+    arquivo_dataset = os.path.join(pasta, 'gestos_libras' + EXTENSAO_DATASET)
+    rng = np.random.default_rng(0)
+    nomes = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ") + [" ", "."], dtype=object)[:classes]
+
+    print(f"🧪 Gerando {amostras} amostras em {pasta}...")
+    import pandas as pd
+    for inicio in range(0, amostras, 200_000):
+        n = min(200_000, amostras - inicio)
+        features = rng.normal(0, 0.2, (n, NUM_FEATURES)).astype(np.float32)
+        labels = nomes[rng.integers(0, classes, n)]
+        df = pd.DataFrame(features, columns=COLUNAS_CSV[1:])
+        df.insert(0, COLUNAS_CSV[0], labels)
+        df.to_csv(arquivo_csv, mode='a', index=False, header=inicio == 0)
+    inicio = time.perf_counter()
+    csv_para_dataset(arquivo_csv, arquivo_dataset)
+    print(f"   Conversão CSV → {EXTENSAO_DATASET}: {time.perf_counter() - inicio:.1f}s")
+
+    print(f"\n{'formato':<16} | {'arquivo MB':>10} | {'carga s':>8} | {'pico RAM MB':>11}")
+    print("-" * 56)
+    for modo, caminho in (('csv', arquivo_csv), ('binario', arquivo_dataset), ('binario_mmap', arquivo_dataset)):
+        saida = subprocess.run([sys.executable, os.path.abspath(__file__), '--medir', modo, caminho],
+                               capture_output=True, text=True, check=True).stdout
+        segundos, pico = json.loads(saida.strip().splitlines()[-1])
+        pico_texto = f"{pico:>11.0f}" if pico is not None else f"{'-':>11}"
+        print(f"{modo:<16} | {os.path.getsize(caminho) / 2**20:>10.1f} | {segundos:>8.3f} | {pico_texto}")
+    return pasta
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dataset binário do TraduLibras')
+    parser.add_argument('--converter', nargs=2, metavar=('ORIGEM', 'DESTINO'), help='CSV → .tlds ou .tlds → CSV (pela extensão)')
+    parser.add_argument('--info', metavar='ARQUIVO', help='mostra versão, amostras e classes de um .tlds')
+    parser.add_argument('--benchmark', type=int, metavar='AMOSTRAS', help='compara carga e memória com o CSV')
+    parser.add_argument('--medir', nargs=2, help=argparse.SUPPRESS)  # usado pelo benchmark num processo novo
+    args = parser.parse_args()
+
+    if args.medir:
+        segundos, pico, _ = _medir_carga(*args.medir)
+        print(json.dumps([segundos, pico]))
+    elif args.converter:
+        origem, destino = args.converter
+        inicio = time.perf_counter()
+        total = dataset_para_csv(origem, destino) if origem.endswith(EXTENSAO_DATASET) else csv_para_dataset(origem, destino)
+        print(f"✅ {total} amostras: {origem} → {destino} ({time.perf_counter() - inicio:.1f}s)")
+    elif args.info:
+        with DatasetLIBRAS(args.info) as dataset:
+            print(f"📦 {args.info}: versão {dataset.info['versao']}, {len(dataset)} amostras, {NUM_FEATURES} features")
+            print(f"   Atualizado em: {dataset.info['atualizado_em']} | Metadados: {dataset.metadados}")
+            for classe, quantidade in dataset.contagem_por_classe().items(): print(f"   - {classe!r}: {quantidade} amostras")
+    elif args.benchmark:
+        benchmark(args.benchmark)
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Canal de eventos (Server-Sent Events) do TraduLibras
+Empurra para o navegador a letra/texto reconhecidos e o status serial só quando mudam
+"""
+
+import json
+import threading
+
+
+class CanalEventos:
+    """Último estado de cada tipo de evento + notificação dos assinantes"""
+
+    def __init__(self, intervalo_keepalive=15):
+        self.intervalo_keepalive = intervalo_keepalive
+        self.condicao = threading.Condition()
+        self.dados = {}    # evento -> últimos dados publicados
+        self.versoes = {}  # evento -> contador de mudanças
+        self.conexoes = 0
+
+    def publicar(self, evento, dados):
+        """Publica se os dados mudaram; retorna True quando houve mudança"""
+        with self.condicao:
+            if self.dados.get(evento) == dados: return False
+            self.dados[evento] = dados
+            self.versoes[evento] = self.versoes.get(evento, 0) + 1
+            self.condicao.notify_all()
+            return True
+
+    def _pendentes(self, vistos):
+        return [evento for evento, versao in self.versoes.items() if vistos.get(evento) != versao]
+
+    def transmitir(self):
+        """Gerador SSE: envia o estado atual ao conectar e depois cada mudança
+
+        Mudanças rápidas do mesmo evento são agrupadas no estado mais recente.
+        """
+        vistos = {}
+        with self.condicao: self.conexoes += 1
+        try:
+            yield 'retry: 2000\n\n'
+            while True:
+                with self.condicao:
+                    self.condicao.wait_for(lambda: self._pendentes(vistos), self.intervalo_keepalive)
+                    pendentes = [(evento, self.dados[evento]) for evento in self._pendentes(vistos)]
+                    vistos.update(self.versoes)
+
+                if not pendentes:
+                    yield ': keepalive\n\n'
+                    continue
+                for evento, dados in pendentes:
+                    yield f'event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n'
+        finally:
+            with self.condicao: self.conexoes -= 1
@@ -0,0 +1,56 @@
+"""
+Extração de features LIBRAS
+Única implementação das 51 features usada pelo app, pelo coletor e pelo treinador,
+para que coleta e inferência produzam exatamente os mesmos valores
+"""
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = 51  # 42 coordenadas relativas ao punho + 5 distâncias ao punho + 4 entre pontas
+PONTAS_DEDOS = np.array([4, 8, 12, 16, 20])  # polegar, indicador, médio, anelar, mínimo
+COLUNAS_CSV = ['gesture_type'] + [f'feature_{i+1}' for i in range(NUM_FEATURES)]
+
+
+def landmarks_para_array(hand_landmarks, saida=None):
+    """Converte os 21 landmarks do MediaPipe num array (21, 2) float32 de (x, y)"""
+    if saida is None: saida = np.empty((NUM_LANDMARKS, 2), dtype=np.float32)
+    for i, lm in enumerate(hand_landmarks.landmark):
+        saida[i, 0] = lm.x
+        saida[i, 1] = lm.y
+    return saida
+
+
+def extrair_features(pontos, saida=None):
+    """Calcula as 51 features de um array (21, 2) ou de um lote (N, 21, 2)
+
+    Ordem das features (a mesma do CSV de treino):
+      - x0, y0, x1, y1, ... x20, y20 relativos ao punho (landmark 0)
+      - distância L1 de cada ponta de dedo ao punho
+      - distância L1 entre pontas de dedos vizinhas
+    Retorna float32 com forma (51,) ou (N, 51); `saida` permite reaproveitar um vetor pré-alocado.
+    """
+    pontos = np.asarray(pontos, dtype=np.float32)
+    lote = pontos.ndim == 3
+    if not lote: pontos = pontos[np.newaxis]
+    if pontos.shape[1:] != (NUM_LANDMARKS, 2):
+        raise ValueError(f"Esperado (21, 2) ou (N, 21, 2), recebido {pontos.shape}")
+
+    n = pontos.shape[0]
+    if saida is None: saida = np.empty((n, NUM_FEATURES), dtype=np.float32)
+    vetor = saida.reshape(n, NUM_FEATURES)
+
+    relativos = pontos - pontos[:, :1]
+    vetor[:, :42] = relativos.reshape(n, 2 * NUM_LANDMARKS)
+
+    pontas = pontos[:, PONTAS_DEDOS]
+    np.abs(relativos[:, PONTAS_DEDOS]).sum(axis=2, out=vetor[:, 42:47])
+    np.abs(pontas[:, :-1] - pontas[:, 1:]).sum(axis=2, out=vetor[:, 47:51])
+
+    return saida if lote else saida.reshape(NUM_FEATURES)
+
+
+def features_de_landmarks(hand_landmarks):
+    """Atalho: landmarks do MediaPipe -> vetor (51,) float32"""
+    if not hand_landmarks: return None
+    return extrair_features(landmarks_para_array(hand_landmarks))
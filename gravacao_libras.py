@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Gravação e reprodução do TraduLibras
+Grava o vídeo cru ou só os landmarks por frame (log binário compacto) e os
+reproduz pelo mesmo loop de reconhecimento, em tempo real ou na velocidade
+máxima, para comparar ajustes sobre exatamente a mesma entrada
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+# Log de landmarks: cabeçalho + registros de tamanho fixo (177 bytes)
+MAGICO_LANDMARKS = b'TLIBLM01'
+FORMATO_LANDMARKS = np.dtype([('t', '<f8'), ('presente', 'u1'), ('pontos', '<f4', (21, 2))])
+EXTENSAO_LANDMARKS = '.tlm'
+# Tempos reais dos frames de um vídeo gravado: cabeçalho + um float64 (segundos desde o 1º frame) por frame
+MAGICO_TEMPOS = b'TLIBTS01'
+FORMATO_TEMPOS = np.dtype('<f8')
+EXTENSAO_TEMPOS = '.tempos'
+
+
+def caminho_tempos(caminho_video):
+    """Arquivo de tempos ao lado do vídeo (gravacao_x.avi -> gravacao_x.tempos)"""
+    return os.path.splitext(caminho_video)[0] + EXTENSAO_TEMPOS
+
+
+class Gravador:
+    """Base: cada gravador implementa só o gancho que lhe interessa"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.lock = threading.Lock()
+        self.t0 = None
+        self.registros = 0
+        self.fechado = False
+
+    def _relativo(self, t):
+        if self.t0 is None: self.t0 = t
+        return t - self.t0
+
+    def registrar_frame(self, t, frame): pass
+
+    def registrar_landmarks(self, t, hand_landmarks): pass
+
+    def fechar(self): self.fechado = True
+
+    def status(self):
+        return {'arquivo': self.caminho, 'tipo': self.tipo, 'registros': self.registros}
+
+
+class GravadorLandmarks(Gravador):
+    """Grava (timestamp, mão presente, 21 x (x, y)) por frame"""
+
+    tipo = 'landmarks'
+
+    def __init__(self, caminho):
+        super().__init__(caminho)
+        self.arquivo = open(caminho, 'wb')
+        self.arquivo.write(MAGICO_LANDMARKS)
+        self.registro = np.zeros(1, dtype=FORMATO_LANDMARKS)
+
+    def registrar_landmarks(self, t, hand_landmarks):
+        with self.lock:
+            if self.fechado: return
+            self.registro['t'] = self._relativo(t)
+            self.registro['presente'] = hand_landmarks is not None
+            if hand_landmarks is not None:
+                self.registro['pontos'][0] = [(lm.x, lm.y) for lm in hand_landmarks.landmark]
+            else:
+                self.registro['pontos'] = 0
+            self.arquivo.write(self.registro.tobytes())
+            self.registros += 1
+
+    def fechar(self):
+        with self.lock:
+            if not self.fechado: self.arquivo.close()
+            self.fechado = True
+
+
+class GravadorVideo(Gravador):
+    """Grava os frames crus da câmera (MJPG) e o instante real de cada um
+
+    O container só guarda um FPS nominal fixo; o instante de captura de cada
+    frame vai para o arquivo de tempos ao lado (caminho_tempos), que o replay usa
+    para o ritmo e para os temporizadores.
+    """
+
+    tipo = 'video'
+
+    def __init__(self, caminho, fps=30.0):
+        super().__init__(caminho)
+        self.fps = fps
+        self.writer = None
+        self.tempos = open(caminho_tempos(caminho), 'wb')
+        self.tempos.write(MAGICO_TEMPOS)
+
+    def registrar_frame(self, t, frame):
+        with self.lock:
+            if self.fechado: return
+            if self.writer is None:
+                import cv2  # OpenCV só quando a gravação de vídeo começa, não no import do app
+                altura, largura = frame.shape[:2]
+                self.writer = cv2.VideoWriter(self.caminho, cv2.VideoWriter_fourcc(*'MJPG'), self.fps, (largura, altura))
+            self.writer.write(frame)
+            self.tempos.write(np.array(self._relativo(t), dtype=FORMATO_TEMPOS).tobytes())
+            self.registros += 1
+
+    def fechar(self):
+        with self.lock:
+            if self.writer is not None: self.writer.release()
+            if not self.tempos.closed: self.tempos.close()
+            self.fechado = True
+
+
+def criar_gravador(tipo, pasta='gravacoes'):
+    """Cria um gravador 'video' ou 'landmarks' com nome por timestamp em `pasta`"""
+    os.makedirs(pasta, exist_ok=True)
+    nome = f"gravacao_{time.strftime('%Y%m%d_%H%M%S')}"
+    if tipo == 'video': return GravadorVideo(os.path.join(pasta, nome + '.avi'))
+    if tipo == 'landmarks': return GravadorLandmarks(os.path.join(pasta, nome + EXTENSAO_LANDMARKS))
+    raise ValueError(f"Tipo de gravação inválido: {tipo}")
+
+
+def ler_landmarks(caminho):
+    """Lê um log de landmarks inteiro como array estruturado (t, presente, pontos)"""
+    with open(caminho, 'rb') as f:
+        if f.read(len(MAGICO_LANDMARKS)) != MAGICO_LANDMARKS:
+            raise ValueError(f"{caminho} não é um log de landmarks do TraduLibras")
+        return np.fromfile(f, dtype=FORMATO_LANDMARKS)
+
+
+def ler_tempos(caminho_video):
+    """Instantes reais (s) dos frames de um vídeo gravado, ou None sem arquivo de tempos"""
+    caminho = caminho_tempos(caminho_video)
+    if not os.path.exists(caminho): return None
+    with open(caminho, 'rb') as f:
+        if f.read(len(MAGICO_TEMPOS)) != MAGICO_TEMPOS:
+            raise ValueError(f"{caminho} não é um arquivo de tempos do TraduLibras")
+        return np.fromfile(f, dtype=FORMATO_TEMPOS)
+
+
+class FonteReplay:
+    """Substitui cv2.VideoCapture reproduzindo um vídeo gravado
+
+    `instante` é o tempo real de captura do último frame lido, pelo arquivo de
+    tempos gravado junto (vídeos sem ele, ou frames além dele, usam a posição do
+    container). Em tempo real cada frame é entregue nesse instante; caso
+    contrário, na velocidade máxima.
+    """
+
+    def __init__(self, caminho, tempo_real=True):
+        import cv2
+        self.captura = cv2.VideoCapture(caminho)
+        self.tempo_real = tempo_real
+        self.tempos = ler_tempos(caminho)
+        self.frames_lidos = 0
+        self.instante = 0.0
+        self.inicio = None
+
+    def isOpened(self): return self.captura.isOpened()
+
+    def set(self, propriedade, valor): return False  # resolução fixa da gravação
+
+    def get(self, propriedade): return self.captura.get(propriedade)
+
+    def read(self):
+        ret, frame = self.captura.read()
+        if not ret: return ret, frame
+        if self.tempos is not None and self.frames_lidos < len(self.tempos):
+            self.instante = float(self.tempos[self.frames_lidos])
+        else:
+            import cv2
+            self.instante = self.captura.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        self.frames_lidos += 1
+        if self.tempo_real:
+            if self.inicio is None: self.inicio = time.monotonic() - self.instante
+            espera = self.inicio + self.instante - time.monotonic()
+            if espera > 0: time.sleep(espera)
+        return ret, frame
+
+    def release(self): self.captura.release()
+
+
+def abrir_fonte(origem, tempo_real=True):
+    """cv2.VideoCapture para índices de câmera; FonteReplay para arquivos gravados"""
+    if isinstance(origem, str) and os.path.isfile(origem): return FonteReplay(origem, tempo_real)
+    import cv2
+    return cv2.VideoCapture(origem)
+
+
+def reproduzir(caminho, tempo_real=False, modo=None):
+    """Passa uma gravação pelo loop de reconhecimento do app e mede o resultado"""
+    import collections
+    import app_funcional as app
+    from datetime import datetime, timedelta
+    from features_libras import extrair_features
+
+    app.modelo_inicial.obter()
+    app.auto_speak_enabled = False
+    if modo: app.recognition_mode = modo
+    sessao = app.sessao_camera
+    base = datetime.now()
+    # Estado limpo: a primeira letra não espera o cooldown do início do app
+    sessao.reiniciar(ultima_predicao=base - timedelta(seconds=app.prediction_cooldown))
+    sessao.historico = collections.deque()  # sem limite durante o replay
+    frames = 0
+    inicio = time.perf_counter()
+
+    if caminho.endswith(EXTENSAO_LANDMARKS):
+        registros = ler_landmarks(caminho)
+        for registro in registros:
+            if tempo_real:
+                espera = inicio + registro['t'] - time.perf_counter()
+                if espera > 0: time.sleep(espera)
+            presente = bool(registro['presente'])
+            app.classificar({
+                'points': extrair_features(registro['pontos']) if presente else None,
+                'mao_detectada': presente,
+                'instante': base + timedelta(seconds=float(registro['t'])),
+            })
+            frames += 1
+    else:
+        fonte = FonteReplay(caminho, tempo_real)
+        while True:
+            ret, frame = fonte.read()
+            if not ret: break
+            app.processar_frame(frame, instante=base + timedelta(seconds=fonte.instante))
+            frames += 1
+        fonte.release()
+
+    segundos = time.perf_counter() - inicio
+    letras = [letra for _, letra in sessao.historico]
+    return {
+        'arquivo': caminho,
+        'frames': frames,
+        'segundos': round(segundos, 3),
+        'fps': round(frames / segundos, 1) if segundos else None,
+        'letras': letras,
+        'texto': ''.join(' ' if letra == 'ESPACO' else letra for letra in letras),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reproduz uma gravação pelo reconhecimento do TraduLibras')
+    parser.add_argument('arquivo', help=f'vídeo gravado (.avi) ou log de landmarks ({EXTENSAO_LANDMARKS})')
+    parser.add_argument('--tempo-real', action='store_true', help='respeita os timestamps originais')
+    parser.add_argument('--modo', choices=['temporizador', 'votacao'], help='modo de reconhecimento')
+    args = parser.parse_args()
+
+    resultado = reproduzir(args.arquivo, tempo_real=args.tempo_real, modo=args.modo)
+    print("=" * 50)
+    print(f"🎬 Replay: {resultado['arquivo']}")
+    print(f"   - Frames: {resultado['frames']} em {resultado['segundos']}s ({resultado['fps']} fps)")
+    print(f"   - Letras: {' '.join(resultado['letras']) or '-'}")
+    print(f"   - Texto: {resultado['texto']!r}")
+    print("=" * 50)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Agendador de inferência em lote do TraduLibras
+Junta os vetores de features de todas as sessões ativas durante alguns
+milissegundos, faz uma única chamada em lote ao preditor (scaler + modelo) e
+devolve a cada sessão o seu resultado
+"""
+
+import argparse
+import collections
+import glob
+import os
+import pickle
+import sys
+import threading
+import time
+import numpy as np
+
+
+class _Pedido:
+    __slots__ = ('features', 'pronto', 'proba', 'classes', 'erro', 't_pedido')
+
+    def __init__(self, features):
+        self.features = features
+        self.pronto = threading.Event()
+        self.proba = self.classes = self.erro = None
+        self.t_pedido = time.perf_counter()
+
+
+class AgendadorInferencia:
+    """Micro-lotes dinâmicos sobre um preditor compartilhado
+
+    Ao chegar o primeiro pedido, espera até `espera_maxima` segundos ou até
+    juntar `max_lote` pedidos e avalia todos de uma vez. Se `clientes()`
+    informa quantas sessões estão ativas, a espera termina assim que todas
+    tiverem pedido: uma única câmera não ganha atraso nenhum. Com
+    espera_maxima=0 o lote é só o que já estiver na fila. `obter_preditor` é
+    chamado a cada lote, então trocar o modelo global vale no lote seguinte.
+    """
+
+    def __init__(self, obter_preditor, max_lote=32, espera_maxima=0.002, clientes=None):
+        self.obter_preditor = obter_preditor
+        self.max_lote = max_lote
+        self.espera_maxima = espera_maxima
+        self.clientes = clientes
+        self.condicao = threading.Condition()
+        self.fila = collections.deque()
+        self.thread = None
+        self.lotes = self.amostras = self.maior_lote = 0
+        self.espera_media_ms = 0.0
+
+    def configurar(self, max_lote=None, espera_maxima=None):
+        with self.condicao:
+            if max_lote is not None: self.max_lote = max(1, int(max_lote))
+            if espera_maxima is not None: self.espera_maxima = max(0.0, float(espera_maxima))
+
+    def _enfileirar(self, pedidos):
+        with self.condicao:
+            self.fila.extend(pedidos)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._executar, name='inferencia-lotes', daemon=True)
+                self.thread.start()
+            self.condicao.notify()
+        for pedido in pedidos:
+            pedido.pronto.wait()
+            if pedido.erro is not None: raise pedido.erro
+        return [(pedido.proba, pedido.classes) for pedido in pedidos]
+
+    def prever_proba(self, features):
+        """Bloqueia até o lote do pedido ser avaliado; retorna (probabilidades, classes)"""
+        return self._enfileirar([_Pedido(np.asarray(features, dtype=np.float64).ravel())])[0]
+
+    def prever_proba_lote(self, matriz):
+        """Vários frames de uma sessão de uma vez; entram nos lotes junto com as demais sessões"""
+        return self._enfileirar([_Pedido(np.asarray(linha, dtype=np.float64)) for linha in matriz])
+
+    def prever(self, features):
+        """Classe mais provável (mesma decisão do predict de uma floresta)"""
+        proba, classes = self.prever_proba(features)
+        return classes[np.argmax(proba)]
+
+    def _proximo_lote(self):
+        with self.condicao:
+            self.condicao.wait_for(lambda: self.fila)
+            if self.espera_maxima > 0:
+                alvo = min(self.max_lote, max(1, self.clientes())) if self.clientes else self.max_lote
+                self.condicao.wait_for(lambda: len(self.fila) >= alvo, self.espera_maxima)
+            return [self.fila.popleft() for _ in range(min(self.max_lote, len(self.fila)))]
+
+    def _executar(self):
+        while True:
+            lote = self._proximo_lote()
+            inicio = time.perf_counter()
+            try:
+                preditor = self.obter_preditor()
+                if preditor is None: raise RuntimeError("Nenhum modelo carregado")
+                probas = preditor.predict_proba(np.stack([pedido.features for pedido in lote]))
+                for pedido, proba in zip(lote, probas): pedido.proba, pedido.classes = proba, preditor.classes_
+            except Exception as e:
+                for pedido in lote: pedido.erro = e
+            for pedido in lote: pedido.pronto.set()
+
+            espera_ms = (inicio - min(pedido.t_pedido for pedido in lote)) * 1000
+            with self.condicao:
+                self.lotes += 1
+                self.amostras += len(lote)
+                self.maior_lote = max(self.maior_lote, len(lote))
+                self.espera_media_ms += 0.1 * (espera_ms - self.espera_media_ms)
+
+    def status(self):
+        with self.condicao:
+            return {
+                'max_lote': self.max_lote,
+                'espera_maxima_ms': round(self.espera_maxima * 1000, 3),
+                'lotes': self.lotes,
+                'amostras': self.amostras,
+                'lote_medio': round(self.amostras / self.lotes, 2) if self.lotes else 0,
+                'maior_lote': self.maior_lote,
+                'espera_media_ms': round(self.espera_media_ms, 3),
+                'fila': len(self.fila),
+            }
+
+
+def simular(prever, amostras, sessoes, duracao=2.0, fps=None):
+    """Roda `sessoes` threads chamando `prever(features)` por `duracao` segundos
+
+    Sem `fps`, cada sessão pede a próxima predição assim que recebe a anterior
+    (mede a vazão máxima); com `fps`, cada sessão imita uma câmera nesse ritmo.
+    """
+    latencias = [[] for _ in range(sessoes)]
+    inicio_geral = time.perf_counter()
+    fim = inicio_geral + duracao
+
+    def sessao(indice):
+        intervalo = 1.0 / fps if fps else 0.0
+        proximo = time.perf_counter()
+        i = indice
+        while True:
+            if intervalo:
+                espera = proximo - time.perf_counter()
+                if espera > 0: time.sleep(espera)
+                proximo += intervalo
+            inicio = time.perf_counter()
+            if inicio >= fim: break
+            prever(amostras[i % len(amostras)])
+            latencias[indice].append(time.perf_counter() - inicio)
+            i += sessoes
+
+    threads = [threading.Thread(target=sessao, args=(i,), daemon=True) for i in range(sessoes)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    total = time.perf_counter() - inicio_geral
+
+    todas = np.concatenate([np.asarray(l) for l in latencias]) * 1000 if any(latencias) else np.zeros(1)
+    return {
+        'sessoes': sessoes,
+        'predicoes': int(sum(len(l) for l in latencias)),
+        'predicoes_por_segundo': round(sum(len(l) for l in latencias) / total, 1),
+        'latencia_p50_ms': round(float(np.percentile(todas, 50)), 3),
+        'latencia_p95_ms': round(float(np.percentile(todas, 95)), 3),
+        'latencia_max_ms': round(float(todas.max()), 3),
+    }
+
+
+def main():
+    """Vazão e latência com 1-50 sessões simuladas: predição direta x agendador em lote"""
+    from preditor_compilado import compilar_preditor, PreditorPadrao
+
+    parser = argparse.ArgumentParser(description='Simulação de sessões simultâneas no TraduLibras')
+    parser.add_argument('--sessoes', default='1,2,5,10,20,50', help='quantidades de sessões separadas por vírgula')
+    parser.add_argument('--duracao', type=float, default=2.0, help='segundos por cenário')
+    parser.add_argument('--fps', type=float, help='ritmo de cada sessão (padrão: o mais rápido possível)')
+    parser.add_argument('--max-lote', type=int, default=32)
+    parser.add_argument('--espera-ms', type=float, default=2.0)
+    parser.add_argument('--sklearn', action='store_true', help='usa scaler.transform + model.predict_proba do scikit-learn')
+    parser.add_argument('--csv', default=os.path.join('dados_coletados', 'gestos_libras.csv'))
+    args = parser.parse_args()
+
+    modelos = sorted(glob.glob(os.path.join('modelos', 'modelo_libras_*.pkl')), key=os.path.getmtime)
+    scalers = sorted(glob.glob(os.path.join('modelos', 'scaler_libras_*.pkl')), key=os.path.getmtime)
+    if not modelos or not scalers:
+        print("❌ ERRO: Nenhum modelo em modelos/")
+        return 1
+    with open(modelos[-1], 'rb') as f: model = pickle.load(f)
+    with open(scalers[-1], 'rb') as f: scaler = pickle.load(f)
+    preditor = PreditorPadrao(model, scaler) if args.sklearn else compilar_preditor(model, scaler)
+
+    if os.path.exists(args.csv):
+        import pandas as pd
+        amostras = pd.read_csv(args.csv).iloc[:, 1:].values[:500].astype(np.float64)
+    else:
+        amostras = np.random.default_rng(0).normal(0.5, 0.2, (500, model.n_features_in_))
+
+    print(f"🧪 Modelo: {modelos[-1]} ({type(preditor).__name__}) | lote máx. {args.max_lote} | espera {args.espera_ms} ms"
+          f" | {'%g fps por sessão' % args.fps if args.fps else 'vazão máxima'}")
+    print(f"{'sessões':>8} | {'modo':<8} | {'pred/s':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'lote médio':>10}")
+    print("-" * 66)
+    for sessoes in [int(s) for s in args.sessoes.split(',')]:
+        direto = simular(lambda x: preditor.predict(x), amostras, sessoes, args.duracao, args.fps)
+        agendador = AgendadorInferencia(lambda: preditor, args.max_lote, args.espera_ms / 1000, clientes=lambda: sessoes)
+        em_lote = simular(agendador.prever, amostras, sessoes, args.duracao, args.fps)
+        for modo, r, lote in (('direto', direto, '-'), ('lote', em_lote, agendador.status()['lote_medio'])):
+            print(f"{sessoes:>8} | {modo:<8} | {r['predicoes_por_segundo']:>9} | {r['latencia_p50_ms']:>8} | "
+                  f"{r['latencia_p95_ms']:>8} | {lote:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Ingestão de landmarks do TraduLibras
+Decodifica frames enviados por clientes que rodam o rastreamento da mão no
+próprio dispositivo: 21 pontos (x, y) ou as 51 features já calculadas, um
+frame ou um lote, em JSON ou binário
+"""
+
+import numpy as np
+from features_libras import NUM_LANDMARKS, NUM_FEATURES, extrair_features
+from gravacao_libras import MAGICO_LANDMARKS, FORMATO_LANDMARKS
+
+# Binário de features: cabeçalho + registros de tamanho fixo (213 bytes)
+MAGICO_FEATURES = b'TLIBFT01'
+FORMATO_FEATURES = np.dtype([('t', '<f8'), ('presente', 'u1'), ('features', '<f4', (NUM_FEATURES,))])
+TIPO_BINARIO = 'application/octet-stream'
+MAX_FRAMES = 1000
+
+
+class Frames:
+    """Lote decodificado: features (N, 51), mão presente (N,) e instantes do cliente (N,) ou None"""
+
+    def __init__(self, features, presentes, instantes=None):
+        self.features = features
+        self.presentes = presentes
+        self.instantes = instantes
+
+    def __len__(self): return len(self.presentes)
+
+
+def _validar(frames):
+    if len(frames) == 0: raise ValueError("Nenhum frame enviado")
+    if len(frames) > MAX_FRAMES: raise ValueError(f"Máximo de {MAX_FRAMES} frames por requisição")
+    if not np.all(np.isfinite(frames.features[frames.presentes])): raise ValueError("Valores não finitos nos frames")
+    return frames
+
+
+def ler_json(dados):
+    """{"landmarks": [[x, y] x 21] | [[[x, y] x 21], ...]} ou {"features": [51] | [[51], ...]}
+
+    Num lote, `null` marca um frame sem mão. "t" (segundos, relógio do cliente)
+    é opcional: um número por frame.
+    """
+    if not isinstance(dados, dict): raise ValueError("JSON deve ser um objeto")
+    if ('landmarks' in dados) == ('features' in dados): raise ValueError("Envie 'landmarks' ou 'features'")
+    chave = 'landmarks' if 'landmarks' in dados else 'features'
+    forma_frame = (NUM_LANDMARKS, 2) if chave == 'landmarks' else (NUM_FEATURES,)
+
+    valores = dados[chave]
+    if not isinstance(valores, list): raise ValueError(f"'{chave}' deve ser uma lista")
+    # Frame único: números (features) ou pares de números (landmarks) direto na lista
+    primeiro = valores[0] if valores else None
+    if chave == 'landmarks' and isinstance(primeiro, list): primeiro = primeiro[0] if primeiro else None
+    lista = [valores] if isinstance(primeiro, (int, float)) else valores
+
+    presentes = np.array([frame is not None for frame in lista], dtype=bool)
+    brutos = np.zeros((len(lista),) + forma_frame, dtype=np.float32)
+    for i, frame in enumerate(lista):
+        if frame is None: continue
+        try: brutos[i] = np.asarray(frame, dtype=np.float32).reshape(forma_frame)
+        except (TypeError, ValueError): raise ValueError(f"Frame {i}: esperado {forma_frame}")
+
+    instantes = dados.get('t')
+    if instantes is not None:
+        instantes = np.atleast_1d(np.asarray(instantes, dtype=np.float64))
+        if instantes.shape != (len(lista),): raise ValueError("'t' deve ter um valor por frame")
+
+    features = extrair_features(brutos) if chave == 'landmarks' else brutos
+    return _validar(Frames(features, presentes, instantes))
+
+
+def ler_binario(corpo):
+    """Registros (t, presente, 21 x (x, y)) como o log .tlm, ou (t, presente, 51 features)
+
+    O cabeçalho de 8 bytes escolhe o formato: MAGICO_LANDMARKS ou MAGICO_FEATURES.
+    """
+    magico, registros = corpo[:8], corpo[8:]
+    formato = {MAGICO_LANDMARKS: FORMATO_LANDMARKS, MAGICO_FEATURES: FORMATO_FEATURES}.get(magico)
+    if formato is None: raise ValueError("Cabeçalho binário desconhecido")
+    if len(registros) % formato.itemsize: raise ValueError(f"Tamanho inválido: registros de {formato.itemsize} bytes")
+
+    frames = np.frombuffer(registros, dtype=formato)
+    presentes = frames['presente'].astype(bool)
+    features = extrair_features(frames['pontos']) if formato is FORMATO_LANDMARKS else frames['features']
+    return _validar(Frames(features, presentes, frames['t'].astype(np.float64)))
+
+
+def codificar_binario(features=None, landmarks=None, instantes=None):
+    """Monta o corpo binário a partir de arrays (N, 51) ou (N, 21, 2); NaN marca frame sem mão"""
+    if (features is None) == (landmarks is None): raise ValueError("Informe features ou landmarks")
+    valores = np.asarray(landmarks if landmarks is not None else features, dtype=np.float32)
+    formato, magico, campo = (FORMATO_LANDMARKS, MAGICO_LANDMARKS, 'pontos') if landmarks is not None else \
+        (FORMATO_FEATURES, MAGICO_FEATURES, 'features')
+    registros = np.zeros(len(valores), dtype=formato)
+    presentes = ~np.isnan(valores.reshape(len(valores), -1)).any(axis=1)
+    registros['presente'] = presentes
+    registros[campo][presentes] = valores[presentes]
+    registros['t'] = instantes if instantes is not None else 0.0
+    return magico + registros.tobytes()
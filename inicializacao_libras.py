@@ -0,0 +1,152 @@
+"""
+Inicialização do TraduLibras
+Subsistemas pesados (modelo, MediaPipe, câmera) criados sob demanda ou
+aquecidos em segundo plano, descoberta da webcam em paralelo com cache em
+disco e medição dos tempos de inicialização
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+# Importado primeiro pelo app: marca o início para os tempos de inicialização
+INICIO = time.perf_counter()
+
+
+class TemposInicializacao:
+    """Marcos da inicialização: quando terminou (desde o início) e quanto durou"""
+
+    def __init__(self, inicio=INICIO):
+        self.inicio = inicio
+        self.lock = threading.Lock()
+        self.marcos = {}
+
+    def registrar(self, nome, duracao=None):
+        em = time.perf_counter() - self.inicio
+        with self.lock:
+            self.marcos[nome] = {'em_s': round(em, 3), 'duracao_s': None if duracao is None else round(duracao, 3)}
+
+    def relatorio(self):
+        with self.lock: return dict(sorted(self.marcos.items(), key=lambda item: item[1]['em_s']))
+
+    def imprimir(self):
+        print("⏱️  TEMPOS DE INICIALIZAÇÃO")
+        for nome, marco in self.relatorio().items():
+            duracao = f" (levou {marco['duracao_s']:.3f}s)" if marco['duracao_s'] is not None else ""
+            print(f"   - {nome:<24} pronto em {marco['em_s']:.3f}s{duracao}")
+
+
+class Preguicoso:
+    """Valor criado uma única vez: pelo primeiro que precisar dele ou pelo aquecimento
+
+    Se a criação falhar, a próxima chamada de obter() tenta de novo.
+    """
+
+    def __init__(self, nome, fabrica, tempos=None):
+        self.nome = nome
+        self.fabrica = fabrica
+        self.tempos = tempos
+        self.lock = threading.Lock()
+        self.valor = None
+        self.criado = False
+
+    def obter(self):
+        if self.criado: return self.valor
+        with self.lock:
+            if not self.criado:
+                inicio = time.perf_counter()
+                self.valor = self.fabrica()
+                self.criado = True
+                if self.tempos: self.tempos.registrar(self.nome, time.perf_counter() - inicio)
+        return self.valor
+
+    def recriar(self):
+        """Cria um valor novo (ex.: parâmetros mudaram) e troca pelo atual; quem já o obteve segue com o antigo"""
+        inicio = time.perf_counter()
+        valor = self.fabrica()
+        with self.lock: self.valor, self.criado = valor, True
+        if self.tempos: self.tempos.registrar(self.nome, time.perf_counter() - inicio)
+        return valor
+
+    def pronto(self): return self.criado
+
+
+def aquecer_em_segundo_plano(preguicosos):
+    """Cria cada subsistema na sua própria thread (em paralelo); retorna as threads"""
+    def aquecer(preguicoso):
+        try: preguicoso.obter()
+        except Exception as e: print(f"❌ Erro ao aquecer {preguicoso.nome}: {e}")
+
+    threads = [threading.Thread(target=aquecer, args=(p,), name=f'aquecer-{p.nome}', daemon=True) for p in preguicosos]
+    for thread in threads: thread.start()
+    return threads
+
+
+def _ler_cache(arquivo_cache, validade):
+    try:
+        with open(arquivo_cache, 'r', encoding='utf-8') as f: cache = json.load(f)
+        indice = int(cache['indice'])
+        if time.time() - cache['gravado_em'] > validade: return None
+    except (OSError, ValueError, KeyError, TypeError): return None
+    # No Linux dá para conferir sem abrir a câmera se o dispositivo ainda existe
+    if sys.platform.startswith('linux') and not os.path.exists(f'/dev/video{indice}'): return None
+    return indice
+
+
+def _gravar_cache(arquivo_cache, indice):
+    try:
+        with open(arquivo_cache, 'w', encoding='utf-8') as f:
+            json.dump({'indice': indice, 'gravado_em': time.time(), 'data': datetime.now().isoformat()}, f)
+    except OSError as e: print(f"⚠️ Não foi possível gravar o cache da câmera: {e}")
+
+
+def testar_camera(indice, abrir):
+    """Abre o índice e lê um frame"""
+    captura = abrir(indice)
+    try: return bool(captura.isOpened() and captura.read()[0])
+    finally: captura.release()
+
+
+def descobrir_camera(max_indices=5, timeout=3.0, arquivo_cache=None, validade=86400, abrir=None):
+    """Menor índice de webcam que abre e entrega um frame (0 se nenhum responder)
+
+    Todos os índices são testados ao mesmo tempo; a busca termina quando o
+    menor índice funcional estiver decidido ou em `timeout` segundos (índices
+    travados são ignorados). O índice encontrado fica em `arquivo_cache` por
+    `validade` segundos.
+    """
+    if arquivo_cache:
+        indice = _ler_cache(arquivo_cache, validade)
+        if indice is not None: return indice
+    if abrir is None:
+        import cv2
+        abrir = cv2.VideoCapture
+
+    resultados = {}
+    condicao = threading.Condition()
+
+    def testar(indice):
+        try: funciona = testar_camera(indice, abrir)
+        except Exception: funciona = False
+        with condicao:
+            resultados[indice] = funciona
+            condicao.notify_all()
+
+    def decidido():
+        for indice in range(max_indices):
+            if indice not in resultados: return False
+            if resultados[indice]: return True
+        return True
+
+    for indice in range(max_indices):
+        threading.Thread(target=testar, args=(indice,), name=f'camera-{indice}', daemon=True).start()
+    with condicao:
+        condicao.wait_for(decidido, timeout)
+        encontrado = next((indice for indice in range(max_indices) if resultados.get(indice)), None)
+
+    if encontrado is None: return 0
+    if arquivo_cache: _gravar_cache(arquivo_cache, encontrado)
+    return encontrado
@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+"""
+Mão robótica do TraduLibras
+Fila de trabalhos executada por uma única thread: a requisição web só
+enfileira a palavra e recebe um id; o progresso, o cancelamento e o estado
+da fila ficam disponíveis enquanto os servos se movem.
+Protocolo serial guiado pelas respostas do Arduino (sketch_oct9a.ino): uma
+thread lê as linhas da placa e cada comando seguinte sai assim que o
+movimento anterior termina; um Arduino simulado num pseudo-terminal permite
+testar tudo sem a placa. As portas seriais ficam num inventário em cache,
+atualizado em segundo plano
+"""
+
+import argparse
+import collections
+import itertools
+import os
+import re
+import select
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime
+
+
+def limpar_palavra(texto):
+    """Só letras a-z e espaços: acentos removidos (á → a), espaços repetidos viram uma pausa"""
+    sem_acentos = unicodedata.normalize('NFKD', texto.lower()).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(''.join(c for c in sem_acentos if c.isalpha() or c.isspace()).split())
+
+
+class TrabalhoMao:
+    """Uma palavra/frase para a mão: estado na_fila → executando → concluido | cancelado | erro"""
+
+    def __init__(self, identificador, texto):
+        self.id = identificador
+        self.texto = texto
+        self.estado = 'na_fila'
+        self.posicao = 0         # caracteres já executados
+        self.passos = []         # mensagens de cada letra/pausa
+        self.erro = None
+        self.criado_em = datetime.now()
+        self.iniciado_em = self.concluido_em = None
+        self.cancelado = threading.Event()
+
+    def finalizado(self): return self.estado in ('concluido', 'cancelado', 'erro')
+
+    def status(self):
+        return {
+            'id': self.id, 'texto': self.texto, 'estado': self.estado,
+            'posicao': self.posicao, 'total': len(self.texto),
+            'progresso': round(self.posicao / len(self.texto), 3) if self.texto else 1.0,
+            'passos': list(self.passos), 'erro': self.erro,
+            'criado_em': self.criado_em.isoformat(),
+            'iniciado_em': self.iniciado_em.isoformat() if self.iniciado_em else None,
+            'concluido_em': self.concluido_em.isoformat() if self.concluido_em else None,
+        }
+
+
+class FilaMao:
+    """Executa os trabalhos um de cada vez (os bytes de palavras diferentes nunca se misturam)
+
+    `enviar_letra(letra)` retorna (sucesso, mensagem); depois de cada letra a
+    thread espera `pausa_letra` segundos e, num espaço, `pausa_espaco`. As
+    esperas acordam na hora se o trabalho for cancelado. `ao_mudar(status)` é
+    chamado a cada passo (ex.: publicar no canal de eventos).
+
+    `enviar_palavra(texto, passo, cancelado)`, se informado, manda o trabalho
+    inteiro de uma vez (chamando `passo(caractere, mensagem)` a cada letra
+    concluída) e retorna (sucesso, mensagem), ou None para seguir letra a letra.
+    """
+
+    def __init__(self, enviar_letra, pausa_letra=0.8, pausa_espaco=1.0, max_historico=50, ao_mudar=None,
+                 enviar_palavra=None):
+        self.enviar_letra = enviar_letra
+        self.enviar_palavra = enviar_palavra
+        self.pausa_letra = pausa_letra
+        self.pausa_espaco = pausa_espaco
+        self.ao_mudar = ao_mudar
+        self.condicao = threading.Condition()
+        self.fila = collections.deque()
+        self.trabalhos = collections.OrderedDict()  # id -> TrabalhoMao (os finalizados mais antigos saem)
+        self.max_historico = max_historico
+        self.atual = None
+        self.ids = itertools.count(1)
+        self.thread = None
+
+    def enviar(self, texto):
+        """Enfileira e retorna o trabalho; ValueError se não houver letras"""
+        palavra = limpar_palavra(texto)
+        if not palavra: raise ValueError("Palavra vazia ou sem letras válidas")
+        with self.condicao:
+            trabalho = TrabalhoMao(next(self.ids), palavra)
+            self.trabalhos[trabalho.id] = trabalho
+            self._podar()
+            self.fila.append(trabalho)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._executar, name='fila-mao', daemon=True)
+                self.thread.start()
+            self.condicao.notify_all()
+        self._notificar(trabalho)
+        return trabalho
+
+    def _podar(self):
+        finalizados = [i for i, t in self.trabalhos.items() if t.finalizado()]
+        for identificador in finalizados[:max(0, len(self.trabalhos) - self.max_historico)]:
+            del self.trabalhos[identificador]
+
+    def obter(self, identificador):
+        with self.condicao: return self.trabalhos.get(identificador)
+
+    def cancelar(self, identificador):
+        """Cancela um trabalho na fila ou em execução; False se não existir ou já terminou"""
+        with self.condicao:
+            trabalho = self.trabalhos.get(identificador)
+            if trabalho is None or trabalho.finalizado(): return False
+            trabalho.cancelado.set()
+            if trabalho in self.fila:
+                self.fila.remove(trabalho)
+                self._finalizar(trabalho, 'cancelado')
+        if trabalho.finalizado(): self._notificar(trabalho)
+        return True
+
+    def cancelar_todos(self):
+        with self.condicao: pendentes = list(self.fila) + ([self.atual] if self.atual else [])
+        return sum(self.cancelar(trabalho.id) for trabalho in pendentes)
+
+    def _finalizar(self, trabalho, estado, erro=None):
+        trabalho.estado, trabalho.erro, trabalho.concluido_em = estado, erro, datetime.now()
+
+    def _notificar(self, trabalho):
+        if self.ao_mudar:
+            try: self.ao_mudar(trabalho.status())
+            except Exception as e: print(f"⚠️ Erro ao notificar trabalho {trabalho.id}: {e}")
+
+    def _executar(self):
+        while True:
+            with self.condicao:
+                self.condicao.wait_for(lambda: self.fila)
+                trabalho = self.atual = self.fila.popleft()
+                trabalho.estado, trabalho.iniciado_em = 'executando', datetime.now()
+            self._notificar(trabalho)
+            try: estado, erro = self._executar_trabalho(trabalho)
+            except Exception as e: estado, erro = 'erro', str(e)
+            with self.condicao:
+                self._finalizar(trabalho, estado, erro)
+                self.atual = None
+            self._notificar(trabalho)
+
+    def _registrar_passo(self, trabalho, letra, mensagem):
+        trabalho.passos.append("Espaço - pausa" if letra == ' ' else f"{letra.upper()}: {mensagem}")
+        trabalho.posicao += 1
+        self._notificar(trabalho)
+
+    def _executar_trabalho(self, trabalho):
+        if self.enviar_palavra:
+            resultado = self.enviar_palavra(trabalho.texto, lambda letra, mensagem: self._registrar_passo(trabalho, letra, mensagem),
+                                            trabalho.cancelado)
+            if resultado is not None:
+                if trabalho.cancelado.is_set() and trabalho.posicao < len(trabalho.texto): return 'cancelado', None
+                return ('concluido', None) if resultado[0] else ('erro', resultado[1])
+        for letra in trabalho.texto[trabalho.posicao:]:
+            if trabalho.cancelado.is_set(): return 'cancelado', None
+            if letra == ' ':
+                self._registrar_passo(trabalho, letra, None)
+                pausa = self.pausa_espaco
+            else:
+                sucesso, mensagem = self.enviar_letra(letra)
+                if not sucesso:
+                    trabalho.passos.append(f"{letra.upper()}: {mensagem}")
+                    return 'erro', mensagem
+                self._registrar_passo(trabalho, letra, mensagem)
+                pausa = self.pausa_letra
+            if trabalho.cancelado.wait(pausa) and trabalho.posicao < len(trabalho.texto): return 'cancelado', None
+        return 'concluido', None
+
+    def status(self):
+        with self.condicao:
+            return {
+                'executando': self.atual.id if self.atual else None,
+                'fila': [trabalho.id for trabalho in self.fila],
+                'trabalhos': [trabalho.status() for trabalho in reversed(self.trabalhos.values())],
+            }
+
+
+# ==================== PROTOCOLO SERIAL ====================
+# v1: sketch original, só avisa o início do movimento (EXECUTANDO / REPOUSO / "Z - Movimento completo!")
+# v2: responde "?" com PROTOCOLO, manda "PRONTO: <comando>" quando o movimento termina e aceita
+#     a palavra inteira num quadro <texto*CK> (CK = XOR dos bytes do texto em hexadecimal)
+VERSAO_LEGADA, VERSAO_ACK = 1, 2
+MAX_QUADRO = 48  # o buffer de recepção do Arduino Uno tem 64 bytes
+PADRAO_EXECUTANDO = re.compile(r'EXECUTANDO: Letra (\w)')
+
+
+def checksum(texto):
+    valor = 0
+    for byte in texto.encode('ascii'): valor ^= byte
+    return valor
+
+
+def montar_quadro(texto):
+    """<texto*CK> com texto de a-z, '0' e espaços"""
+    if not texto or len(texto) > MAX_QUADRO: raise ValueError(f"Quadro deve ter de 1 a {MAX_QUADRO} caracteres")
+    if any(c not in 'abcdefghijklmnopqrstuvwxyz0 ' for c in texto): raise ValueError("Quadro só aceita a-z, 0 e espaço")
+    return f'<{texto}*{checksum(texto):02X}>'.encode('ascii')
+
+
+def interpretar_linha(linha):
+    """(tipo, valor) de uma linha enviada pelo Arduino"""
+    if linha.startswith('PRONTO:'):
+        valor = linha[7:].strip().lower()
+        return 'pronto', ' ' if valor == 'espaco' else valor
+    if linha.startswith('EXECUTANDO:'):
+        encontrado = PADRAO_EXECUTANDO.match(linha)
+        return 'executando', encontrado.group(1).lower() if encontrado else None
+    if linha.startswith('Z - Movimento completo'): return 'completo', 'z'
+    if linha.startswith('REPOUSO'): return 'repouso', '0'
+    if linha.startswith('ERRO'): return 'erro', linha.partition(':')[2].strip()
+    if linha.startswith('PALAVRA:'): return 'palavra', linha[8:].strip()
+    if linha.startswith('RECEBIDO:'): return 'recebido', linha[9:].strip().lower()
+    if linha.startswith('PROTOCOLO:'):
+        try: return 'protocolo', int(linha[10:].strip())
+        except ValueError: return 'info', None
+    return 'info', None
+
+
+class ProtocoloMao:
+    """Comandos para a mão guiados pelas respostas do Arduino
+
+    Uma thread lê a porta (aberta com timeout curto, ex. 0.1 s) e guarda cada
+    linha como evento; enviar_letra() espera o evento de fim do movimento em vez
+    de um tempo fixo. Com o firmware v1, que não avisa o fim, espera o início
+    do movimento e mais `assentamento` segundos. `observador(nome, segundos)`
+    recebe 'escrita' e 'ack'; `ao_desconectar(erro)` é chamado se a leitura falhar.
+    """
+
+    def __init__(self, porta, timeout=3.0, assentamento=0.3, observador=None, ao_desconectar=None):
+        self.porta = porta
+        self.timeout = timeout
+        self.assentamento = assentamento
+        self.observador = observador
+        self.ao_desconectar = ao_desconectar
+        self.versao = VERSAO_LEGADA
+        self.lock = threading.Lock()  # um comando (e suas respostas) por vez
+        self.condicao = threading.Condition()
+        self.eventos = collections.deque(maxlen=256)  # (número, tipo, valor, linha)
+        self.numero = 0
+        self.ativo = True
+        self.erro_leitura = None
+        self.contadores = {'linhas': 0, 'acks': 0, 'erros': 0, 'sem_resposta': 0}
+        self.ack_medio_ms = None
+        self.thread = threading.Thread(target=self._ler, name='serial-leitura', daemon=True)
+        self.thread.start()
+
+    def _ler(self):
+        pendente = b''
+        while self.ativo:
+            try: dados = self.porta.read(max(1, self.porta.in_waiting))
+            except Exception as e:
+                if not self.ativo: return
+                with self.condicao:
+                    self.erro_leitura = str(e)
+                    self.condicao.notify_all()
+                print(f"❌ Leitura serial interrompida: {e}")
+                if self.ao_desconectar: self.ao_desconectar(str(e))
+                return
+            if not dados: continue
+            *linhas, pendente = (pendente + dados).split(b'\n')
+            for bruta in linhas:
+                linha = bruta.decode('utf-8', errors='ignore').strip()
+                if linha: self._registrar(linha)
+
+    def _registrar(self, linha):
+        tipo, valor = interpretar_linha(linha)
+        with self.condicao:
+            self.numero += 1
+            self.eventos.append((self.numero, tipo, valor, linha))
+            self.contadores['linhas'] += 1
+            self.condicao.notify_all()
+
+    def _marca(self):
+        with self.condicao: return self.numero
+
+    def _aguardar(self, desde, fim, timeout, cancelado=None):
+        """Primeiro evento após o número `desde` com fim(tipo, valor); None no timeout ou cancelamento"""
+        limite = time.monotonic() + timeout
+        with self.condicao:
+            while True:
+                for evento in self.eventos:
+                    if evento[0] <= desde: continue
+                    desde = evento[0]
+                    if fim(evento[1], evento[2]): return evento
+                if self.erro_leitura: raise ConnectionError(self.erro_leitura)
+                restante = limite - time.monotonic()
+                if restante <= 0 or (cancelado is not None and cancelado.is_set()): return None
+                # Com cancelamento possível, confere o pedido a cada 50 ms
+                self.condicao.wait(min(restante, 0.05) if cancelado is not None else restante)
+
+    def _escrever(self, dados):
+        inicio = time.perf_counter()
+        self.porta.write(dados)
+        self.porta.flush()
+        if self.observador: self.observador('escrita', time.perf_counter() - inicio)
+
+    def _registrar_ack(self, segundos):
+        with self.condicao:
+            self.contadores['acks'] += 1
+            ms = segundos * 1000
+            self.ack_medio_ms = ms if self.ack_medio_ms is None else self.ack_medio_ms + 0.1 * (ms - self.ack_medio_ms)
+        if self.observador: self.observador('ack', segundos)
+
+    def _falha(self, contador, mensagem):
+        with self.condicao: self.contadores[contador] += 1
+        return False, mensagem
+
+    def identificar(self, timeout=1.0):
+        """Pergunta a versão do protocolo ("?"); o firmware v1 responde ERRO e fica em v1"""
+        with self.lock:
+            desde = self._marca()
+            self._escrever(b'?\n')
+            evento = self._aguardar(desde, lambda tipo, valor: tipo in ('protocolo', 'erro'), timeout)
+            self.versao = evento[2] if evento and evento[1] == 'protocolo' else VERSAO_LEGADA
+        return self.versao
+
+    def enviar_comando(self, letra):
+        """Só escreve (sem esperar o movimento); espera apenas o comando em andamento"""
+        with self.lock: self._escrever(letra.encode('ascii') + b'\n')
+
+    def _fim_da_letra(self, letra):
+        if self.versao >= VERSAO_ACK: return lambda tipo, valor: (tipo == 'pronto' and valor == letra) or tipo == 'erro'
+        return lambda tipo, valor: tipo == 'erro' or (tipo == 'repouso' and letra == '0') or \
+            (tipo == 'completo' and letra == 'z') or (tipo == 'executando' and valor == letra and letra != 'z')
+
+    def enviar_letra(self, letra, timeout=None):
+        """Envia a letra (ou '0', repouso) e retorna (sucesso, mensagem) quando o movimento termina"""
+        with self.lock:
+            desde = self._marca()
+            inicio = time.perf_counter()
+            self._escrever(letra.encode('ascii') + b'\n')
+            evento = self._aguardar(desde, self._fim_da_letra(letra), timeout or self.timeout)
+            if evento is None: return self._falha('sem_resposta', f"Sem resposta do Arduino para '{letra.upper()}'")
+            if evento[1] == 'erro': return self._falha('erros', evento[3])
+            # O firmware v1 só avisa que começou: dá aos servos o mesmo tempo que o sketch espera
+            if self.versao < VERSAO_ACK: time.sleep(self.assentamento)
+            self._registrar_ack(time.perf_counter() - inicio)
+        return True, f"Letra '{letra.upper()}' executada"
+
+    def enviar_palavra(self, texto, passo=None, cancelado=None, timeout=None):
+        """Texto inteiro em quadros (v2); `passo(caractere, mensagem)` a cada caractere concluído
+
+        Se `cancelado` (Event) for acionado, pede ao Arduino para parar ("!") e retorna.
+        """
+        if self.versao < VERSAO_ACK: raise RuntimeError("Firmware sem suporte a quadros (protocolo v1)")
+        timeout = timeout or self.timeout
+        for inicio_quadro in range(0, len(texto), MAX_QUADRO):
+            quadro = texto[inicio_quadro:inicio_quadro + MAX_QUADRO]
+            with self.lock:
+                desde = self._marca()
+                self._escrever(montar_quadro(quadro))
+                evento = self._aguardar(desde, lambda tipo, valor: tipo in ('palavra', 'erro'), timeout)
+                if evento is None: return self._falha('sem_resposta', "Sem resposta do Arduino para o quadro")
+                if evento[1] == 'erro': return self._falha('erros', evento[3])
+                desde, inicio = evento[0], time.perf_counter()
+                while True:
+                    evento = self._aguardar(desde, lambda tipo, valor: tipo in ('pronto', 'palavra', 'erro'), timeout, cancelado)
+                    if evento is None and cancelado is not None and cancelado.is_set():
+                        self._escrever(b'!')
+                        self._aguardar(desde, lambda tipo, valor: tipo == 'palavra', timeout)
+                        return False, "Cancelado"
+                    if evento is None: return self._falha('sem_resposta', "Sem resposta do Arduino durante a palavra")
+                    desde = evento[0]
+                    if evento[1] == 'erro': return self._falha('erros', evento[3])
+                    if evento[1] == 'palavra': break
+                    self._registrar_ack(time.perf_counter() - inicio)
+                    inicio = time.perf_counter()
+                    if passo: passo(evento[2], None if evento[2] == ' ' else f"Letra '{evento[2].upper()}' executada")
+        return True, f"Palavra '{texto.upper()}' executada"
+
+    def fechar(self):
+        """Para a thread de leitura (a porta é fechada por quem a abriu)"""
+        self.ativo = False
+        with self.condicao: self.condicao.notify_all()
+
+    def status(self):
+        with self.condicao:
+            return {
+                'versao': self.versao, **self.contadores,
+                'ack_medio_ms': None if self.ack_medio_ms is None else round(self.ack_medio_ms, 1),
+                'erro_leitura': self.erro_leitura,
+            }
+
+
+# ==================== INVENTÁRIO DE PORTAS ====================
+PALAVRAS_ARDUINO = ('arduino', 'ch340', 'usb serial')
+STATUS_DISPONIVEL, STATUS_INDISPONIVEL = "✅ Disponível", "❌ Indisponível"
+STATUS_VERIFICANDO, STATUS_EM_USO = "⏳ Verificando...", "🔌 Em uso (conectada)"
+ESPERA_BOOTLOADER = 2.0  # segundos até o sketch voltar depois de um reset por DTR (o mesmo do connect)
+
+
+def testar_porta(dispositivo, espera_bootloader=ESPERA_BOOTLOADER):
+    """Abre e fecha a porta; se o teste pode ter resetado a placa, espera o bootloader
+
+    DTR/RTS desligados antes do open() só evitam o reset no Windows. No Linux e
+    no macOS o próprio open() liga DTR (e o fechamento com HUPCL o derruba), o
+    que reinicia Arduinos com auto-reset: a porta só é dada como disponível
+    depois que o sketch voltou. Por isso cada porta é testada uma única vez.
+    """
+    import serial
+    teste = serial.Serial()
+    teste.port, teste.dtr, teste.rts, teste.timeout = dispositivo, False, False, 0
+    teste.open()
+    teste.close()
+    if os.name != 'nt' and espera_bootloader: time.sleep(espera_bootloader)
+
+
+class InventarioPortas:
+    """Portas seriais em cache, atualizadas por uma thread
+
+    A cada `intervalo` segundos só enumera (comports() não abre nada); uma porta
+    é aberta para teste uma única vez, quando aparece. Portas indisponíveis são
+    testadas de novo depois de `validade` segundos ou em atualizar(); portas
+    disponíveis ou em uso (`em_uso()` → dispositivos conectados) nunca são
+    reabertas. `ao_mudar(portas)` recebe a lista sempre que ela muda.
+    """
+
+    def __init__(self, listar=None, testar=testar_porta, intervalo=2.0, validade=30.0, em_uso=None, ao_mudar=None):
+        self.listar_sistema = listar
+        self.testar = testar
+        self.intervalo = intervalo
+        self.validade = validade
+        self.em_uso = em_uso
+        self.ao_mudar = ao_mudar
+        self.condicao = threading.Condition()
+        self.portas = {}       # dispositivo -> dicionário publicado
+        self.verificadas = {}  # dispositivo -> time.monotonic() do último teste
+        self.lista = []
+        self.forcar = False
+        self.thread = None
+        self.varreduras = self.testes = 0
+        self.ultima_varredura = None
+
+    def _enumerar(self):
+        if self.listar_sistema: return list(self.listar_sistema())
+        import serial.tools.list_ports
+        return list(serial.tools.list_ports.comports())
+
+    def listar(self):
+        """Lista atual (em cache); na primeira chamada enumera sem testar e inicia a thread"""
+        with self.condicao:
+            if self.thread is None:
+                self._varrer(testar=False)
+                self.thread = threading.Thread(target=self._executar, name='inventario-portas', daemon=True)
+                self.thread.start()
+            return self.lista
+
+    def atualizar(self):
+        """Acorda a thread agora (ex.: conectou/desconectou, botão de atualizar)"""
+        with self.condicao:
+            self.forcar = True
+            self.condicao.notify_all()
+
+    def _varrer(self, testar=True):
+        em_uso = set(self.em_uso()) if self.em_uso else set()
+        agora = time.monotonic()
+        forcar, self.forcar = self.forcar, False
+        portas, pendentes = {}, []
+        for porta in self._enumerar():
+            anterior = self.portas.get(porta.device)
+            if anterior is None or anterior['hwid'] != porta.hwid:  # porta nova (ou outro aparelho no mesmo nome)
+                anterior = None
+                self.verificadas.pop(porta.device, None)
+            info = dict(anterior) if anterior else {
+                'device': porta.device, 'description': porta.description, 'hwid': porta.hwid,
+                'is_arduino': any(x in porta.description.lower() for x in PALAVRAS_ARDUINO), 'status': STATUS_VERIFICANDO}
+            if porta.device in em_uso: info['status'] = STATUS_EM_USO
+            elif info['status'] == STATUS_EM_USO:
+                # Acabamos de fechar a porta: está livre sem precisar abrir de novo
+                info['status'], self.verificadas[porta.device] = STATUS_DISPONIVEL, agora
+            elif info['status'] == STATUS_VERIFICANDO or (info['status'] == STATUS_INDISPONIVEL and
+                                                          (forcar or agora - self.verificadas.get(porta.device, 0) > self.validade)):
+                pendentes.append(porta.device)
+            portas[porta.device] = info
+        for dispositivo in set(self.verificadas) - set(portas): del self.verificadas[dispositivo]
+        self.portas = portas
+        self._publicar()
+        if testar and pendentes:
+            self.condicao.release()  # abrir uma porta pode demorar: não segura quem só quer a lista
+            try: resultados = {dispositivo: self._testar(dispositivo) for dispositivo in pendentes}
+            finally: self.condicao.acquire()
+            for dispositivo, status in resultados.items():
+                if dispositivo in self.portas and self.portas[dispositivo]['status'] != STATUS_EM_USO:
+                    self.portas[dispositivo] = {**self.portas[dispositivo], 'status': status}
+                    self.verificadas[dispositivo] = time.monotonic()
+            self._publicar()
+        self.varreduras += 1
+        self.ultima_varredura = datetime.now()
+
+    def _testar(self, dispositivo):
+        self.testes += 1
+        try:
+            self.testar(dispositivo)
+            return STATUS_DISPONIVEL
+        except Exception: return STATUS_INDISPONIVEL
+
+    def _publicar(self):
+        lista = sorted(self.portas.values(), key=lambda info: info['device'])
+        if lista == self.lista: return
+        self.lista = lista
+        if self.ao_mudar:
+            try: self.ao_mudar(lista)
+            except Exception as e: print(f"⚠️ Erro ao notificar portas: {e}")
+
+    def _executar(self):
+        while True:
+            with self.condicao:
+                self.condicao.wait_for(lambda: self.forcar, self.intervalo)
+                try: self._varrer()
+                except Exception as e: print(f"❌ Erro ao listar portas seriais: {e}")
+
+    def status(self):
+        with self.condicao:
+            return {
+                'portas': len(self.lista), 'varreduras': self.varreduras, 'testes': self.testes,
+                'ultima_varredura': self.ultima_varredura.isoformat() if self.ultima_varredura else None,
+            }
+
+
+# ==================== ARDUINO SIMULADO ====================
+class ArduinoSimulado:
+    """O firmware sketch_oct9a.ino imitado num pseudo-terminal (só POSIX)
+
+    Abra `caminho` com pyserial como se fosse a placa. `versao` escolhe o
+    sketch original (1) ou o com PRONTO/quadros (2); os tempos imitam os
+    delays do sketch. `atropelos` conta comandos que chegaram antes do fim
+    das etapas de um movimento (o Z tem três).
+    """
+
+    def __init__(self, versao=VERSAO_ACK, assentamento=0.3, delay_z=0.3, pausa_espaco=1.0):
+        import pty
+        import tty
+        self.versao = versao
+        self.assentamento = assentamento
+        self.delay_z = delay_z
+        self.pausa_espaco = pausa_espaco
+        self.mestre, self.escravo = pty.openpty()
+        tty.setraw(self.escravo)
+        self.caminho = os.ttyname(self.escravo)
+        self.entrada = bytearray()
+        self.executados = []
+        self.atropelos = 0
+        self.ativo = True
+        self.thread = threading.Thread(target=self._executar, name='arduino-simulado', daemon=True)
+        self.thread.start()
+
+    def _println(self, linha): os.write(self.mestre, linha.encode('utf-8') + b'\r\n')
+
+    def _receber(self, timeout):
+        if select.select([self.mestre], [], [], timeout)[0]:
+            try: self.entrada += os.read(self.mestre, 256)
+            except OSError: self.ativo = False
+
+    def _ler(self, timeout=0.1):
+        if not self.entrada: self._receber(timeout)
+        if not self.entrada: return None
+        caractere = chr(self.entrada[0])
+        del self.entrada[0]
+        return caractere
+
+    def _mover(self, segundos):
+        """delay() do sketch"""
+        time.sleep(segundos)
+        self._receber(0)
+
+    def _executar_comando(self, comando):
+        if 'a' <= comando <= 'z':
+            if comando == 'z':
+                self._println("EXECUTANDO: Letra Z - Movimento complexo")
+                for etapa, espera in (("Z - Etapa 1: Preparando dedos", 1), ("Z - Etapa 2: Movimento do polegar", 1),
+                                      ("Z - Etapa 3: Ajuste final", 2)):
+                    self._println(etapa)
+                    self._mover(self.delay_z * espera)
+                self._println("Z - Movimento completo!")
+            else: self._println(f"EXECUTANDO: Letra {comando}")
+        elif comando == '0': self._println("REPOUSO: Mao em posicao de repouso")
+        else:
+            self._println("ERRO: Comando não reconhecido")
+            if self.versao < VERSAO_ACK: self._mover(self.assentamento)
+            return
+        self.executados.append(comando)
+        self._receber(0)
+        if self.entrada.strip(b'\r\n!'): self.atropelos += 1
+        self._mover(self.assentamento)
+        if self.versao >= VERSAO_ACK: self._println(f"PRONTO: {comando}")
+
+    def _executar_quadro(self):
+        quadro = ''
+        while True:
+            caractere = self._ler(0.2)
+            if caractere is None or caractere == '>' or len(quadro) > MAX_QUADRO + 4: break
+            quadro += caractere
+        texto, _, ck = quadro.rpartition('*')
+        if caractere != '>' or len(ck) != 2:
+            self._println("ERRO: Quadro malformado")
+            return
+        if checksum(texto) != int(ck, 16):
+            self._println("ERRO: Checksum invalido")
+            return
+        self._println(f"PALAVRA: OK {len(texto)}")
+        for caractere in texto:
+            self.entrada[:] = self.entrada.lstrip(b'\r\n')
+            if self.entrada[:1] == b'!':
+                del self.entrada[0]
+                self._println("PALAVRA: CANCELADA")
+                return
+            if caractere == ' ':
+                self._mover(self.pausa_espaco)
+                self._println("PRONTO: espaco")
+            else: self._executar_comando(caractere)
+        self._println("PALAVRA: FIM")
+
+    def _executar(self):
+        self._println("INICIO: TRADULIBRAS - MAO ROBOTICA INICIADA")
+        self._println("AGUARDANDO: Comandos...")
+        while self.ativo:
+            caractere = self._ler()
+            if caractere is None or caractere in '\r\n': continue
+            if self.versao >= VERSAO_ACK:
+                if caractere == '!': continue
+                if caractere == '<':
+                    self._executar_quadro()
+                    continue
+                if caractere == '?':
+                    self._println(f"PROTOCOLO: {self.versao}")
+                    continue
+            self._println(f"RECEBIDO: {caractere}")
+            self._executar_comando(caractere)
+
+    def fechar(self):
+        self.ativo = False
+        self.thread.join(1)
+        for descritor in (self.mestre, self.escravo):
+            try: os.close(descritor)
+            except OSError: pass
+
+
+def medir_palavra(palavra, versao, modo, fixa_letra=0.8, fixa_espaco=1.0):
+    """Executa `palavra` num Arduino simulado e retorna (segundos, atropelos, letras executadas)
+
+    modo: 'fixo' (write + sleep, como antes), 'ack' (letra a letra pelo protocolo) ou 'quadro' (palavra inteira).
+    """
+    import serial
+    arduino = ArduinoSimulado(versao)
+    porta = serial.Serial(arduino.caminho, 115200, timeout=0.1)
+    protocolo = ProtocoloMao(porta)
+    try:
+        protocolo.identificar()
+        inicio = time.perf_counter()
+        if modo == 'quadro': protocolo.enviar_palavra(palavra)
+        for letra in (palavra if modo != 'quadro' else ''):
+            if modo == 'fixo':
+                if letra != ' ': porta.write(letra.encode() + b'\n')
+                time.sleep(fixa_espaco if letra == ' ' else fixa_letra)
+            elif letra == ' ': time.sleep(fixa_espaco)
+            else: protocolo.enviar_letra(letra)
+        if modo == 'fixo':  # espera a placa terminar o que ficou na fila dela
+            while len(arduino.executados) < len(palavra.replace(' ', '')) and time.perf_counter() - inicio < 60: time.sleep(0.01)
+        return time.perf_counter() - inicio, arduino.atropelos, ''.join(arduino.executados)
+    finally:
+        protocolo.fechar()
+        porta.close()
+        arduino.fechar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Protocolo serial da mão robótica do TraduLibras com um Arduino simulado')
+    parser.add_argument('--simular', action='store_true', help='só cria o Arduino simulado e mostra a porta para conectar')
+    parser.add_argument('--versao', type=int, choices=(VERSAO_LEGADA, VERSAO_ACK), default=VERSAO_ACK,
+                        help='firmware simulado: 1 = sketch original, 2 = com PRONTO e quadros')
+    parser.add_argument('--palavra', default='oi zaza', help='palavra para comparar os modos de envio')
+    args = parser.parse_args()
+
+    if args.simular:
+        arduino = ArduinoSimulado(args.versao)
+        print(f"🤖 Arduino simulado (protocolo v{args.versao}) em {arduino.caminho} - Ctrl+C para sair")
+        try:
+            while True: time.sleep(1)
+        except KeyboardInterrupt: arduino.fechar()
+        return 0
+
+    palavra = limpar_palavra(args.palavra)
+    print(f"🧪 Palavra: '{palavra}'")
+    print(f"{'firmware':>8} | {'modo':<7} | {'tempo s':>8} | {'atropelos':>9} | executado")
+    print("-" * 60)
+    for versao, modo in ((VERSAO_LEGADA, 'fixo'), (VERSAO_LEGADA, 'ack'), (VERSAO_ACK, 'ack'), (VERSAO_ACK, 'quadro')):
+        segundos, atropelos, executado = medir_palavra(palavra, versao, modo)
+        print(f"{'v%d' % versao:>8} | {modo:<7} | {segundos:>8.2f} | {atropelos:>9} | {executado}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Métricas do TraduLibras no formato texto do Prometheus
+Histogramas, contadores e medidores simples, baratos o bastante para ficarem
+sempre ligados no loop de frames (um bisect + um lock por observação)
+"""
+
+import bisect
+import collections
+import threading
+import time
+
+# Limites (s) pensados para etapas de frame: de 0,1 ms a 1 s
+LIMITES_FRAME = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Limites (s) para operações lentas (síntese de voz, envio serial)
+LIMITES_LENTOS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _numero(valor):
+    if valor == float('inf'): return '+Inf'
+    if isinstance(valor, int): return str(valor)
+    return repr(float(valor))
+
+
+class Histograma:
+    """Contagens cumulativas por limite + soma e total, como o histogram do Prometheus"""
+
+    tipo = 'histogram'
+
+    def __init__(self, nome, ajuda, limites=LIMITES_FRAME):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.limites = tuple(sorted(limites))
+        self.lock = threading.Lock()
+        self.contagens = [0] * (len(self.limites) + 1)  # a última é o +Inf
+        self.soma = 0.0
+
+    def observar(self, valor):
+        indice = bisect.bisect_left(self.limites, valor)
+        with self.lock:
+            self.contagens[indice] += 1
+            self.soma += valor
+
+    def cronometrar(self):
+        """with histograma.cronometrar(): ...  observa a duração do bloco"""
+        return _Cronometro(self)
+
+    def exportar(self):
+        with self.lock:
+            contagens, soma = list(self.contagens), self.soma
+        linhas, acumulado = [], 0
+        for limite, contagem in zip(self.limites + (float('inf'),), contagens):
+            acumulado += contagem
+            linhas.append(f'{self.nome}_bucket{{le="{_numero(limite)}"}} {acumulado}')
+        linhas.append(f'{self.nome}_sum {_numero(soma)}')
+        linhas.append(f'{self.nome}_count {acumulado}')
+        return linhas
+
+
+class _Cronometro:
+    __slots__ = ('histograma', 'inicio')
+
+    def __init__(self, histograma): self.histograma = histograma
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *erro): self.histograma.observar(time.perf_counter() - self.inicio)
+
+
+class Contador:
+    """Total monotônico"""
+
+    tipo = 'counter'
+
+    def __init__(self, nome, ajuda):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.lock = threading.Lock()
+        self.valor = 0
+
+    def incrementar(self, quantidade=1):
+        with self.lock: self.valor += quantidade
+
+    def exportar(self): return [f'{self.nome} {_numero(self.valor)}']
+
+
+class Medidor:
+    """Valor instantâneo, lido de `funcao` na hora da exportação"""
+
+    tipo = 'gauge'
+
+    def __init__(self, nome, ajuda, funcao):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.funcao = funcao
+
+    def exportar(self):
+        try: return [f'{self.nome} {_numero(self.funcao())}']
+        except Exception: return []
+
+
+class Taxa:
+    """Eventos por unidade de tempo numa janela deslizante (ex.: FPS, letras/minuto)
+
+    O registro só acrescenta o instante a uma deque limitada; a contagem da
+    janela é feita na leitura.
+    """
+
+    def __init__(self, janela=5.0, maximo=10000):
+        self.janela = janela
+        self.instantes = collections.deque(maxlen=maximo)
+
+    def registrar(self): self.instantes.append(time.monotonic())
+
+    def por_segundo(self):
+        limite = time.monotonic() - self.janela
+        recentes = sum(1 for instante in list(self.instantes) if instante >= limite)
+        return recentes / self.janela
+
+
+class RegistroMetricas:
+    """Conjunto de métricas exportado em /metrics"""
+
+    def __init__(self):
+        self.metricas = []
+        self.lock = threading.Lock()
+
+    def _adicionar(self, metrica):
+        with self.lock: self.metricas.append(metrica)
+        return metrica
+
+    def histograma(self, nome, ajuda, limites=LIMITES_FRAME): return self._adicionar(Histograma(nome, ajuda, limites))
+
+    def contador(self, nome, ajuda): return self._adicionar(Contador(nome, ajuda))
+
+    def medidor(self, nome, ajuda, funcao): return self._adicionar(Medidor(nome, ajuda, funcao))
+
+    def exportar(self):
+        """Texto no formato de exposição do Prometheus (text/plain; version=0.0.4)"""
+        with self.lock: metricas = list(self.metricas)
+        linhas = []
+        for metrica in metricas:
+            linhas.append(f'# HELP {metrica.nome} {metrica.ajuda}')
+            linhas.append(f'# TYPE {metrica.nome} {metrica.tipo}')
+            linhas.extend(metrica.exportar())
+        return '\n'.join(linhas) + '\n'
@@ -0,0 +1,174 @@
+"""
+Modelos do TraduLibras
+Encontra os conjuntos modelo/scaler/info salvos em modelos/ pelo treinador,
+valida e aquece cada conjunto novo fora do caminho das requisições e o troca
+pelo ativo de uma vez, sem reiniciar o servidor
+"""
+
+import glob
+import os
+import pickle
+import re
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from features_libras import NUM_FEATURES
+from preditor_compilado import compilar_preditor, assegurar_paridade, amostras_verificacao, PreditorPadrao
+
+PADRAO_TIMESTAMP = re.compile(r'modelo_libras_(\d{8}_\d{6})\.pkl$')
+
+
+def caminhos_conjunto(pasta, timestamp):
+    """(modelo, scaler, info) de um timestamp, com os nomes usados por salvar_modelo()"""
+    return (os.path.join(pasta, f'modelo_libras_{timestamp}.pkl'),
+            os.path.join(pasta, f'scaler_libras_{timestamp}.pkl'),
+            os.path.join(pasta, f'modelo_info_libras_{timestamp}.pkl'))
+
+
+def listar_conjuntos(pasta):
+    """Timestamps com os três arquivos presentes, do mais antigo ao mais novo"""
+    timestamps = []
+    for caminho in glob.glob(os.path.join(pasta, 'modelo_libras_*.pkl')):
+        encontrado = PADRAO_TIMESTAMP.search(os.path.basename(caminho))
+        if encontrado and all(os.path.exists(c) for c in caminhos_conjunto(pasta, encontrado.group(1))):
+            timestamps.append(encontrado.group(1))
+    return sorted(timestamps)
+
+
+class ConjuntoModelo:
+    """Modelo + scaler + info carregados, validados e com o preditor compilado"""
+
+    def __init__(self, timestamp, model, scaler, info):
+        self.timestamp = timestamp
+        self.model = model
+        self.scaler = scaler
+        self.info = info
+        self.preditor = compilar_preditor(model, scaler)
+        self.carregado_em = datetime.now()
+
+
+def carregar_conjunto(pasta, timestamp):
+    """Carrega e valida um conjunto; levanta ValueError se algo não bater"""
+    arquivo_modelo, arquivo_scaler, arquivo_info = caminhos_conjunto(pasta, timestamp)
+    try:
+        with open(arquivo_modelo, 'rb') as f: model = pickle.load(f)
+        with open(arquivo_scaler, 'rb') as f: scaler = pickle.load(f)
+        with open(arquivo_info, 'rb') as f: info = pickle.load(f)
+    except Exception as e:  # pickle truncado, classe inexistente, versão incompatível...
+        raise ValueError(f"Falha ao ler os arquivos: {e}")
+
+    if not all(hasattr(model, atributo) for atributo in ('predict', 'predict_proba', 'classes_')):
+        raise ValueError("Modelo sem predict/predict_proba/classes_")
+    if getattr(model, 'n_features_in_', NUM_FEATURES) != NUM_FEATURES:
+        raise ValueError(f"Modelo espera {model.n_features_in_} features, o app gera {NUM_FEATURES}")
+    if getattr(scaler, 'n_features_in_', NUM_FEATURES) != NUM_FEATURES:
+        raise ValueError(f"Scaler ajustado com {scaler.n_features_in_} features")
+    if not isinstance(info, dict): raise ValueError("Info do modelo não é um dicionário")
+
+    conjunto = ConjuntoModelo(timestamp, model, scaler, info)
+    # O preditor compilado tem que dar exatamente o resultado do scikit-learn; senão usa o do scikit-learn
+    try: assegurar_paridade(conjunto.preditor, model, scaler, amostras_verificacao(scaler, NUM_FEATURES))
+    except AssertionError as e:
+        print(f"❌ Preditor compilado do modelo {timestamp} diverge do scikit-learn ({e}); usando o scikit-learn")
+        conjunto.preditor = PreditorPadrao(model, scaler)
+    # Aquecimento: a primeira predição paga alocações/caches; também confere a saída
+    proba = conjunto.preditor.predict_proba(np.zeros(NUM_FEATURES))
+    if proba.shape != (1, len(model.classes_)) or not np.all(np.isfinite(proba)):
+        raise ValueError("Predição de aquecimento inválida")
+    return conjunto
+
+
+class MonitorModelos:
+    """Vigia `pasta` e troca o conjunto ativo quando surge um mais novo
+
+    `ao_trocar(conjunto)` é chamado com o novo conjunto já validado e aquecido.
+    Com um timestamp fixado, novos conjuntos são só listados, não ativados.
+    """
+
+    def __init__(self, pasta, ao_trocar, intervalo=2.0):
+        self.pasta = pasta
+        self.ao_trocar = ao_trocar
+        self.intervalo = intervalo
+        self.lock = threading.RLock()
+        self.ativo = None
+        self.fixado = None
+        self.falhas = {}  # timestamp -> (mtimes dos arquivos, mensagem): só tenta de novo se mudarem
+        self.trocas = 0
+        self.ultima_verificacao = None
+        self.thread = None
+
+    def _mtimes(self, timestamp):
+        try: return tuple(os.path.getmtime(c) for c in caminhos_conjunto(self.pasta, timestamp))
+        except OSError: return None
+
+    def _ativar(self, timestamp):
+        """Carrega, valida e troca; retorna (sucesso, mensagem)"""
+        mtimes = self._mtimes(timestamp)
+        try: conjunto = carregar_conjunto(self.pasta, timestamp)
+        except ValueError as e:
+            self.falhas[timestamp] = (mtimes, str(e))
+            print(f"❌ Modelo {timestamp} rejeitado: {e}")
+            return False, str(e)
+        self.falhas.pop(timestamp, None)
+        self.ativo = conjunto
+        self.trocas += 1
+        self.ao_trocar(conjunto)
+        print(f"🔄 Modelo ativo: {timestamp} ({len(conjunto.model.classes_)} classes)")
+        return True, f"Modelo {timestamp} ativo"
+
+    def verificar(self):
+        """Ativa o conjunto válido mais novo (se não houver fixado e ele for diferente do ativo)"""
+        with self.lock:
+            self.ultima_verificacao = datetime.now()
+            if self.fixado: return
+            for timestamp in reversed(listar_conjuntos(self.pasta)):
+                if self.ativo and timestamp <= self.ativo.timestamp: return
+                falha = self.falhas.get(timestamp)
+                if falha and falha[0] == self._mtimes(timestamp): continue
+                if self._ativar(timestamp)[0]: return
+
+    def fixar(self, timestamp):
+        """Fixa (ou volta para) um conjunto específico até liberar()"""
+        with self.lock:
+            if timestamp not in listar_conjuntos(self.pasta): return False, f"Modelo {timestamp} não encontrado"
+            if not (self.ativo and self.ativo.timestamp == timestamp):
+                sucesso, mensagem = self._ativar(timestamp)
+                if not sucesso: return False, mensagem
+            self.fixado = timestamp
+            return True, f"Modelo {timestamp} fixado"
+
+    def liberar(self):
+        """Remove a fixação e volta a seguir o conjunto mais novo"""
+        with self.lock:
+            self.fixado = None
+            # Reavalia do zero: o mais novo pode ser anterior ao fixado
+            atual, self.ativo = self.ativo, None
+            self.verificar()
+            if self.ativo is None: self.ativo = atual
+            return True, f"Seguindo o modelo mais recente ({self.ativo.timestamp if self.ativo else '-'})"
+
+    def iniciar(self):
+        """Primeira carga (síncrona) e thread de verificação periódica"""
+        self.verificar()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._executar, name='monitor-modelos', daemon=True)
+            self.thread.start()
+
+    def _executar(self):
+        while True:
+            time.sleep(self.intervalo)
+            try: self.verificar()
+            except Exception as e: print(f"❌ Erro ao verificar modelos: {e}")
+
+    def status(self):
+        with self.lock:
+            return {
+                'ativo': self.ativo.timestamp if self.ativo else None,
+                'carregado_em': self.ativo.carregado_em.isoformat() if self.ativo else None,
+                'fixado': self.fixado,
+                'disponiveis': listar_conjuntos(self.pasta),
+                'rejeitados': {timestamp: mensagem for timestamp, (_, mensagem) in self.falhas.items()},
+                'trocas': self.trocas,
+                'ultima_verificacao': self.ultima_verificacao.isoformat() if self.ultima_verificacao else None
+            }
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Preditor compilado para o modelo LIBRAS
+Achata o RandomForest treinado em vetores contíguos de nós e avalia uma
+amostra ou um lote com NumPy puro (sem a validação e o despacho por árvore do
+scikit-learn), com as mesmas comparações em float32 das árvores do scikit-learn
+"""
+
+import glob
+import os
+import pickle
+import sys
+import time
+import numpy as np
+
+
+class FlorestaCompilada:
+    """RandomForest/ExtraTrees + StandardScaler avaliados por percurso vetorizado"""
+
+    TAMANHO_BLOCO = 512  # linhas por bloco no percurso em lote (limita a memória de n x árvores x classes)
+
+    def __init__(self, model, scaler=None):
+        arvores = [estimador.tree_ for estimador in model.estimators_]
+        self.classes_ = model.classes_
+        self.n_arvores = len(arvores)
+        self.n_features = model.n_features_in_
+        self.profundidade = max(arvore.max_depth for arvore in arvores)
+
+        deslocamentos = np.cumsum([0] + [arvore.node_count for arvore in arvores[:-1]])
+        self.raizes = deslocamentos.astype(np.intp)
+
+        feature, limiar, esquerda, direita, valores = [], [], [], [], []
+        for desloc, arvore in zip(deslocamentos, arvores):
+            proprio = np.arange(arvore.node_count) + desloc
+            folha = arvore.children_left < 0
+            # Folhas apontam para si mesmas: o percurso pode rodar sempre `profundidade` passos
+            feature.append(np.where(folha, 0, arvore.feature))
+            limiar.append(np.where(folha, np.inf, arvore.threshold))
+            esquerda.append(np.where(folha, proprio, arvore.children_left + desloc))
+            direita.append(np.where(folha, proprio, arvore.children_right + desloc))
+
+            valor = arvore.value[:, 0, :].astype(np.float64)
+            soma = valor.sum(axis=1, keepdims=True)
+            soma[soma == 0] = 1.0
+            valores.append(valor / soma)
+
+        self.feature = np.ascontiguousarray(np.concatenate(feature), dtype=np.intp)
+        self.limiar = np.ascontiguousarray(np.concatenate(limiar), dtype=np.float64)
+        self.esquerda = np.ascontiguousarray(np.concatenate(esquerda), dtype=np.intp)
+        self.direita = np.ascontiguousarray(np.concatenate(direita), dtype=np.intp)
+        self.valores = np.ascontiguousarray(np.concatenate(valores))
+
+        # Scaler separado (não incorporado aos limiares): o scikit-learn normaliza em float64
+        # e as árvores comparam o valor já convertido para float32; incorporar mudaria o
+        # arredondamento e poderia inverter decisões em cima de um limiar
+        self.media = self.escala = None
+        if scaler is not None:
+            self.media = scaler.mean_ if getattr(scaler, 'with_mean', True) else np.zeros(self.n_features)
+            self.escala = scaler.scale_ if getattr(scaler, 'with_std', True) else np.ones(self.n_features)
+
+    def _proba_bloco(self, X):
+        n = X.shape[0]
+        nos = np.broadcast_to(self.raizes, (n, self.n_arvores)).copy()
+        linhas = np.arange(n)[:, np.newaxis]
+        for _ in range(self.profundidade):
+            vai_esquerda = X[linhas, self.feature[nos]] <= self.limiar[nos]
+            nos = np.where(vai_esquerda, self.esquerda[nos], self.direita[nos])
+        return self.valores[nos].sum(axis=1) / self.n_arvores
+
+    def predict_proba(self, X):
+        """Probabilidades (n, classes) para X sem normalizar, forma (n, 51) ou (51,)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1: X = X[np.newaxis]
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Esperado {self.n_features} features, recebido {X.shape[1]}")
+        if self.media is not None: X = (X - self.media) / self.escala
+        X = X.astype(np.float32)
+        if X.shape[0] <= self.TAMANHO_BLOCO: return self._proba_bloco(X)
+        return np.concatenate([self._proba_bloco(X[i:i + self.TAMANHO_BLOCO])
+                               for i in range(0, X.shape[0], self.TAMANHO_BLOCO)])
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class PreditorPadrao:
+    """Mesma interface para modelos que não são florestas (scaler + modelo do scikit-learn)"""
+
+    def __init__(self, model, scaler=None):
+        self.model = model
+        self.scaler = scaler
+        self.classes_ = model.classes_
+
+    def _preparar(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1: X = X[np.newaxis]
+        return self.scaler.transform(X) if self.scaler is not None else X
+
+    def predict_proba(self, X): return self.model.predict_proba(self._preparar(X))
+
+    def predict(self, X): return self.model.predict(self._preparar(X))
+
+
+def compilar_preditor(model, scaler=None):
+    """FlorestaCompilada para RandomForest/ExtraTrees; PreditorPadrao para os demais
+
+    Só essas duas classes exatas: Bagging (árvores em subconjuntos de features) e
+    AdaBoost (árvores com pesos) também têm estimators_ com tree_, mas a média
+    simples das árvores daria outra predição.
+    """
+    if model is None: return None
+    from sklearn.ensemble import RandomForestClassifier, ExtraTreesClassifier
+    if isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)):
+        return FlorestaCompilada(model, scaler)
+    return PreditorPadrao(model, scaler)
+
+
+def amostras_verificacao(scaler, n_features, quantidade=256, semente=0):
+    """Amostras sintéticas em volta da média do treino (escala do scaler) para conferir a paridade"""
+    rng = np.random.default_rng(semente)
+    media = getattr(scaler, 'mean_', None)
+    escala = getattr(scaler, 'scale_', None)
+    media = np.zeros(n_features) if media is None else media
+    escala = np.ones(n_features) if escala is None else escala
+    return media + escala * rng.standard_normal((quantidade, n_features)) * rng.uniform(0.1, 2.0, (quantidade, 1))
+
+
+def assegurar_paridade(preditor, model, scaler, X):
+    """Levanta AssertionError se o preditor não devolver as mesmas probabilidades/classes do scikit-learn"""
+    X = np.asarray(X, dtype=np.float64)
+    normalizado = scaler.transform(X) if scaler is not None else X
+    esperado = model.predict_proba(normalizado)
+    obtido = preditor.predict_proba(X)
+    if esperado.shape != obtido.shape:
+        raise AssertionError(f"Formato {obtido.shape} diferente do scikit-learn {esperado.shape}")
+    # Empates exatos entre classes podem desempatar diferente por arredondamento da soma: não contam
+    escolhida = esperado[np.arange(len(X)), np.argmax(obtido, axis=1)]
+    divergentes = int(np.sum(escolhida < esperado.max(axis=1) - 1e-9))
+    diferenca = float(np.abs(esperado - obtido).max()) if esperado.size else 0.0
+    if divergentes or diferenca > 1e-9:
+        raise AssertionError(f"{divergentes} de {len(X)} predições divergentes (diferença máxima {diferenca:.2e})")
+
+
+def verificar_paridade(model, scaler, features, repeticoes=200):
+    """Compara o preditor compilado com scaler.transform + model.predict do scikit-learn"""
+    preditor = compilar_preditor(model, scaler)
+    X = np.asarray(features, dtype=np.float64)
+
+    esperado_proba = model.predict_proba(scaler.transform(X))
+    esperado = model.predict(scaler.transform(X))
+    obtido_proba = preditor.predict_proba(X)
+    obtido = preditor.predict(X)
+
+    def medir(funcao):
+        inicio = time.perf_counter()
+        for i in range(repeticoes): funcao(X[i % len(X)].reshape(1, -1))
+        return (time.perf_counter() - inicio) / repeticoes * 1000
+
+    return {
+        'amostras': len(X),
+        'predicoes_iguais': int(np.sum(esperado == obtido)),
+        'concordancia': float(np.mean(esperado == obtido)),
+        'max_diferenca_proba': float(np.abs(esperado_proba - obtido_proba).max()),
+        'sklearn_ms_por_amostra': medir(lambda x: model.predict(scaler.transform(x))),
+        'compilado_ms_por_amostra': medir(preditor.predict),
+    }
+
+
+def main():
+    """Verificação de paridade com o modelo mais recente de modelos/ e o CSV de treino"""
+    import pandas as pd
+
+    arquivo_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join('dados_coletados', 'gestos_libras.csv')
+    modelos = sorted(glob.glob(os.path.join('modelos', 'modelo_libras_*.pkl')), key=os.path.getmtime)
+    scalers = sorted(glob.glob(os.path.join('modelos', 'scaler_libras_*.pkl')), key=os.path.getmtime)
+    if not modelos or not scalers or not os.path.exists(arquivo_csv):
+        print("❌ ERRO: Necessário um modelo em modelos/ e o CSV de treino")
+        return 1
+
+    with open(modelos[-1], 'rb') as f: model = pickle.load(f)
+    with open(scalers[-1], 'rb') as f: scaler = pickle.load(f)
+    features = pd.read_csv(arquivo_csv).iloc[:, 1:].values
+
+    print(f"🔍 Paridade: {modelos[-1]} x {arquivo_csv}")
+    resultado = verificar_paridade(model, scaler, features)
+    for chave, valor in resultado.items(): print(f"   - {chave}: {valor}")
+
+    ok = resultado['predicoes_iguais'] == resultado['amostras']
+    print("✅ Predições idênticas ao scikit-learn" if ok else "❌ Predições divergentes do scikit-learn")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Agendamento do rastreamento de mãos do TraduLibras
+Decide em quais frames o MediaPipe roda (nos demais o último resultado é
+reaproveitado) e com quais parâmetros do modo de rastreamento do Hands
+"""
+
+import threading
+import numpy as np
+
+
+class AgendadorRastreamento:
+    """Escolhe os frames que passam pelo hands.process()
+
+    Modos:
+      - 'sempre': todo frame (comportamento original)
+      - 'intervalo': um a cada `intervalo` frames
+      - 'movimento': só quando a diferença média entre o frame reduzido em cinza
+        e o do último processamento passa de `limiar_movimento` (0-255)
+    Em qualquer modo o MediaPipe roda ao menos a cada `max_reuso` frames.
+    """
+
+    MODOS = ('sempre', 'intervalo', 'movimento')
+
+    def __init__(self, modo='sempre', intervalo=3, limiar_movimento=6.0, max_reuso=15, tamanho_reduzido=(64, 48)):
+        self.lock = threading.Lock()
+        self.configurar(modo=modo, intervalo=intervalo, limiar_movimento=limiar_movimento, max_reuso=max_reuso)
+        self.tamanho_reduzido = tamanho_reduzido
+
+        self.referencia = None
+        self.ultimo_resultado = None
+        self.ultimo_reaproveitado = False  # o último rastrear() devolveu landmarks de um frame anterior
+        self.frames_desde_processamento = 0
+        self.processados = 0
+        self.reaproveitados = 0
+
+    def configurar(self, modo=None, intervalo=None, limiar_movimento=None, max_reuso=None):
+        """Atualiza os parâmetros informados (os demais são mantidos)"""
+        if modo is not None and modo not in self.MODOS:
+            raise ValueError(f"Modo inválido: {modo} (use {', '.join(self.MODOS)})")
+        with self.lock:
+            if modo is not None: self.modo = modo
+            if intervalo is not None: self.intervalo = max(1, int(intervalo))
+            if limiar_movimento is not None: self.limiar_movimento = float(limiar_movimento)
+            if max_reuso is not None: self.max_reuso = max(1, int(max_reuso))
+            # Força um processamento completo após reconfigurar
+            self.ultimo_resultado = None
+
+    def _miniatura(self, frame):
+        import cv2  # OpenCV só no primeiro frame, não no import do app
+        cinza = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(cinza, self.tamanho_reduzido, interpolation=cv2.INTER_AREA)
+
+    def deve_processar(self, miniatura=None):
+        """True se o próximo frame deve passar pelo MediaPipe (`miniatura` só é usada no modo 'movimento')"""
+        with self.lock:
+            if self.modo == 'sempre' or self.ultimo_resultado is None: return True
+            if self.frames_desde_processamento + 1 >= self.max_reuso: return True
+            if self.modo == 'intervalo':
+                return self.frames_desde_processamento + 1 >= self.intervalo
+
+        if miniatura is None or self.referencia is None or self.referencia.shape != miniatura.shape: return True
+        import cv2
+        diferenca = cv2.absdiff(miniatura, self.referencia)
+        return float(np.mean(diferenca)) > self.limiar_movimento
+
+    def rastrear(self, frame, processar):
+        """Roda `processar(frame)` quando agendado; senão devolve o último resultado"""
+        miniatura = self._miniatura(frame) if self.modo == 'movimento' else None
+        if self.deve_processar(miniatura):
+            self.ultimo_resultado = processar(frame)
+            self.frames_desde_processamento = 0
+            self.processados += 1
+            self.referencia = miniatura
+            self.ultimo_reaproveitado = False
+        else:
+            self.frames_desde_processamento += 1
+            self.reaproveitados += 1
+            self.ultimo_reaproveitado = True
+        return self.ultimo_resultado
+
+    def status(self):
+        total = self.processados + self.reaproveitados
+        return {
+            'modo': self.modo,
+            'intervalo': self.intervalo,
+            'limiar_movimento': self.limiar_movimento,
+            'max_reuso': self.max_reuso,
+            'processados': self.processados,
+            'reaproveitados': self.reaproveitados,
+            'fracao_processada': round(self.processados / total, 3) if total else None
+        }
+
+
+class ParametrosMaos:
+    """Parâmetros do Hands em modo de rastreamento (static_image_mode=False)
+
+    Nesse modo o próprio MediaPipe recorta a região em volta dos landmarks do
+    frame anterior e roda só o modelo de landmarks nela; a detecção da palma no
+    frame inteiro (o passo mais caro) só volta quando a presença da mão no
+    recorte fica abaixo de `confianca_rastreamento`. Valores altos re-detectam
+    com mais frequência (mais lento); `complexidade` 0 usa o modelo de landmarks leve.
+    """
+
+    def __init__(self, confianca_deteccao=0.7, confianca_rastreamento=0.7, complexidade=1):
+        self.confianca_deteccao = self.confianca_rastreamento = self.complexidade = None
+        self.configurar(confianca_deteccao, confianca_rastreamento, complexidade)
+
+    def configurar(self, confianca_deteccao=None, confianca_rastreamento=None, complexidade=None):
+        """Atualiza os parâmetros informados; True se algum mudou (o Hands precisa ser recriado)"""
+        anteriores = self.status()
+        novos = dict(anteriores)
+        for nome, valor in (('confianca_deteccao', confianca_deteccao), ('confianca_rastreamento', confianca_rastreamento)):
+            if valor is None: continue
+            if not 0.0 <= float(valor) <= 1.0: raise ValueError(f"{nome} deve estar entre 0 e 1")
+            novos[nome] = float(valor)
+        if complexidade is not None:
+            if int(complexidade) not in (0, 1): raise ValueError("complexidade deve ser 0 (leve) ou 1 (completo)")
+            novos['complexidade'] = int(complexidade)
+        # Tudo validado antes de aplicar: um valor inválido não deixa a configuração pela metade
+        for nome, valor in novos.items(): setattr(self, nome, valor)
+        return novos != anteriores
+
+    def criar(self, static_image_mode=False):
+        """Hands do MediaPipe com estes parâmetros (static_image_mode=True só para comparação)"""
+        import mediapipe as mp
+        return mp.solutions.hands.Hands(static_image_mode=static_image_mode, max_num_hands=1,
+                                        model_complexity=self.complexidade,
+                                        min_detection_confidence=self.confianca_deteccao,
+                                        min_tracking_confidence=self.confianca_rastreamento)
+
+    def status(self):
+        return {
+            'confianca_deteccao': self.confianca_deteccao,
+            'confianca_rastreamento': self.confianca_rastreamento,
+            'complexidade': self.complexidade
+        }
@@ -0,0 +1,75 @@
+"""
+Reconhecimento LIBRAS por votação temporal
+Em vez de temporizadores fixos, emite a letra assim que uma classe fica estável
+e confiante por alguns frames seguidos
+"""
+
+import threading
+import numpy as np
+
+
+class VotacaoTemporal:
+    """Buffer circular das probabilidades por frame (predict_proba)
+
+    Emite a classe quando ela é a mais provável, com probabilidade >= `limiar`,
+    nos últimos `frames_estaveis` frames. Depois disso não repete a mesma
+    classe até a mão sair do quadro (reiniciar) ou mudar de pose, isto é, até
+    a classe emitida deixar de ser a mais provável em todos os frames do buffer.
+    """
+
+    def __init__(self, limiar=0.6, frames_estaveis=5):
+        self.lock = threading.Lock()
+        self.limiar = limiar
+        self.frames_estaveis = frames_estaveis
+        self.classes = None
+        self.buffer = None
+        self.posicao = 0
+        self.preenchidos = 0
+        self.ultima_emitida = None
+        self.emitidas = 0
+
+    def configurar(self, limiar=None, frames_estaveis=None):
+        with self.lock:
+            if limiar is not None: self.limiar = min(max(float(limiar), 0.0), 1.0)
+            if frames_estaveis is not None: self.frames_estaveis = max(1, int(frames_estaveis))
+            self.buffer = None
+
+    def reiniciar(self):
+        """Mão saiu do quadro: limpa o buffer e libera a repetição da última letra"""
+        with self.lock:
+            self.preenchidos = 0
+            self.ultima_emitida = None
+
+    def adicionar(self, proba, classes):
+        """Registra as probabilidades de um frame; retorna a classe a emitir ou None"""
+        with self.lock:
+            if self.buffer is None or self.buffer.shape != (self.frames_estaveis, len(proba)) or \
+                    self.classes is None or not np.array_equal(self.classes, classes):
+                self.classes = np.asarray(classes)
+                self.buffer = np.zeros((self.frames_estaveis, len(proba)))
+                self.posicao = self.preenchidos = 0
+                self.ultima_emitida = None  # índice da tabela de classes anterior (ex.: modelo recarregado)
+
+            self.buffer[self.posicao] = proba
+            self.posicao = (self.posicao + 1) % self.frames_estaveis
+            self.preenchidos = min(self.preenchidos + 1, self.frames_estaveis)
+            if self.preenchidos < self.frames_estaveis: return None
+
+            topos = np.argmax(self.buffer, axis=1)
+            if self.ultima_emitida is not None and np.all(topos != self.ultima_emitida):
+                self.ultima_emitida = None  # mudou de pose: a mesma letra pode vir de novo
+
+            candidata = topos[0]
+            estavel = np.all(topos == candidata) and np.all(self.buffer[:, candidata] >= self.limiar)
+            if not estavel or candidata == self.ultima_emitida: return None
+
+            self.ultima_emitida = candidata
+            self.emitidas += 1
+            return self.classes[candidata]
+
+    def status(self):
+        return {
+            'limiar_confianca': self.limiar,
+            'frames_estaveis': self.frames_estaveis,
+            'letras_emitidas': self.emitidas
+        }
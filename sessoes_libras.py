@@ -0,0 +1,87 @@
+"""
+Sessões de reconhecimento do TraduLibras
+Cada sinalizador (a câmera do servidor ou um cliente remoto) tem sua própria
+letra atual, texto formado, temporizadores e votação temporal
+"""
+
+import collections
+import threading
+import time
+from datetime import datetime
+from reconhecimento_libras import VotacaoTemporal
+
+
+class SessaoReconhecimento:
+    """Estado de reconhecimento de um sinalizador
+
+    `lock` serializa os frames da mesma sessão; sessões diferentes não competem.
+    """
+
+    def __init__(self, identificador, limiar=0.6, frames_estaveis=5):
+        self.identificador = identificador
+        self.lock = threading.RLock()
+        self.votacao = VotacaoTemporal(limiar=limiar, frames_estaveis=frames_estaveis)
+        self.historico = collections.deque(maxlen=1000)  # (datetime, letra) emitidas
+        self.letra_atual = self.texto = ""
+        # Sessão nova não herda cooldown: a primeira letra só espera o tempo mínimo de mão
+        self.ultima_predicao, self.mao_detectada_em = datetime.min, None
+        self.ultimo_acesso = time.monotonic()
+
+    def reiniciar(self, ultima_predicao=None):
+        """Limpa texto, temporizadores e votação"""
+        with self.lock:
+            self.letra_atual = self.texto = ""
+            self.ultima_predicao, self.mao_detectada_em = ultima_predicao or datetime.min, None
+            self.votacao.reiniciar()
+
+    def estado(self): return {'letra': self.letra_atual, 'texto': self.texto}
+
+
+class GerenciadorSessoes:
+    """Sessões por identificador; as inativas há mais de `expiracao` segundos são descartadas"""
+
+    def __init__(self, limiar=0.6, frames_estaveis=5, expiracao=600, fixas=('camera',)):
+        self.lock = threading.Lock()
+        self.limiar = limiar
+        self.frames_estaveis = frames_estaveis
+        self.expiracao = expiracao
+        self.fixas = set(fixas)
+        self.sessoes = {}
+
+    def obter(self, identificador):
+        """Retorna a sessão, criando-a na primeira vez"""
+        agora = time.monotonic()
+        with self.lock:
+            sessao = self.sessoes.get(identificador)
+            if sessao is None:
+                self._expirar(agora)
+                sessao = self.sessoes[identificador] = SessaoReconhecimento(identificador, self.limiar, self.frames_estaveis)
+            sessao.ultimo_acesso = agora
+            return sessao
+
+    def _expirar(self, agora):
+        for identificador, sessao in list(self.sessoes.items()):
+            if identificador not in self.fixas and agora - sessao.ultimo_acesso > self.expiracao:
+                del self.sessoes[identificador]
+
+    def configurar_votacao(self, limiar=None, frames_estaveis=None):
+        """Aplica limiar/frames estáveis a todas as sessões (e às próximas)"""
+        # Valida e normaliza pelos mesmos limites da VotacaoTemporal
+        referencia = VotacaoTemporal(self.limiar, self.frames_estaveis)
+        referencia.configurar(limiar=limiar, frames_estaveis=frames_estaveis)
+        with self.lock:
+            self.limiar, self.frames_estaveis = referencia.limiar, referencia.frames_estaveis
+            sessoes = list(self.sessoes.values())
+        for sessao in sessoes: sessao.votacao.configurar(limiar=self.limiar, frames_estaveis=self.frames_estaveis)
+
+    def reiniciar_votacao(self):
+        with self.lock: sessoes = list(self.sessoes.values())
+        for sessao in sessoes: sessao.votacao.reiniciar()
+
+    def ativas(self, janela=10.0):
+        """Sessões que receberam frames nos últimos `janela` segundos"""
+        limite = time.monotonic() - janela
+        with self.lock: return sum(1 for sessao in self.sessoes.values() if sessao.ultimo_acesso >= limite)
+
+    def total(self):
+        with self.lock: return len(self.sessoes)
@@ -28,6 +28,15 @@ const int p_pulso = 9;
 
 // ==================== CONFIGURAÇÃO DE TIMING ====================
 const int delayZ = 300; // Delay para movimentos sequenciais da letra Z
+const int tempoAssentamento = 300; // Tempo para os servos chegarem à posição antes do PRONTO
+const int pausaEspaco = 1000; // Pausa de um espaço dentro de uma palavra em quadro
+
+// ==================== PROTOCOLO ====================
+// v2: "?" responde PROTOCOLO, cada comando termina com "PRONTO: <comando>" e
+// uma palavra inteira pode vir num quadro <texto*CK> (CK = XOR dos bytes do texto, em hexadecimal);
+// "!" durante uma palavra cancela o restante
+const int VERSAO_PROTOCOLO = 2;
+const int tamanhoMaximoQuadro = 48; // O buffer serial do Uno tem 64 bytes
 
 // ==================== TABELA DE COORDENADAS ====================
 const int coordenadas[26][8] = {
@@ -128,6 +137,80 @@ void executarLetra(char letra) {
   }
 }
 
+// ==================== FUNÇÃO PARA EXECUTAR UM COMANDO ====================
+// Letra ou '0'; avisa com PRONTO só depois do tempo de assentamento
+void executarComando(char comando) {
+  switch (comando) {
+    case 'a': case 'b': case 'c': case 'd': case 'e': case 'f': case 'g':
+    case 'h': case 'i': case 'j': case 'k': case 'l': case 'm': case 'n':
+    case 'o': case 'p': case 'q': case 'r': case 's': case 't': case 'u':
+    case 'v': case 'w': case 'x': case 'y': case 'z':
+      executarLetra(comando);
+      break;
+    
+    case '0':
+      posicaoRepouso();
+      break;
+    
+    default:
+      Serial.println("ERRO: Comando não reconhecido");
+      return;
+  }
+  
+  delay(tempoAssentamento);
+  Serial.print("PRONTO: ");
+  Serial.println(comando);
+}
+
+// ==================== PALAVRA EM QUADRO ====================
+bool cancelamentoPedido() {
+  while (Serial.available() > 0 && (Serial.peek() == '\n' || Serial.peek() == '\r')) {
+    Serial.read();
+  }
+  if (Serial.available() > 0 && Serial.peek() == '!') {
+    Serial.read();
+    return true;
+  }
+  return false;
+}
+
+void executarQuadro() {
+  char quadro[tamanhoMaximoQuadro + 8];
+  int tamanho = Serial.readBytesUntil('>', quadro, sizeof(quadro) - 1);
+  quadro[tamanho] = '\0';
+  
+  char* asterisco = strrchr(quadro, '*');
+  if (asterisco == NULL || strlen(asterisco) != 3) {
+    Serial.println("ERRO: Quadro malformado");
+    return;
+  }
+  *asterisco = '\0';
+  
+  byte esperado = (byte) strtol(asterisco + 1, NULL, 16);
+  byte calculado = 0;
+  for (char* c = quadro; *c; c++) calculado ^= *c;
+  if (calculado != esperado) {
+    Serial.println("ERRO: Checksum invalido");
+    return;
+  }
+  
+  Serial.print("PALAVRA: OK ");
+  Serial.println(strlen(quadro));
+  for (char* c = quadro; *c; c++) {
+    if (cancelamentoPedido()) {
+      Serial.println("PALAVRA: CANCELADA");
+      return;
+    }
+    if (*c == ' ') {
+      delay(pausaEspaco);
+      Serial.println("PRONTO: espaco");
+    } else {
+      executarComando(*c);
+    }
+  }
+  Serial.println("PALAVRA: FIM");
+}
+
 // ==================== CONFIGURAÇÃO INICIAL ====================
 void setup() {
   indicador.attach(p_indicador);
@@ -140,6 +223,7 @@ void setup() {
   pulso.attach(p_pulso);
   
   Serial.begin(115200);
+  Serial.setTimeout(200); // Espera máxima pelo restante de um quadro
   while (!Serial) {
     ; // Aguarda porta serial
   }
@@ -156,30 +240,25 @@ void loop() {
   if (Serial.available() > 0) {
     char receivedChar = Serial.read();
     
-    if (receivedChar == '\n' || receivedChar == '\r') {
+    // '!' fora de uma palavra: não há nada para cancelar
+    if (receivedChar == '\n' || receivedChar == '\r' || receivedChar == '!') {
       return;
     }
     
-    Serial.print("RECEBIDO: ");
-    Serial.println(receivedChar);
+    if (receivedChar == '<') {
+      executarQuadro();
+      return;
+    }
     
-    switch (receivedChar) {
-      case 'a': case 'b': case 'c': case 'd': case 'e': case 'f': case 'g':
-      case 'h': case 'i': case 'j': case 'k': case 'l': case 'm': case 'n':
-      case 'o': case 'p': case 'q': case 'r': case 's': case 't': case 'u':
-      case 'v': case 'w': case 'x': case 'y': case 'z':
-        executarLetra(receivedChar);
-        break;
-      
-      case '0':
-        posicaoRepouso();
-        break;
-      
-      default:
-        Serial.println("ERRO: Comando não reconhecido");
-        break;
+    if (receivedChar == '?') {
+      Serial.print("PROTOCOLO: ");
+      Serial.println(VERSAO_PROTOCOLO);
+      return;
     }
     
-    delay(300);
+    Serial.print("RECEBIDO: ");
+    Serial.println(receivedChar);
+    
+    executarComando(receivedChar);
   }
 }
\ No newline at end of file
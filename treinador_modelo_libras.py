@@ -7,15 +7,35 @@ Este script treina modelos de Machine Learning com os dados coletados
 import pandas as pd
 import numpy as np
 import pickle
+import json
+import time
+import argparse
+import contextlib
+import copy
+import io
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.svm import SVC
 from sklearn.neighbors import KNeighborsClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
+from sklearn.model_selection import train_test_split, cross_val_score, StratifiedKFold, ParameterGrid
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import os
 import glob
+from features_libras import NUM_FEATURES, COLUNAS_CSV, extrair_features
+from preditor_compilado import compilar_preditor
+from dataset_libras import DatasetLIBRAS, EXTENSAO_DATASET, fim_confirmado
+from modelos_libras import listar_conjuntos, carregar_conjunto
+
+# Famílias e grades avaliadas na busca (--busca); probability=True porque o app decide por predict_proba
+GRADES_BUSCA = {
+    'RandomForest': (RandomForestClassifier, {'n_estimators': [100, 200], 'max_depth': [10, None],
+                                              'min_samples_leaf': [1, 2], 'random_state': [42]}),
+    'SVC': (SVC, {'C': [1, 10, 100], 'gamma': ['scale', 0.01], 'probability': [True], 'random_state': [42]}),
+    'KNN': (KNeighborsClassifier, {'n_neighbors': [3, 5, 9], 'weights': ['uniform', 'distance']}),
+}
 
 class TreinadorLIBRAS:
     def __init__(self):
@@ -24,6 +44,8 @@ class TreinadorLIBRAS:
         self.scaler = None
         self.features = None
         self.labels = None
+        self.tipo_modelo = 'RandomForest'
+        self.dataset = {}  # arquivo e posição (amostras/bytes) até onde os dados foram usados
         
     def carregar_dados(self, arquivo_csv):
         """Carregar dados do arquivo CSV"""
@@ -33,18 +55,25 @@ class TreinadorLIBRAS:
             print(f"❌ ERRO: Arquivo {arquivo_csv} não encontrado!")
             return False
         
+        if arquivo_csv.endswith('.npz'):
+            return self.carregar_landmarks(arquivo_csv)
+        if arquivo_csv.endswith(EXTENSAO_DATASET):
+            return self.carregar_dataset(arquivo_csv)
+        
         try:
-            # Carregar CSV
-            df = pd.read_csv(arquivo_csv)
+            # Carregar CSV (só o que o coletor já confirmou, se houver índice)
+            tamanho, amostras = fim_confirmado(arquivo_csv)
+            df = pd.read_csv(arquivo_csv, nrows=amostras)
             
             # Verificar estrutura
-            if len(df.columns) != 52:  # 1 coluna classe + 51 features
-                print(f"❌ ERRO: Formato incorreto. Esperado 52 colunas, encontrado {len(df.columns)}")
+            if len(df.columns) != NUM_FEATURES + 1:  # 1 coluna classe + 51 features
+                print(f"❌ ERRO: Formato incorreto. Esperado {NUM_FEATURES + 1} colunas, encontrado {len(df.columns)}")
                 return False
             
             # Separar features e labels
             self.labels = df.iloc[:, 0].values  # Primeira coluna é a classe
             self.features = df.iloc[:, 1:].values  # Resto são features
+            self.dataset = {'dataset_file': arquivo_csv, 'dataset_offset': len(df), 'dataset_bytes': tamanho}
             
             print(f"✅ Dados carregados:")
             print(f"   - Total de amostras: {len(df)}")
@@ -62,6 +91,42 @@ class TreinadorLIBRAS:
             print(f"❌ ERRO ao carregar dados: {e}")
             return False
     
+    def carregar_dataset(self, arquivo_dataset):
+        """Carregar o dataset binário (.tlds): features float32 mapeadas, classes pela tabela"""
+        try:
+            with DatasetLIBRAS(arquivo_dataset) as dataset:
+                self.features = np.asarray(dataset.features(), dtype=np.float64)
+                self.labels = dataset.labels()
+                contagem = dataset.contagem_por_classe()
+                self.dataset = {'dataset_file': arquivo_dataset, 'dataset_offset': len(dataset), 'dataset_bytes': None}
+            
+            print(f"✅ Dados carregados:")
+            print(f"   - Total de amostras: {len(self.features)}")
+            print(f"   - Features por amostra: {self.features.shape[1]}")
+            print(f"   - Classes: {sorted(contagem)}")
+            for classe in sorted(contagem):
+                print(f"   - {classe}: {contagem[classe]} amostras")
+            return True
+            
+        except Exception as e:
+            print(f"❌ ERRO ao carregar dataset: {e}")
+            return False
+    
+    def carregar_landmarks(self, arquivo_npz):
+        """Carregar landmarks brutos (N, 21, 2) de um .npz e calcular as features em lote"""
+        try:
+            dados = np.load(arquivo_npz, allow_pickle=False)
+            self.features = extrair_features(dados['landmarks'])
+            self.labels = dados['labels']
+            
+            print(f"✅ Landmarks convertidos: {len(self.features)} amostras, {self.features.shape[1]} features")
+            print(f"   - Classes: {sorted(set(self.labels))}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ ERRO ao carregar landmarks: {e}")
+            return False
+    
     def preparar_dados(self):
         """Preparar dados para treinamento"""
         print("\n🔧 Preparando dados para treinamento...")
@@ -132,7 +197,87 @@ class TreinadorLIBRAS:
         
         return accuracy, cv_mean
     
-    def salvar_modelo(self, precisao):
+    def buscar_modelos(self, X_train, X_test, y_train, y_test, processos=None, n_dobras=5, tolerancia=0.005):
+        """Avalia todas as combinações de GRADES_BUSCA em paralelo e fica com a vencedora
+
+        Vence o candidato mais rápido (latência de uma amostra) entre os que ficam a até
+        `tolerancia` da melhor acurácia de validação cruzada.
+        """
+        candidatos = [(familia, parametros) for familia, (_, grade) in GRADES_BUSCA.items()
+                      for parametros in ParameterGrid(grade)]
+        processos = processos or os.cpu_count()
+        print(f"\n🔎 Buscando modelo entre {len(candidatos)} candidatos ({n_dobras} dobras, {processos} processos)...")
+        
+        inicio = time.perf_counter()
+        dobras = preparar_dobras(X_train, y_train, n_dobras)
+        with ProcessPoolExecutor(processos, initializer=_iniciar_trabalhador, initargs=(dobras, X_train, y_train)) as pool:
+            # Todas as (candidato, dobra) de uma vez: os processos nunca ficam ociosos esperando uma família
+            futuros = [[pool.submit(_avaliar_dobra, familia, parametros, i) for i in range(n_dobras)]
+                       for familia, parametros in candidatos]
+            notas = [[futuro.result() for futuro in linha] for linha in futuros]
+            modelos = list(pool.map(_treinar_completo, *zip(*candidatos)))
+        print(f"   ⏱️ Busca paralela: {time.perf_counter() - inicio:.1f}s")
+        
+        # Latência medida aqui, um candidato por vez, pelo mesmo caminho do app (scaler + preditor)
+        amostras = self.scaler.inverse_transform(X_test)
+        leaderboard = []
+        for (familia, parametros), linha, (modelo, tempo_treino) in zip(candidatos, notas, modelos):
+            proba = modelo.predict_proba(X_test)
+            leaderboard.append({
+                'familia': familia, 'parametros': parametros,
+                'cv_media': float(np.mean(linha)), 'cv_desvio': float(np.std(linha)),
+                'acuracia_teste': float(np.mean(modelo.classes_[np.argmax(proba, axis=1)] == y_test)),
+                'latencia_ms': medir_latencia(modelo, self.scaler, amostras),
+                'tempo_treino_s': round(tempo_treino, 3), 'modelo': modelo,
+            })
+        leaderboard = classificar_candidatos(leaderboard, tolerancia)
+        
+        vencedor = leaderboard[0]
+        self.model, self.tipo_modelo = vencedor['modelo'], vencedor['familia']
+        for item in leaderboard: del item['modelo']
+        imprimir_leaderboard(leaderboard)
+        
+        print(f"\n🏆 Vencedor: {vencedor['familia']} {vencedor['parametros']}")
+        print(f"🎯 Acurácia (teste): {vencedor['acuracia_teste']:.3f} | CV: {vencedor['cv_media']:.3f} ± {vencedor['cv_desvio']:.3f}"
+              f" | {vencedor['latencia_ms']:.3f} ms por amostra")
+        print("\n📋 Relatório de Classificação:")
+        print(classification_report(y_test, self.model.predict(X_test), output_dict=False))
+        return vencedor['acuracia_teste'], vencedor['cv_media'], leaderboard
+    
+    def atualizar_modelo(self, model, scaler, X_novo, y_novo, X_antigo, y_antigo, arvores=20):
+        """Acrescentar `arvores` árvores (warm start) treinadas nas amostras novas + amostra das anteriores
+
+        O scaler é atualizado só com as novas (partial_fit) e as árvores existentes
+        são reescritas para a nova escala. Retorna a acurácia no teste ou None se a
+        separação de treino não tiver todas as classes do modelo.
+        """
+        print(f"\n🧩 Atualizando modelo: {len(X_novo)} novas + {len(X_antigo)} anteriores, +{arvores} árvores...")
+        X = np.vstack([X_novo, X_antigo])
+        y = np.concatenate([y_novo, y_antigo])
+        novas = np.arange(len(X)) < len(X_novo)
+        _, contagem = np.unique(y, return_counts=True)
+        X_train, X_test, y_train, y_test, _, novas_teste = train_test_split(
+            X, y, novas, test_size=0.2, random_state=42, stratify=y if contagem.min() >= 2 else None)
+        if not np.array_equal(np.unique(y_train), model.classes_):
+            print("⚠️ A amostra de treino não cobre todas as classes do modelo (aumente --replay)")
+            return None
+        
+        scaler_antigo = copy.deepcopy(scaler)
+        scaler.partial_fit(X_novo)
+        reescalar_arvores(model, scaler_antigo, scaler)
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + arvores)
+        model.fit(scaler.transform(X_train), y_train)
+        model.set_params(warm_start=False)
+        self.model, self.scaler, self.features, self.labels = model, scaler, X, y
+        
+        y_pred = model.predict(scaler.transform(X_test))
+        accuracy = accuracy_score(y_test, y_pred)
+        print(f"🎯 Acurácia: {accuracy:.3f} ({accuracy*100:.1f}%) | {len(model.estimators_)} árvores")
+        for nome, mascara in (('novas', novas_teste), ('anteriores', ~novas_teste)):
+            if mascara.any(): print(f"   - Amostras {nome}: {accuracy_score(y_test[mascara], y_pred[mascara]):.3f} ({mascara.sum()} no teste)")
+        return accuracy
+    
+    def salvar_modelo(self, precisao, leaderboard=None, incremental=None):
         """Salvar modelo treinado"""
         print("\n💾 Salvando modelo...")
         
@@ -152,23 +297,24 @@ class TreinadorLIBRAS:
             'timestamp': timestamp,
             'classes': sorted(set(self.labels)),
             'features_count': self.features.shape[1],
-            'total_samples': len(self.features),
+            'total_samples': self.dataset.get('dataset_offset', len(self.features)),
             'accuracy': precisao,
-            'model_type': 'RandomForest',
+            'model_type': self.tipo_modelo,
             'creation_date': datetime.now().isoformat()
         }
+        model_info.update(self.dataset)  # de onde o próximo treino incremental continua
+        if leaderboard is not None: model_info['leaderboard'] = leaderboard
+        if incremental is not None: model_info['incremental'] = incremental
         
-        # Salvar modelo
-        with open(modelo_file, 'wb') as f:
-            pickle.dump(self.model, f)
-        
-        # Salvar scaler
-        with open(scaler_file, 'wb') as f:
-            pickle.dump(self.scaler, f)
-        
-        # Salvar info
-        with open(info_file, 'wb') as f:
-            pickle.dump(model_info, f)
+        # Salvar modelo, scaler e, por último, info: o app só considera o conjunto completo
+        salvar_pickle_atomico(self.model, modelo_file)
+        salvar_pickle_atomico(self.scaler, scaler_file)
+        if leaderboard is not None:
+            leaderboard_file = f'modelos/leaderboard_libras_{timestamp}.json'
+            with open(leaderboard_file, 'w', encoding='utf-8') as f:
+                json.dump(leaderboard, f, ensure_ascii=False, indent=2)
+            print(f"   🏁 Leaderboard: {leaderboard_file}")
+        salvar_pickle_atomico(model_info, info_file)
         
         print(f"✅ Modelo salvo:")
         print(f"   📄 Modelo: {modelo_file}")
@@ -177,10 +323,216 @@ class TreinadorLIBRAS:
         
         return modelo_file, scaler_file, info_file
 
+def salvar_pickle_atomico(objeto, caminho):
+    """Grava num temporário e renomeia: o app (que recarrega modelos/) nunca lê um pickle pela metade"""
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        pickle.dump(objeto, f)
+    os.replace(temporario, caminho)
+
+# ==================== BUSCA DE MODELOS ====================
+# Dados de cada processo da busca: recebidos uma vez na criação do processo, não a cada tarefa
+_dobras = _X_treino = _y_treino = None
+
+def _iniciar_trabalhador(dobras, X_treino, y_treino):
+    global _dobras, _X_treino, _y_treino
+    _dobras, _X_treino, _y_treino = dobras, X_treino, y_treino
+
+def preparar_dobras(X, y, n_dobras=5):
+    """Dobras estratificadas já normalizadas (scaler ajustado só no treino de cada dobra), calculadas uma vez"""
+    dobras = []
+    for treino, validacao in StratifiedKFold(n_dobras, shuffle=True, random_state=42).split(X, y):
+        scaler = StandardScaler().fit(X[treino])
+        dobras.append((scaler.transform(X[treino]), y[treino], scaler.transform(X[validacao]), y[validacao]))
+    return dobras
+
+def _avaliar_dobra(familia, parametros, indice):
+    X_treino, y_treino, X_validacao, y_validacao = _dobras[indice]
+    modelo = GRADES_BUSCA[familia][0](**parametros).fit(X_treino, y_treino)
+    # Mesma decisão do app: classe de maior probabilidade
+    return float(np.mean(modelo.classes_[np.argmax(modelo.predict_proba(X_validacao), axis=1)] == y_validacao))
+
+def _treinar_completo(familia, parametros):
+    inicio = time.perf_counter()
+    modelo = GRADES_BUSCA[familia][0](**parametros).fit(_X_treino, _y_treino)
+    return modelo, time.perf_counter() - inicio
+
+def medir_latencia(model, scaler, amostras, repeticoes=300):
+    """Mediana (ms) de predict_proba de uma amostra pelo preditor que o app usaria"""
+    preditor = compilar_preditor(model, scaler)
+    for i in range(20): preditor.predict_proba(amostras[i % len(amostras)])  # aquecimento
+    tempos = []
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        preditor.predict_proba(amostras[i % len(amostras)])
+        tempos.append(time.perf_counter() - inicio)
+    return round(float(np.median(tempos)) * 1000, 4)
+
+def classificar_candidatos(leaderboard, tolerancia=0.005):
+    """Empatados com a melhor CV (até `tolerancia`) primeiro, do mais rápido ao mais lento; depois os demais por CV"""
+    melhor = max(item['cv_media'] for item in leaderboard)
+    for item in leaderboard:
+        item['empate_cv'] = item['cv_media'] >= melhor - tolerancia
+        # Pareto: nenhum outro é ao mesmo tempo tão preciso e tão rápido (e melhor em um dos dois)
+        item['pareto'] = not any(o['cv_media'] >= item['cv_media'] and o['latencia_ms'] <= item['latencia_ms'] and
+                                 (o['cv_media'] > item['cv_media'] or o['latencia_ms'] < item['latencia_ms'])
+                                 for o in leaderboard)
+    leaderboard.sort(key=lambda item: (not item['empate_cv'], item['latencia_ms'] if item['empate_cv'] else -item['cv_media'],
+                                       item['latencia_ms']))
+    for posicao, item in enumerate(leaderboard, 1): item['posicao'] = posicao
+    return leaderboard
+
+def imprimir_leaderboard(leaderboard):
+    print("\n🏁 LEADERBOARD (✓ = empatado com a melhor CV, * = fronteira de Pareto):")
+    print(f"{'#':>3} | {'família':<12} | {'CV':>13} | {'teste':>6} | {'ms/amostra':>10} | {'treino s':>8} | parâmetros")
+    print("-" * 100)
+    for item in leaderboard:
+        parametros = ', '.join(f'{k}={v}' for k, v in item['parametros'].items() if k not in ('random_state', 'probability'))
+        marca = ('✓' if item['empate_cv'] else ' ') + ('*' if item['pareto'] else ' ')
+        print(f"{item['posicao']:>3} | {item['familia']:<12} | {item['cv_media']:.3f} ± {item['cv_desvio']:.3f} | "
+              f"{item['acuracia_teste']:>6.3f} | {item['latencia_ms']:>10.4f} | {item['tempo_treino_s']:>8.2f} | {marca} {parametros}")
+
+# ==================== TREINO INCREMENTAL ====================
+def ler_novas_amostras(arquivo, offset, bytes_dados):
+    """(features, labels, novo offset, novos bytes) das amostras gravadas depois de `offset`
+
+    No CSV lê só a partir de `bytes_dados`; levanta ValueError se o arquivo
+    não for mais uma continuação do que foi usado no treino.
+    """
+    if arquivo.endswith(EXTENSAO_DATASET):
+        with DatasetLIBRAS(arquivo) as dataset:
+            if len(dataset) < offset: raise ValueError(f"{arquivo} tem menos amostras do que no treino anterior")
+            codigos = np.asarray(dataset.codigos(offset))
+            return (np.asarray(dataset.features(offset), dtype=np.float64), np.array(dataset.classes, dtype=object)[codigos],
+                    len(dataset), None)
+    
+    if not bytes_dados: raise ValueError("modelo sem a posição em bytes do CSV")
+    fim, _ = fim_confirmado(arquivo)
+    if fim < bytes_dados: raise ValueError(f"{arquivo} ficou menor do que no treino anterior")
+    with open(arquivo, 'rb') as f:
+        f.seek(bytes_dados - 1)
+        bruto = f.read(fim - bytes_dados + 1)
+    if bruto[:1] != b'\n': raise ValueError(f"{arquivo} foi reescrito desde o treino anterior")
+    bruto = bruto[1:bruto.rfind(b'\n') + 1]  # ignora uma linha ainda incompleta
+    if not bruto: return np.zeros((0, NUM_FEATURES)), np.array([], dtype=object), offset, bytes_dados
+    df = pd.read_csv(io.BytesIO(bruto), header=None, names=COLUNAS_CSV)
+    return df.iloc[:, 1:].values, df.iloc[:, 0].values, offset + len(df), bytes_dados + len(bruto)
+
+def amostrar_anteriores(arquivo, offset, bytes_dados, quantidade, semente=42):
+    """Amostra aleatória (features, labels) das `offset` primeiras amostras, sem ler o arquivo inteiro"""
+    rng = np.random.default_rng(semente)
+    if arquivo.endswith(EXTENSAO_DATASET):
+        with DatasetLIBRAS(arquivo) as dataset:
+            indices = np.sort(rng.choice(offset, min(quantidade, offset), replace=False))
+            codigos = np.asarray(dataset.codigos(0, offset)[indices])
+            return (np.asarray(dataset.features(0, offset)[indices], dtype=np.float64),
+                    np.array(dataset.classes, dtype=object)[codigos])
+    
+    if quantidade >= offset:
+        df = pd.read_csv(arquivo, nrows=offset)
+    else:
+        # Posições aleatórias em bytes: cada uma sorteia a linha seguinte (linhas têm quase o mesmo tamanho)
+        linhas = {}
+        with open(arquivo, 'rb') as f:
+            inicio = len(f.readline())
+            while len(linhas) < quantidade:
+                for posicao in rng.integers(inicio - 1, bytes_dados - 1, quantidade - len(linhas)):
+                    f.seek(posicao)
+                    f.readline()
+                    comeco = f.tell()
+                    if comeco < bytes_dados: linhas[comeco] = f.readline()
+        df = pd.read_csv(io.BytesIO(b''.join(linhas.values())), header=None, names=COLUNAS_CSV)
+    return df.iloc[:, 1:].values, df.iloc[:, 0].values
+
+def reescalar_arvores(model, scaler_antigo, scaler_novo):
+    """Reescreve os limiares das árvores para a escala do scaler atualizado
+
+    Cada feature entra como (x - média) / desvio, então o limiar t da escala antiga
+    vira (t * desvio_antigo + média_antiga - média_nova) / desvio_novo: as árvores
+    existentes tomam as mesmas decisões sobre as features cruas.
+    """
+    for arvore in model.estimators_:
+        tree = arvore.tree_
+        nos = tree.children_left != -1  # folhas não têm limiar
+        feature = tree.feature[nos]
+        cru = tree.threshold[nos] * scaler_antigo.scale_[feature] + scaler_antigo.mean_[feature]
+        tree.threshold[nos] = (cru - scaler_novo.mean_[feature]) / scaler_novo.scale_[feature]
+
+def medir_treino_completo(arquivo, modelo_base, n_estimators):
+    """(segundos, acurácia) de um treino do zero com a mesma configuração, para comparar"""
+    inicio = time.perf_counter()
+    treinador = TreinadorLIBRAS()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not treinador.carregar_dados(arquivo): return None, None
+        X_train, X_test, y_train, y_test = treinador.preparar_dados()
+    modelo = clone(modelo_base).set_params(n_estimators=n_estimators, warm_start=False).fit(X_train, y_train)
+    return time.perf_counter() - inicio, accuracy_score(y_test, modelo.predict(X_test))
+
+def treinar_incremental(args, pasta='modelos'):
+    """Atualiza o modelo mais recente com as amostras novas; False se for preciso um treino completo"""
+    inicio = time.perf_counter()
+    timestamps = listar_conjuntos(pasta)
+    if not timestamps:
+        print("⚠️ Nenhum modelo em modelos/ para atualizar")
+        return False
+    try: conjunto = carregar_conjunto(pasta, timestamps[-1])
+    except ValueError as e:
+        print(f"⚠️ Modelo {timestamps[-1]} inválido: {e}")
+        return False
+    info = conjunto.info
+    arquivo, offset = info.get('dataset_file'), info.get('dataset_offset')
+    print(f"📦 Modelo base: {conjunto.timestamp} ({info.get('model_type')}, {offset} amostras de {arquivo})")
+    if not isinstance(conjunto.model, RandomForestClassifier):
+        print(f"⚠️ Treino incremental só para RandomForest (modelo base: {type(conjunto.model).__name__})")
+        return False
+    if arquivo is None or offset is None or not os.path.exists(arquivo):
+        print("⚠️ O modelo base não registra o arquivo/posição do dataset usado")
+        return False
+    
+    try: X_novo, y_novo, novo_offset, novos_bytes = ler_novas_amostras(arquivo, offset, info.get('dataset_bytes'))
+    except ValueError as e:
+        print(f"⚠️ {e}")
+        return False
+    if len(X_novo) == 0:
+        print("✅ Nenhuma amostra nova desde o último modelo: nada a treinar")
+        return True
+    classes_novas = sorted(set(y_novo) - set(conjunto.model.classes_))
+    if classes_novas:
+        # As árvores existentes não sabem votar numa classe nova
+        print(f"⚠️ Classes novas {classes_novas}: o RandomForest precisa de um treino completo")
+        return False
+    
+    print(f"🆕 {len(X_novo)} amostras novas: {dict(zip(*np.unique(y_novo, return_counts=True)))}")
+    X_antigo, y_antigo = amostrar_anteriores(arquivo, offset, info.get('dataset_bytes'), args.replay)
+    treinador = TreinadorLIBRAS()
+    treinador.tipo_modelo = info.get('model_type', 'RandomForest')
+    treinador.dataset = {'dataset_file': arquivo, 'dataset_offset': novo_offset, 'dataset_bytes': novos_bytes}
+    arvores_base = len(conjunto.model.estimators_)
+    accuracy = treinador.atualizar_modelo(conjunto.model, conjunto.scaler, X_novo, y_novo, X_antigo, y_antigo, args.arvores)
+    if accuracy is None: return False
+    segundos = time.perf_counter() - inicio
+    
+    print(f"\n⏱️ Tempo até o novo modelo (incremental): {segundos:.2f}s")
+    if args.comparar:
+        completo, acuracia_completo = medir_treino_completo(arquivo, treinador.model, arvores_base)
+        if completo is not None:
+            print(f"⏱️ Treino completo ({arvores_base} árvores, sem validação cruzada): {completo:.2f}s"
+                  f" (acurácia {acuracia_completo:.3f}) → incremental {completo / segundos:.1f}× mais rápido")
+    
+    if accuracy > 0.7:
+        treinador.salvar_modelo(accuracy, incremental={
+            'base': conjunto.timestamp, 'novas_amostras': len(X_novo), 'amostras_anteriores': len(X_antigo),
+            'arvores_adicionadas': len(treinador.model.estimators_) - arvores_base, 'tempo_s': round(segundos, 3)})
+        print("\n🎉 MODELO ATUALIZADO COM SUCESSO!")
+    else:
+        print("\n⚠️ Acurácia muito baixa após a atualização; modelo não salvo")
+    return True
+
 def encontrar_arquivo_csv():
     """Encontrar arquivo CSV mais recente"""
     # Procurar arquivos CSV
-    csv_files = glob.glob('dados_coletados/*.csv') + glob.glob('*.csv')
+    csv_files = [arquivo for padrao in ('dados_coletados/*', '*') for extensao in ('.csv', EXTENSAO_DATASET)
+                 for arquivo in glob.glob(padrao + extensao)]
     
     if not csv_files:
         print("❌ ERRO: Nenhum arquivo CSV encontrado!")
@@ -195,9 +547,25 @@ def encontrar_arquivo_csv():
 
 def main():
     """Função principal"""
+    parser = argparse.ArgumentParser(description='Treinador de modelo LIBRAS')
+    parser.add_argument('--busca', action='store_true', help='compara RandomForest, SVC e KNN em paralelo e salva o vencedor')
+    parser.add_argument('--processos', type=int, help='processos da busca (padrão: todos os núcleos)')
+    parser.add_argument('--dobras', type=int, default=5, help='dobras da validação cruzada na busca')
+    parser.add_argument('--tolerancia', type=float, default=0.005, help='diferença de CV considerada empate (desempata pela latência)')
+    parser.add_argument('--incremental', action='store_true', help='atualiza o modelo mais recente só com as amostras novas')
+    parser.add_argument('--arvores', type=int, default=20, help='árvores acrescentadas no treino incremental')
+    parser.add_argument('--replay', type=int, default=2000, help='amostras anteriores sorteadas para o treino incremental')
+    parser.add_argument('--comparar', action='store_true', help='mede também um treino completo para comparar o tempo')
+    args = parser.parse_args()
+    
     print("🚀 TREINADOR DE MODELO LIBRAS")
     print("=" * 50)
     
+    if args.incremental:
+        if treinar_incremental(args):
+            return
+        print("↪️ Fazendo treino completo")
+    
     # Encontrar arquivo de dados
     arquivo_csv = encontrar_arquivo_csv()
     if not arquivo_csv:
@@ -217,12 +585,17 @@ def main():
     
     X_train, X_test, y_train, y_test = dados_processados
     
-    # Treinar modelo
-    accuracy, cv_score = treinador.treinar_modelo(X_train, X_test, y_train, y_test)
+    # Treinar modelo (ou buscar o melhor entre as famílias)
+    leaderboard = None
+    if args.busca:
+        accuracy, cv_score, leaderboard = treinador.buscar_modelos(X_train, X_test, y_train, y_test, args.processos,
+                                                                   args.dobras, args.tolerancia)
+    else:
+        accuracy, cv_score = treinador.treinar_modelo(X_train, X_test, y_train, y_test)
     
     # Salvar modelo se precisão for adequada
     if accuracy > 0.7:  # Mínimo 70% de precisão
-        treinador.salvar_modelo(accuracy)
+        treinador.salvar_modelo(accuracy, leaderboard)
         print("\n🎉 TREINAMENTO CONCLUÍDO COM SUCESSO!")
     else:
         print("\n⚠️ Acurácia muito baixa! Considere:")
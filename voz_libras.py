@@ -0,0 +1,391 @@
+"""
+Síntese de voz do TraduLibras
+Cache endereçado pelo conteúdo (hash do texto normalizado + idioma) em
+memória e em disco, ambos LRU limitados por tamanho, sobre um backend de
+síntese trocável: gTTS (online), espeak-ng (offline) ou um stub para testes,
+e a fila de reprodução no alto-falante do servidor
+"""
+
+import collections
+import hashlib
+import io
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import unicodedata
+import wave
+
+
+class BackendGTTS:
+    """Google Text-to-Speech (precisa de internet)"""
+
+    nome, extensao, mimetype = 'gtts', 'mp3', 'audio/mpeg'
+
+    def sintetizar(self, texto, idioma, lento=False):
+        from gtts import gTTS
+        saida = io.BytesIO()
+        gTTS(text=texto, lang=idioma, slow=lento).write_to_fp(saida)
+        return saida.getvalue()
+
+
+class BackendEspeak:
+    """espeak-ng/espeak local (offline), WAV pela saída padrão"""
+
+    nome, extensao, mimetype = 'espeak', 'wav', 'audio/wav'
+
+    def __init__(self):
+        self.executavel = shutil.which('espeak-ng') or shutil.which('espeak')
+        if not self.executavel: raise RuntimeError("espeak-ng/espeak não encontrado no PATH")
+
+    def sintetizar(self, texto, idioma, lento=False):
+        argumentos = [self.executavel, '--stdout', '--stdin', '-v', idioma] + (['-s', '120'] if lento else [])
+        resultado = subprocess.run(argumentos, input=texto.encode('utf-8'), capture_output=True, timeout=30, check=True)
+        return resultado.stdout
+
+
+class BackendStub:
+    """Silêncio em WAV com duração proporcional ao texto (testes e máquinas sem áudio)"""
+
+    nome, extensao, mimetype = 'stub', 'wav', 'audio/wav'
+
+    def __init__(self, atraso=0.0):
+        self.atraso = atraso
+        self.chamadas = 0
+
+    def sintetizar(self, texto, idioma, lento=False):
+        self.chamadas += 1
+        if self.atraso: time.sleep(self.atraso)
+        saida = io.BytesIO()
+        with wave.open(saida, 'wb') as arquivo:
+            arquivo.setnchannels(1)
+            arquivo.setsampwidth(2)
+            arquivo.setframerate(16000)
+            arquivo.writeframes(b'\x00\x00' * int(16000 * 0.06 * max(1, len(texto))))
+        return saida.getvalue()
+
+
+BACKENDS = {'gtts': BackendGTTS, 'espeak': BackendEspeak, 'stub': BackendStub}
+
+
+def criar_backend(nome='gtts'):
+    if nome not in BACKENDS: raise ValueError(f"Backend de voz inválido: {nome} (opções: {', '.join(BACKENDS)})")
+    return BACKENDS[nome]()
+
+
+def normalizar_texto(texto):
+    """Mesma fala, mesma chave: Unicode NFC, minúsculas e espaços colapsados"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFC', texto)).strip().lower()
+
+
+Audio = collections.namedtuple('Audio', 'dados mimetype chave origem')
+
+
+class _Sintese:
+    """Síntese em curso: quem pede o mesmo texto espera `pronta` e recebe `dados` direto"""
+    __slots__ = ('pronta', 'dados')
+
+    def __init__(self):
+        self.pronta = threading.Event()
+        self.dados = None
+
+
+class CacheVoz:
+    """Áudio sintetizado por chave = sha256(backend, idioma, velocidade, texto normalizado)
+
+    Acertos saem da memória ou do disco sem chamar o backend; pedidos
+    simultâneos do mesmo texto esperam uma única síntese e recebem os mesmos
+    bytes (mesmo os grandes demais para a memória). O backend recebe o texto
+    normalizado, o mesmo da chave: a primeira grafia pedida não decide o áudio.
+    `ao_sintetizar(segundos)` recebe a duração de cada síntese real.
+    """
+
+    def __init__(self, backend, pasta='cache_voz', max_bytes_disco=64 * 2**20, max_bytes_memoria=8 * 2**20,
+                 ao_sintetizar=None):
+        self.backend = backend
+        self.pasta = pasta
+        self.max_bytes_disco = max_bytes_disco
+        self.max_bytes_memoria = max_bytes_memoria
+        self.ao_sintetizar = ao_sintetizar
+        self.lock = threading.Lock()
+        self.memoria = collections.OrderedDict()  # chave -> bytes, do menos ao mais usado
+        self.bytes_memoria = 0
+        self.disco = collections.OrderedDict()    # chave -> tamanho do arquivo, do menos ao mais usado
+        self.em_andamento = {}                    # chave -> _Sintese em curso
+        self.contadores = {'memoria': 0, 'disco': 0, 'sintese': 0, 'erros': 0}
+        self._indexar_disco()
+
+    def _caminho(self, chave): return os.path.join(self.pasta, f'{chave}.{self.backend.extensao}')
+
+    def _indexar_disco(self):
+        """Retoma o cache de execuções anteriores (ordem LRU pela data de modificação)"""
+        if not self.pasta or not os.path.isdir(self.pasta): return
+        arquivos = []
+        for nome in os.listdir(self.pasta):
+            chave, extensao = os.path.splitext(nome)
+            if extensao != f'.{self.backend.extensao}': continue
+            caminho = os.path.join(self.pasta, nome)
+            arquivos.append((os.path.getmtime(caminho), chave, os.path.getsize(caminho)))
+        for _, chave, tamanho in sorted(arquivos): self.disco[chave] = tamanho
+
+    def chave(self, texto, idioma='pt-br', lento=False):
+        conteudo = f'{self.backend.nome}|{idioma}|{int(lento)}|{normalizar_texto(texto)}'
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def _guardar_memoria(self, chave, dados):
+        if len(dados) > self.max_bytes_memoria: return
+        if chave in self.memoria: self.bytes_memoria -= len(self.memoria.pop(chave))
+        self.memoria[chave] = dados
+        self.bytes_memoria += len(dados)
+        while self.bytes_memoria > self.max_bytes_memoria:
+            _, removidos = self.memoria.popitem(last=False)
+            self.bytes_memoria -= len(removidos)
+
+    def _guardar_disco(self, chave, dados):
+        if not self.pasta or len(dados) > self.max_bytes_disco: return
+        os.makedirs(self.pasta, exist_ok=True)
+        caminho = self._caminho(chave)
+        temporario = f'{caminho}.{threading.get_ident()}.tmp'
+        with open(temporario, 'wb') as f: f.write(dados)
+        os.replace(temporario, caminho)
+        with self.lock:
+            self.disco[chave] = len(dados)
+            self.disco.move_to_end(chave)
+            excesso = sum(self.disco.values()) - self.max_bytes_disco
+            removidos = []
+            while excesso > 0 and len(self.disco) > 1:
+                antiga, tamanho = self.disco.popitem(last=False)
+                removidos.append(antiga)
+                excesso -= tamanho
+        for antiga in removidos:
+            try: os.remove(self._caminho(antiga))
+            except OSError: pass
+
+    def _ler_disco(self, chave):
+        try:
+            with open(self._caminho(chave), 'rb') as f: dados = f.read()
+            os.utime(self._caminho(chave))  # mantém a ordem LRU entre execuções
+            return dados
+        except OSError:
+            with self.lock: self.disco.pop(chave, None)
+            return None
+
+    def sintetizar(self, texto, idioma='pt-br', lento=False):
+        """Audio(dados, mimetype, chave, origem) com origem 'memoria', 'disco' ou 'sintese'"""
+        chave = self.chave(texto, idioma, lento)
+        while True:
+            with self.lock:
+                dados = self.memoria.get(chave)
+                if dados is not None:
+                    self.memoria.move_to_end(chave)
+                    self.contadores['memoria'] += 1
+                    return Audio(dados, self.backend.mimetype, chave, 'memoria')
+                no_disco = chave in self.disco
+                if no_disco: self.disco.move_to_end(chave)
+                andamento = self.em_andamento.get(chave)
+                if andamento is None and not no_disco:
+                    andamento = self.em_andamento[chave] = _Sintese()
+                    break
+            if no_disco:
+                dados = self._ler_disco(chave)
+                if dados is not None:
+                    with self.lock:
+                        self._guardar_memoria(chave, dados)
+                        self.contadores['disco'] += 1
+                    return Audio(dados, self.backend.mimetype, chave, 'disco')
+                continue
+            andamento.pronta.wait()  # outra thread está sintetizando o mesmo texto
+            if andamento.dados is not None:
+                with self.lock: self.contadores['memoria'] += 1
+                return Audio(andamento.dados, self.backend.mimetype, chave, 'memoria')
+            # a síntese falhou: tenta de novo (ou espera a próxima tentativa)
+
+        try:
+            inicio = time.perf_counter()
+            dados = self.backend.sintetizar(normalizar_texto(texto), idioma, lento)
+            if self.ao_sintetizar: self.ao_sintetizar(time.perf_counter() - inicio)
+            with self.lock:
+                self._guardar_memoria(chave, dados)
+                self.contadores['sintese'] += 1
+            # No disco antes de liberar a chave: quem chegar depois acha o áudio mesmo
+            # quando ele não coube na memória
+            try: self._guardar_disco(chave, dados)
+            except OSError as e: print(f"⚠️ Não foi possível gravar o cache de voz: {e}")
+            andamento.dados = dados
+        except Exception:
+            with self.lock: self.contadores['erros'] += 1
+            raise
+        finally:
+            with self.lock: self.em_andamento.pop(chave, None)
+            andamento.pronta.set()
+        return Audio(dados, self.backend.mimetype, chave, 'sintese')
+
+    def status(self):
+        with self.lock:
+            return {
+                'backend': self.backend.nome,
+                'acertos_memoria': self.contadores['memoria'],
+                'acertos_disco': self.contadores['disco'],
+                'sinteses': self.contadores['sintese'],
+                'erros': self.contadores['erros'],
+                'itens_memoria': len(self.memoria), 'bytes_memoria': self.bytes_memoria,
+                'itens_disco': len(self.disco), 'bytes_disco': sum(self.disco.values()),
+            }
+
+
+# Nome do formato para o pygame (namehint) a partir do mimetype do áudio
+EXTENSOES = {'audio/mpeg': 'mp3', 'audio/wav': 'wav'}
+
+
+class SaidaPygame:
+    """Alto-falante via pygame.mixer, aberto uma única vez e mantido aberto"""
+
+    def __init__(self, frequencia=22050, buffer=512):
+        self.frequencia = frequencia
+        self.buffer = buffer
+        self.mixer = None
+
+    def abrir(self):
+        if self.mixer is None:
+            import pygame
+            pygame.mixer.init(frequency=self.frequencia, size=-16, channels=2, buffer=self.buffer)
+            self.mixer = pygame.mixer
+        return self.mixer
+
+    def tocar(self, audio):
+        mixer = self.abrir()
+        mixer.music.load(io.BytesIO(audio.dados), EXTENSOES.get(audio.mimetype, ''))
+        mixer.music.play()
+
+    def tocando(self): return self.mixer is not None and self.mixer.music.get_busy()
+
+    def parar(self):
+        if self.mixer is not None: self.mixer.music.stop()
+
+    def fechar(self):
+        if self.mixer is not None: self.mixer.quit()
+        self.mixer = None
+
+
+class _Fala:
+    __slots__ = ('texto', 'idioma', 'audio', 'cancelada', 't_pedido')
+
+    def __init__(self, texto, idioma, audio=None):
+        self.texto = texto
+        self.idioma = idioma
+        self.audio = audio
+        self.cancelada = False
+        self.t_pedido = time.perf_counter()
+
+
+class ReprodutorVoz:
+    """Fila de falas tocadas uma de cada vez por uma thread com o dispositivo sempre aberto
+
+    `sintetizar(texto, idioma)` retorna um Audio (normalmente CacheVoz.sintetizar);
+    `ao_tocar(segundos)` recebe o tempo do pedido até o início do som. Com a fila
+    cheia (`max_fila`), a fala mais antiga ainda não tocada é descartada.
+    """
+
+    def __init__(self, sintetizar, saida=None, max_fila=10, duracao_maxima=30.0, ao_tocar=None):
+        self.sintetizar = sintetizar
+        self.saida = saida or SaidaPygame()
+        self.max_fila = max_fila
+        self.duracao_maxima = duracao_maxima
+        self.ao_tocar = ao_tocar
+        self.condicao = threading.Condition()
+        self.fila = collections.deque()
+        self.atual = None
+        self.thread = None
+        self.contadores = {'tocadas': 0, 'interrompidas': 0, 'descartadas': 0, 'erros': 0}
+        self.primeiro_som_ms = None
+        self.primeiro_som_medio_ms = None
+
+    def _enfileirar(self, fala, interromper):
+        with self.condicao:
+            if interromper: self._cancelar_tudo()
+            if len(self.fila) >= self.max_fila:
+                self.fila.popleft()
+                self.contadores['descartadas'] += 1
+            self.fila.append(fala)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._executar, name='reprodutor-voz', daemon=True)
+                self.thread.start()
+            self.condicao.notify_all()
+
+    def falar(self, texto, idioma='pt-br', interromper=False):
+        """Põe o texto na fila (a síntese acontece na thread); `interromper` cala o que estiver tocando antes"""
+        if texto.strip(): self._enfileirar(_Fala(texto, idioma), interromper)
+
+    def tocar(self, audio, interromper=False):
+        """Põe na fila um Audio já sintetizado"""
+        self._enfileirar(_Fala(None, None, audio), interromper)
+
+    def _cancelar_tudo(self):
+        self.contadores['interrompidas'] += len(self.fila)
+        self.fila.clear()
+        if self.atual: self.atual.cancelada = True
+
+    def interromper(self):
+        """Para a fala atual; a fila continua"""
+        with self.condicao:
+            if self.atual: self.atual.cancelada = True
+            self.condicao.notify_all()
+
+    def limpar(self):
+        """Para a fala atual e descarta a fila"""
+        with self.condicao:
+            self._cancelar_tudo()
+            self.condicao.notify_all()
+
+    def tamanho_fila(self):
+        with self.condicao: return len(self.fila)
+
+    def _proxima(self):
+        with self.condicao:
+            self.condicao.wait_for(lambda: self.fila)
+            self.atual = self.fila.popleft()
+            return self.atual
+
+    def _tocar(self, fala):
+        audio = fala.audio or self.sintetizar(fala.texto, fala.idioma)
+        if fala.cancelada: return False
+        self.saida.tocar(audio)
+        segundos = time.perf_counter() - fala.t_pedido
+        if self.ao_tocar: self.ao_tocar(segundos)
+        with self.condicao:
+            self.primeiro_som_ms = segundos * 1000
+            media = self.primeiro_som_medio_ms
+            self.primeiro_som_medio_ms = self.primeiro_som_ms if media is None else media + 0.1 * (self.primeiro_som_ms - media)
+            # Acorda na hora com interromper()/limpar(); sem isso, confere o fim do áudio a cada 50 ms
+            limite = time.monotonic() + self.duracao_maxima
+            while not fala.cancelada and self.saida.tocando() and time.monotonic() < limite:
+                self.condicao.wait(0.05)
+        if fala.cancelada: self.saida.parar()
+        return not fala.cancelada
+
+    def _executar(self):
+        while True:
+            fala = self._proxima()
+            try: tocada = self._tocar(fala)
+            except Exception as e:
+                print(f"💥 ERRO ao falar: {e}")
+                # Dispositivo com problema: reabre na próxima fala
+                try: self.saida.fechar()
+                except Exception: pass
+                tocada = None
+            with self.condicao:
+                self.atual = None
+                chave = 'erros' if tocada is None else 'tocadas' if tocada else 'interrompidas'
+                self.contadores[chave] += 1
+
+    def status(self):
+        with self.condicao:
+            return {
+                'fila': len(self.fila),
+                'tocando': self.atual is not None,
+                **self.contadores,
+                'primeiro_som_ms': None if self.primeiro_som_ms is None else round(self.primeiro_som_ms, 1),
+                'primeiro_som_medio_ms': None if self.primeiro_som_medio_ms is None else round(self.primeiro_som_medio_ms, 1),
+            }